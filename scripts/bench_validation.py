@@ -0,0 +1,56 @@
+"""Micro-benchmark of per-answer validation cost.
+
+Usage: PYTHONPATH=src python scripts/bench_validation.py [iterations]
+"""
+from __future__ import annotations
+
+import re
+import sys
+import timeit
+
+from codexs_bot.localization import HIRING_QUESTIONS
+from codexs_bot.validation import validate_answer
+
+SAMPLES = {
+    "email": "Jane.Doe@Example.COM",
+    "contact": "+1 (415) 555-0100",
+    "location": "Berlin, Germany (CET)",
+    "portfolio": "https://github.com/janedoe",
+}
+
+
+def _uncompiled(key: str, text: str) -> bool:
+    """The previous inline checks, which built their patterns on every call."""
+    text = text.strip()
+    if len(text) > 1000:
+        return False
+    if key == "email":
+        return bool(re.match(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", text))
+    if key == "contact":
+        cleaned = re.sub(r"[\s\-\(\)\+]", "", text)
+        if not re.match(r"^(\+?\d{1,4}[\s\-]?)?\(?\d{1,4}\)?[\s\-]?\d{1,4}[\s\-]?\d{1,9}$", cleaned):
+            return False
+        return 7 <= len(re.sub(r"\D", "", cleaned)) <= 15
+    if key == "location":
+        structured = "," in text or ("(" in text and ")" in text)
+        return structured and len(text.split()) >= 2 and len(text) >= 5
+    if key == "portfolio":
+        return bool(re.match(r"^(https?://)?([\da-z\.-]+)\.([a-z\.]{2,6})([/\w \.-]*)*/?$", text, re.IGNORECASE))
+    return True
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    questions = {question.key: question for question in HIRING_QUESTIONS}
+    for key, text in SAMPLES.items():
+        question = questions[key]
+        pipeline = timeit.timeit(lambda: validate_answer(question, text), number=iterations)
+        inline = timeit.timeit(lambda: _uncompiled(key, text), number=iterations)
+        print(
+            f"{key:<10} pipeline {pipeline / iterations * 1e9:7.0f} ns/answer   "
+            f"inline re.* {inline / iterations * 1e9:7.0f} ns/answer"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from dataclasses import dataclass
 from typing import Optional
 
-import httpx
-
+from .circuit import CircuitBreaker
+from .http_pool import SharedHttpClient
 from .localization import Language
 
 logger = logging.getLogger(__name__)
@@ -28,16 +31,56 @@ SYSTEM_PROMPTS = {
 }
 
 
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+
+@dataclass(slots=True)
+class AIStats:
+    requests: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    short_circuited: int = 0
+    shed: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_latency: float = 0.0
+    last_latency: float = 0.0
+
+    @property
+    def avg_latency(self) -> float:
+        calls = self.succeeded + self.failed
+        return self.total_latency / calls if calls else 0.0
+
+
 class OpenAIFallback:
+    """Free-text answers from the OpenAI chat API.
+
+    Calls share the bot's connection pool and pass a gate of ``max_concurrency``
+    slots; a request that cannot get a slot within ``queue_timeout`` seconds is
+    shed. While the circuit breaker is open (the API keeps timing out, erroring
+    or rate-limiting) ``generate_reply`` returns None at once, so callers show
+    their static fallback message instead of waiting on a degraded upstream.
+    """
+
     def __init__(
         self,
         api_key: Optional[str],
         model: str = "gpt-4o-mini",
         timeout: float = 15.0,
+        *,
+        http: Optional[SharedHttpClient] = None,
+        max_concurrency: int = 4,
+        queue_timeout: float = 5.0,
+        breaker: Optional[CircuitBreaker] = None,
     ) -> None:
         self.api_key = api_key
         self.model = model
         self.timeout = timeout
+        self._http = http or SharedHttpClient()
+        self._gate = asyncio.Semaphore(max(1, max_concurrency))
+        self._queue_timeout = queue_timeout
+        self.breaker = breaker or CircuitBreaker("openai", failure_threshold=3, reset_timeout=60.0)
+        self.stats = AIStats()
 
     @property
     def enabled(self) -> bool:
@@ -72,18 +115,61 @@ class OpenAIFallback:
             "Authorization": f"Bearer {self.api_key}",
         }
 
+        if not self.breaker.allow():
+            self.stats.short_circuited += 1
+            return None
+        try:
+            async with asyncio.timeout(self._queue_timeout):
+                await self._gate.acquire()
+        except TimeoutError:
+            self.stats.shed += 1
+            logger.warning("OpenAI fallback busy; shedding request after %.1fs in queue", self._queue_timeout)
+            return None
+        try:
+            return await self._request(payload, headers)
+        finally:
+            self._gate.release()
+
+    async def _request(self, payload: dict, headers: dict) -> Optional[str]:
+        self.stats.requests += 1
+        started = time.monotonic()
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    json=payload,
-                    headers=headers,
-                )
-                response.raise_for_status()
-                data = response.json()
-        except Exception as exc:  # pragma: no cover - network errors
+            response = await self._http.client.post(
+                OPENAI_CHAT_URL,
+                json=payload,
+                headers=headers,
+                timeout=self.timeout,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            self._record(started, ok=False)
+            self.breaker.record_failure()
             logger.warning("OpenAI fallback request failed: %s", exc)
             return None
+        # Rate limits and server errors mean the upstream is struggling
+        if response.status_code == 429 or response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        if not response.is_success:
+            self._record(started, ok=False)
+            logger.warning("OpenAI fallback request failed: HTTP %s", response.status_code)
+            return None
+        try:
+            data = response.json()
+        except ValueError as exc:
+            self._record(started, ok=False)
+            logger.warning("OpenAI fallback returned invalid JSON: %s", exc)
+            return None
+        latency = self._record(started, ok=True)
+        usage = data.get("usage") or {}
+        self.stats.prompt_tokens += usage.get("prompt_tokens") or 0
+        self.stats.completion_tokens += usage.get("completion_tokens") or 0
+        logger.info(
+            "OpenAI fallback replied in %.2fs (%s prompt / %s completion tokens)",
+            latency,
+            usage.get("prompt_tokens", "?"),
+            usage.get("completion_tokens", "?"),
+        )
 
         choices = data.get("choices") or []
         if not choices:
@@ -92,3 +178,12 @@ class OpenAIFallback:
         content = (message.get("content") or "").strip()
         return content or None
 
+    def _record(self, started: float, *, ok: bool) -> float:
+        latency = time.monotonic() - started
+        self.stats.last_latency = latency
+        self.stats.total_latency += latency
+        if ok:
+            self.stats.succeeded += 1
+        else:
+            self.stats.failed += 1
+        return latency
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from .intents import normalize_intent_text
+from .localization import Language
+from .remote_config import remote_config
+
+logger = logging.getLogger(__name__)
+
+AI_CACHE_FILE_VERSION = 1
+
+# (language, normalized user text, context hash)
+CacheKey = Tuple[str, str, str]
+
+
+@dataclass(slots=True)
+class AICacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def cache_key(language: Language, user_text: str, context_text: str) -> CacheKey:
+    """Questions that differ only in case, punctuation or spacing share a key."""
+    normalized = " ".join(normalize_intent_text(user_text).split())
+    context_hash = hashlib.sha256(context_text.encode("utf-8")).hexdigest()[:16]
+    return language.value, normalized, context_hash
+
+
+class AIResponseCache:
+    """LRU cache of AI fallback replies with a TTL and in-flight coalescing.
+
+    Concurrent lookups of the same key share one upstream call. Only non-empty
+    replies are cached. Entries are dropped when ``remote_config`` reports a new
+    version, since the answers may quote content that just changed. With a
+    ``path`` the cache is loaded at startup and saved on shutdown; a saved cache
+    from another config version is discarded on first use.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 512,
+        ttl: float = 3600.0,
+        path: Optional[Path] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._ttl = ttl
+        self._path = path
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._version: Optional[str] = remote_config.version
+        self.stats = AICacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_version(self) -> None:
+        if remote_config.version != self._version:
+            if self._entries:
+                self.stats.invalidations += 1
+                logger.info("Remote config changed; dropping %d cached AI replies", len(self._entries))
+            self._entries.clear()
+            self._version = remote_config.version
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        self._check_version()
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, reply = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return reply
+
+    def put(self, key: CacheKey, reply: str) -> None:
+        self._check_version()
+        self._entries[key] = (self._clock() + self._ttl, reply)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def lookup(self, key: CacheKey) -> Optional[str]:
+        """``get`` that counts a hit in ``stats``."""
+        reply = self.get(key)
+        if reply is not None:
+            self.stats.hits += 1
+        return reply
+
+    async def get_or_create(self, key: CacheKey, create: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        reply = self.lookup(key)
+        if reply is not None:
+            return reply
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats.coalesced += 1
+            # Shielded so one impatient caller does not cancel the call for everyone
+            return await asyncio.shield(pending)
+        self.stats.misses += 1
+        version = self._version
+        task = asyncio.ensure_future(create())
+        self._inflight[key] = task
+        try:
+            reply = await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+        # A reply generated against an older config is not worth keeping
+        if reply and remote_config.version == version:
+            self.put(key, reply)
+        return reply
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def load(self) -> int:
+        """Read entries saved by ``save``; returns how many are still fresh."""
+        if not self._path:
+            return 0
+        try:
+            with self._path.open("r", encoding="utf-8") as handle:
+                record = json.load(handle)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable AI reply cache {self._path}: {exc}")
+            return 0
+        if not isinstance(record, dict) or record.get("v") != AI_CACHE_FILE_VERSION:
+            return 0
+        self._version = record.get("version")
+        now = self._clock()
+        for language, text, context_hash, expires_at, reply in record.get("entries") or []:
+            if expires_at > now:
+                self._entries[(language, text, context_hash)] = (expires_at, reply)
+        # Bound the restored set in case max_entries shrank
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return len(self._entries)
+
+    def save(self) -> None:
+        """Write live entries atomically (temp file + rename)."""
+        if not self._path:
+            return
+        now = self._clock()
+        record = {
+            "v": AI_CACHE_FILE_VERSION,
+            "version": self._version,
+            "entries": [
+                [language, text, context_hash, expires_at, reply]
+                for (language, text, context_hash), (expires_at, reply) in self._entries.items()
+                if expires_at > now
+            ],
+        }
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self._path.with_suffix(self._path.suffix + ".tmp")
+            with temp_file.open("w", encoding="utf-8") as handle:
+                json.dump(record, handle, ensure_ascii=False, separators=(",", ":"))
+            temp_file.replace(self._path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning(f"Failed to write AI reply cache {self._path}: {exc}")
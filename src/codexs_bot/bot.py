@@ -2,22 +2,19 @@ from __future__ import annotations
 
 import asyncio
 import html
-import json
 import logging
-import re
 import time
 import uuid
-from collections import defaultdict
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import httpx
-from telegram import KeyboardButton, ReplyKeyboardMarkup, Update
+from telegram import ReplyKeyboardMarkup, Update
 from telegram.constants import ChatType
 from telegram.error import TelegramError
 from telegram.ext import (
     Application,
+    ApplicationHandlerStop,
     CommandHandler,
     ContextTypes,
     MessageHandler,
@@ -25,6 +22,7 @@ from telegram.ext import (
 )
 
 from .ai import OpenAIFallback
+from .ai_cache import AIResponseCache, cache_key as ai_cache_key
 from .config import load_settings
 from .localization import (
     ABOUT_CTA,
@@ -32,7 +30,6 @@ from .localization import (
     ABOUT_SECTIONS,
     ABOUT_TEXT,
     AI_RATE_LIMIT_MESSAGE,
-    BACK_TO_MENU,
     BILINGUAL_WELCOME,
     COMMANDS_TEXT,
     CONTACT_SHARED_ACK,
@@ -57,7 +54,6 @@ from .localization import (
     ERROR_CONTACT_INVALID,
     ERROR_EMAIL_INVALID,
     ERROR_GENERIC,
-    ERROR_GROUP_NOTIFICATION_FAILED,
     ERROR_LOCATION_INVALID,
     ERROR_URL_INVALID,
     ERROR_VOICE_INVALID,
@@ -69,17 +65,14 @@ from .localization import (
     HIRING_QUESTIONS,
     INVALID_EDIT,
     LANDING_CARD_CAPTION,
-    LANGUAGE_PROMPT,
     LANGUAGE_REMINDER,
     Language,
     LOCATION_SHARED_ACK,
     MAIN_MENU_PROMPT,
     MENU_HELPER,
-    MENU_LABELS,
+    MENU_LABEL_INDEX,
     MENU_TOPIC_TITLES,
     MISSING_ANSWER,
-    SHARE_CONTACT_BUTTON,
-    SHARE_LOCATION_BUTTON,
     SKIPPED_TEXT,
     SMART_FALLBACK_HINT,
     SUMMARY_HEADER,
@@ -116,7 +109,6 @@ from .localization import (
     ADMIN_DEBUG_USER,
     ADMIN_SESSIONS_LIST,
     ADMIN_NO_SESSIONS,
-    GROUP_ONLY_COMMAND,
     GROUP_ADMIN_REQUIRED,
     GROUP_HELP_TEXT,
     GROUP_DAILY_REPORT,
@@ -125,72 +117,61 @@ from .localization import (
     GROUP_APPLICATION_DETAILS,
     GROUP_APPLICATION_NOT_FOUND,
     GROUP_APPLICATION_ITEM,
-    back_keyboard,
-    contact_keyboard,
-    edit_keyboard,
     get_language_from_button,
     is_back_button,
-    is_no,
-    is_yes,
-    is_skip,
-    language_keyboard,
-    location_keyboard,
-    yes_no_keyboard,
     switch_language,
 )
 from .session import Flow, UserSession, get_session
-from .storage import DataStorage
+from .storage import DataStorage, JsonlApplicationStore
+from .rate_limit import RateLimiter, RateLimitPolicy
+from .send_scheduler import PRIORITY_ANNOUNCE, SendScheduler
+from .session_store import SQLiteSessionStore
+from .sqlite_store import SQLiteApplicationStore
 from .notifications import WebhookNotifier
+from .circuit import CircuitBreaker
 from .supabase_client import SUPABASE_ANON_KEY, SupabaseBotClient
+from .http_pool import SharedHttpClient
+from .intents import (
+    collapse_intent_text,
+    intent_engine,
+    is_no,
+    is_skip,
+    is_yes,
+    normalize_intent_text,
+)
+from .keyboards import keyboards
+from .validation import (
+    ERROR_EMAIL,
+    ERROR_LOCATION,
+    ERROR_PHONE,
+    ERROR_TOO_LONG,
+    ERROR_URL,
+    validate_answer,
+    validate_email,
+    validate_location,
+    validate_phone,
+    validate_text,
+    validate_url,
+)
+from .outbound import AdaptivePollSchedule, OutboundDelivery
+from .outbox import Handler as OutboxHandler, Outbox, OutboxWorker, PermanentDeliveryError
+from .postcommit import PostCommitPipeline
 from .conversation_logger import init_conversation_logger, capture_incoming
-from .remote_config import default_menu_rows, remote_config
+from .remote_config import remote_config
 
 
 logger = logging.getLogger(__name__)
 
-# Rate limiting: track user requests per minute
-_rate_limit_store: Dict[int, List[datetime]] = defaultdict(list)
-RATE_LIMIT_MAX_REQUESTS = 20  # Max requests per minute
-RATE_LIMIT_WINDOW = timedelta(minutes=1)
-
-_MENU_KEYWORDS = {
-    "apply": {
-        Language.EN: ("apply", "application", "job", "career", "role", "position", "hire"),
-        Language.FA: ("درخواست", "شغل", "کار", "استخدام", "فرصت"),
-    },
-    "about": {
-        Language.EN: ("about", "studio", "company", "codexs"),
-        Language.FA: ("درباره", "استودیو", "codexs", "شرکت"),
-    },
-    "updates": {
-        Language.EN: ("news", "update", "launch", "what's new", "latest"),
-        Language.FA: ("خبر", "آپدیت", "به‌روزرسانی", "لانچ", "جدید"),
-    },
-    "contact": {
-        Language.EN: ("contact", "support", "help", "reach", "message"),
-        Language.FA: ("تماس", "پشتیبانی", "کمک", "پیام"),
-    },
-}
-
-_MENU_COMMANDS = {
-    Language.EN: {"menu", "mainmenu", "startover", "cancel", "stop", "quit", "restart"},
-    Language.FA: {"منو", "منویاصلی", "بازگشتبمنو", "بازگشتبهمنو", "لغو"},
-}
-
-_BACK_COMMANDS = {
-    Language.EN: {"back", "previous", "goback"},
-    Language.FA: {"بازگشت", "برگشت", "قبلی"},
-}
-
-_REPEAT_COMMANDS = {
-    Language.EN: {"repeat", "again", "what", "pardon", "huh"},
-    Language.FA: {"تکرار", "دوباره", "چی", "??"},
-}
-
-_QUESTION_KEYWORDS = {
-    Language.EN: {"what", "why", "how", "help", "where", "who"},
-    Language.FA: {"چی", "چطور", "چرا", "کمک", "کجا", "کی"},
+# Rate limiting: per-user token buckets, one policy per kind of request
+RATE_LIMIT_MAX_REQUESTS = 20  # Max text messages per minute
+AI_MAX_RESPONSES = 5  # Max AI replies per 10 minutes
+RATE_LIMIT_POLICIES = {
+    "text": RateLimitPolicy.per_window(RATE_LIMIT_MAX_REQUESTS, 60),
+    "voice": RateLimitPolicy.per_window(5, 60),
+    "command": RateLimitPolicy.per_window(10, 60),
+    "ai": RateLimitPolicy.per_window(AI_MAX_RESPONSES, 600),
 }
+_rate_limiter = RateLimiter(RATE_LIMIT_POLICIES)
 
 _STAGE_LABELS = {
     "new": ("🆕 New", "🆕 درخواست جدید"),
@@ -200,28 +181,19 @@ _STAGE_LABELS = {
     "rejected": ("⚠️ Closed", "⚠️ بسته شده"),
 }
 
-_VIDEO_EXTENSIONS = {".mp4", ".mov", ".m4v", ".webm"}
-
-AI_MAX_RESPONSES = 5
-AI_WINDOW = timedelta(minutes=10)
+_VALIDATION_ERRORS = {
+    ERROR_TOO_LONG: ERROR_TEXT_TOO_LONG,
+    ERROR_EMAIL: ERROR_EMAIL_INVALID,
+    ERROR_PHONE: ERROR_CONTACT_INVALID,
+    ERROR_LOCATION: ERROR_LOCATION_INVALID,
+    ERROR_URL: ERROR_URL_INVALID,
+}
 
+_VIDEO_EXTENSIONS = {".mp4", ".mov", ".m4v", ".webm"}
 
-def _check_rate_limit(user_id: int) -> bool:
+def _check_rate_limit(user_id: int, kind: str = "text") -> bool:
     """Check if user has exceeded rate limit. Returns True if allowed, False if rate limited."""
-    now = datetime.now(timezone.utc)
-    user_requests = _rate_limit_store[user_id]
-    
-    # Remove old requests outside the window
-    cutoff = now - RATE_LIMIT_WINDOW
-    user_requests[:] = [req for req in user_requests if req > cutoff]
-    
-    # Check if limit exceeded
-    if len(user_requests) >= RATE_LIMIT_MAX_REQUESTS:
-        return False
-    
-    # Add current request
-    user_requests.append(now)
-    return True
+    return _rate_limiter.allow(kind, user_id)
 
 
 def _format_hiring_intro(language: Language) -> str:
@@ -233,55 +205,35 @@ def _format_hiring_intro(language: Language) -> str:
 
 
 def _normalize_for_intent(text: str) -> str:
-    normalized = re.sub(r"[^a-zA-Z0-9\u0600-\u06FF\s]", " ", text)
-    return normalized.lower()
+    return normalize_intent_text(text)
 
 
 def _collapse_intent_token(text: str) -> str:
-    return _normalize_for_intent(text).replace(" ", "")
+    return collapse_intent_text(text)
 
 
 def _is_menu_command(text: str, language: Language) -> bool:
-    collapsed = _collapse_intent_token(text)
-    return collapsed in _MENU_COMMANDS[language]
+    return intent_engine.analyze(text, language).has("menu")
 
 
 def _is_back_command(text: str, language: Language) -> bool:
-    collapsed = _collapse_intent_token(text)
-    return collapsed in _BACK_COMMANDS[language]
+    return intent_engine.analyze(text, language).has("back")
 
 
 def _is_repeat_command(text: str, language: Language) -> bool:
-    collapsed = _collapse_intent_token(text)
-    return collapsed in _REPEAT_COMMANDS[language] or text.strip() in {"?", "؟"}
+    return text.strip() in {"?", "؟"} or intent_engine.analyze(text, language).has("repeat")
 
 
 def _looks_like_question(text: str, language: Language) -> bool:
-    if "?" in text:
-        return True
-    normalized = _normalize_for_intent(text)
-    for keyword in _QUESTION_KEYWORDS[language]:
-        if keyword in normalized:
-            return True
-    return False
+    return "?" in text or intent_engine.analyze(text, language).has("question")
 
 
 def _match_menu_button(text: str, language: Language) -> Optional[str]:
-    for key, labels in MENU_LABELS.items():
-        if text == labels[language]:
-            return key
-    return None
+    return MENU_LABEL_INDEX[language].get(text)
 
 
 def _infer_menu_choice(text: str, language: Language) -> Optional[str]:
-    normalized = _normalize_for_intent(text)
-    for key, language_map in _MENU_KEYWORDS.items():
-        if language not in language_map:
-            continue
-        for keyword in language_map[language]:
-            if keyword and keyword in normalized:
-                return key
-    return None
+    return intent_engine.analyze(text, language).best("menu_topic")
 
 
 def _build_edit_summary(session: UserSession, language: Language) -> str:
@@ -331,9 +283,7 @@ def _keyboard_with_back(
     language: Language,
     one_time: bool = False,
 ) -> ReplyKeyboardMarkup:
-    rows = [list(row) for row in base_rows] if base_rows else []
-    rows.append([BACK_TO_MENU[language]])
-    return ReplyKeyboardMarkup(rows, resize_keyboard=True, one_time_keyboard=one_time)
+    return keyboards.with_back(base_rows, language, one_time=one_time)
 
 
 async def _send_remote_content(
@@ -353,8 +303,11 @@ async def _send_remote_content(
     return True
 
 
-async def poll_outbound_messages(application: Application) -> None:
-    """Poll Supabase for pending outbound messages and deliver them via Telegram."""
+async def poll_outbound_messages(application: Application) -> Optional[float]:
+    """Poll Supabase for pending outbound messages and deliver them via Telegram.
+
+    Returns the adaptive delay before the next poll, or None if polling is not set up.
+    """
     settings = application.bot_data.get("settings")
     if not settings:
         logger.debug("Outbound poll skipped - settings not initialized yet")
@@ -367,75 +320,52 @@ async def poll_outbound_messages(application: Application) -> None:
         logger.debug("Outbound poll skipped - Supabase URL or BOT_API_KEY not configured")
         return
 
-    endpoint = f"{supabase_url}/functions/v1/bot-outbound"
-    ack_endpoint = f"{endpoint}/ack"
+    http_pool: Optional[SharedHttpClient] = application.bot_data.get("http_client")
+    if not http_pool:
+        logger.debug("Outbound poll skipped - HTTP client not initialized yet")
+        return
+
+    delivery: Optional[OutboundDelivery] = application.bot_data.get("outbound_delivery")
+    if delivery is None:
+        delivery = OutboundDelivery(
+            application.bot,
+            http_pool,
+            f"{supabase_url}/functions/v1/bot-outbound",
+            {
+                "Authorization": f"Bearer {SUPABASE_ANON_KEY}" if SUPABASE_ANON_KEY else "",
+                "x-bot-key": bot_api_key,
+                "Content-Type": "application/json",
+            },
+            concurrency=getattr(settings, "outbound_concurrency", 8),
+            long_poll=getattr(settings, "outbound_long_poll", 0.0),
+            schedule=AdaptivePollSchedule(
+                getattr(settings, "outbound_poll_min_interval", 2.0),
+                getattr(settings, "outbound_poll_max_interval", 60.0),
+            ),
+        )
+        application.bot_data["outbound_delivery"] = delivery
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(
-                endpoint,
-                headers={
-                    "Authorization": f"Bearer {SUPABASE_ANON_KEY}" if SUPABASE_ANON_KEY else "",
-                    "x-bot-key": bot_api_key,
-                    "Content-Type": "application/json",
-                },
-            )
-            if response.status_code != 200:
-                logger.error("Failed to fetch outbound messages: HTTP %s", response.status_code)
-                return
-
-            payload = response.json()
-            messages = payload.get("messages", []) or []
-
-            if not messages:
-                return
-
-            logger.info("📤 Found %d pending outbound messages", len(messages))
-
-            for message in messages:
-                msg_id = message.get("id")
-                telegram_user_id = message.get("telegram_user_id")
-                text = message.get("message_text")
-                message_type = message.get("message_type", "text")
-
-                if not msg_id or not telegram_user_id or not text:
-                    logger.warning("Skipping outbound message with missing fields: %s", message)
-                    continue
-
-                status = "sent"
-                try:
-                    if message_type == "text":
-                        await application.bot.send_message(chat_id=int(telegram_user_id), text=text)
-                    else:
-                        await application.bot.send_message(chat_id=int(telegram_user_id), text=text)
-                    logger.info("✅ Sent outbound message %s to user %s", msg_id, telegram_user_id)
-                except Exception as exc:  # pylint: disable=broad-except
-                    status = "failed"
-                    logger.error("❌ Failed to send outbound message %s: %s", msg_id, exc)
-
-                try:
-                    await client.post(
-                        ack_endpoint,
-                        headers={
-                            "Authorization": f"Bearer {SUPABASE_ANON_KEY}" if SUPABASE_ANON_KEY else "",
-                            "x-bot-key": bot_api_key,
-                            "Content-Type": "application/json",
-                        },
-                        json={"message_id": msg_id, "status": status},
-                    )
-                except Exception as exc:  # pylint: disable=broad-except
-                    logger.error("Failed to acknowledge outbound message %s: %s", msg_id, exc)
-
+        await delivery.run_once()
     except Exception as exc:  # pylint: disable=broad-except
         logger.error("Error polling outbound messages: %s", exc)
+        return delivery.schedule.record(False)
+    return delivery.next_delay
 
 
 async def _outbound_poll_job(context: ContextTypes.DEFAULT_TYPE) -> None:
-    """JobQueue wrapper to call outbound polling with access to the application instance."""
+    """JobQueue wrapper that polls once and schedules the next poll after the adaptive delay."""
+    settings = context.application.bot_data.get("settings")
+    delay = getattr(settings, "outbound_poll_max_interval", 60.0)
     try:
-        await poll_outbound_messages(context.application)
+        next_delay = await poll_outbound_messages(context.application)
+        if next_delay is not None:
+            delay = next_delay
     except Exception as exc:  # pylint: disable=broad-except
         logger.error("Outbound polling job failed: %s", exc)
+    finally:
+        if context.job_queue:
+            context.job_queue.run_once(_outbound_poll_job, when=delay, name="outbound_poll")
 
 
 async def _start_application_flow(
@@ -461,14 +391,14 @@ async def _start_application_flow(
                 update,
                 slug,
                 language,
-                reply_markup=ReplyKeyboardMarkup(back_keyboard(language), resize_keyboard=True),
+                reply_markup=keyboards.get("back", language),
             )
             intro_sent = intro_sent or sent
     if not intro_sent:
         intro_formatted = _format_hiring_intro(language)
         await update.message.reply_text(
             intro_formatted,
-            reply_markup=ReplyKeyboardMarkup(back_keyboard(language), resize_keyboard=True),
+            reply_markup=keyboards.get("back", language),
             parse_mode="HTML",
         )
     await ask_current_question(update, session)
@@ -702,21 +632,27 @@ async def handle_conversation_logging(update: Update, context: ContextTypes.DEFA
     await capture_incoming(update)
 
 
-def _language_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
-        language_keyboard(),
-        resize_keyboard=True,
-        one_time_keyboard=True,
+async def handle_command_rate_limit(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Throttle commands per user before any command handler runs."""
+    if not update.message or not update.effective_user:
+        return
+    if _check_rate_limit(update.effective_user.id, "command"):
+        return
+    language = get_session(context.user_data).language or Language.EN
+    await update.message.reply_text(
+        RATE_LIMIT_MESSAGE[language],
+        parse_mode="HTML",
     )
+    raise ApplicationHandlerStop
+
+
+def _language_keyboard() -> ReplyKeyboardMarkup:
+    return keyboards.get("language", Language.EN, one_time=True)
 
 
 def _menu_keyboard(language: Language, *, one_time: bool = False) -> ReplyKeyboardMarkup:
-    """Build the persistent main menu keyboard from remote config (with fallback)."""
-    return ReplyKeyboardMarkup(
-        default_menu_rows(language),
-        resize_keyboard=True,
-        one_time_keyboard=one_time,
-    )
+    """The persistent main menu keyboard from remote config (with fallback), cached per config version."""
+    return keyboards.get("menu", language, one_time=one_time)
 
 
 async def _send_photo_with_fallback(message, photo_url: Optional[str], caption: str, photo_path: Optional[Path] = None) -> None:
@@ -831,10 +767,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         await _send_landing_card(update, context)
         await update.message.reply_text(
             RESUME_PROMPT[language].format(progress=progress),
-            reply_markup=ReplyKeyboardMarkup(
-                [[RESUME_YES[language], RESUME_NO[language]]],
-                resize_keyboard=True,
-            ),
+            reply_markup=keyboards.get("resume", language),
             parse_mode="HTML",
         )
         return
@@ -954,6 +887,13 @@ def _get_contact_notifier(context: ContextTypes.DEFAULT_TYPE) -> WebhookNotifier
     return context.application.bot_data["contact_notifier"]
 
 
+def _get_postcommit(context: ContextTypes.DEFAULT_TYPE) -> PostCommitPipeline:
+    pipeline = context.application.bot_data.get("postcommit")
+    if pipeline is None:
+        pipeline = context.application.bot_data["postcommit"] = PostCommitPipeline()
+    return pipeline
+
+
 def _get_ai_responder(context: ContextTypes.DEFAULT_TYPE) -> Optional[OpenAIFallback]:
     return context.application.bot_data.get("ai_responder")  # type: ignore[return-value]
 
@@ -1003,10 +943,7 @@ async def _load_session(update: Update, context: ContextTypes.DEFAULT_TYPE) -> O
     if not update.effective_user:
         return None
     storage = _get_storage(context)
-    session_data = await storage.load_session(update.effective_user.id)
-    if session_data:
-        return UserSession.from_dict(session_data)
-    return None
+    return await storage.load_user_session(update.effective_user.id)
 
 
 def _is_admin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
@@ -1125,13 +1062,6 @@ def _build_ai_context(session: UserSession, language: Language) -> str:
     return "\n".join(parts)
 
 
-def _reset_ai_window(session: UserSession) -> None:
-    now = datetime.now(timezone.utc)
-    if not session.ai_window_start or now - session.ai_window_start > AI_WINDOW:
-        session.ai_window_start = now
-        session.ai_reply_count = 0
-
-
 def _needs_exit_confirmation(session: UserSession) -> bool:
     return (
         session.flow in {Flow.APPLY, Flow.CONFIRM, Flow.CONTACT_MESSAGE}
@@ -1149,7 +1079,7 @@ async def _prompt_exit_confirmation(
     session.request_exit_confirmation(session.flow or Flow.IDLE)
     await update.message.reply_text(
         EXIT_CONFIRM_PROMPT[language],
-        reply_markup=ReplyKeyboardMarkup(yes_no_keyboard(language), resize_keyboard=True),
+        reply_markup=keyboards.get("yes_no", language),
     )
 
 
@@ -1166,8 +1096,13 @@ async def _maybe_ai_reply(
         return False
 
     language = session.language or Language.EN
-    _reset_ai_window(session)
-    if session.ai_reply_count >= AI_MAX_RESPONSES:
+    user_id = update.effective_user.id if update.effective_user else update.message.chat_id
+    context_text = _build_ai_context(session, language)
+    ai_cache: Optional[AIResponseCache] = context.application.bot_data.get("ai_cache")
+    cache_key = ai_cache_key(language, user_text, context_text)
+    # A cached reply costs no upstream call, so it does not use the AI allowance
+    cached_reply = ai_cache.lookup(cache_key) if ai_cache is not None else None
+    if cached_reply is None and not _check_rate_limit(user_id, "ai"):
         await update.message.reply_text(
             AI_RATE_LIMIT_MESSAGE[language],
             parse_mode="HTML",
@@ -1175,10 +1110,19 @@ async def _maybe_ai_reply(
         )
         return True
 
-    context_text = _build_ai_context(session, language)
     try:
-        ai_reply = await responder.generate_reply(language, context_text, user_text)
+        if cached_reply is not None:
+            ai_reply = cached_reply
+        elif ai_cache is not None:
+            ai_reply = await ai_cache.get_or_create(
+                cache_key,
+                lambda: responder.generate_reply(language, context_text, user_text),
+            )
+        else:
+            ai_reply = await responder.generate_reply(language, context_text, user_text)
         if not ai_reply:
+            # Only delivered replies count against the AI allowance
+            _rate_limiter.refund("ai", user_id)
             return False
 
         await update.message.reply_text(
@@ -1186,9 +1130,10 @@ async def _maybe_ai_reply(
             parse_mode="HTML",
             reply_markup=_menu_keyboard(language),
         )
-        session.ai_reply_count += 1
         return True
     except Exception as exc:
+        if cached_reply is None:
+            _rate_limiter.refund("ai", user_id)
         logger.warning(f"AI fallback failed: {exc}", exc_info=True)
         # Gracefully degrade - don't show error to user, just return False
         # The caller will show the standard fallback message
@@ -1223,7 +1168,7 @@ async def _open_menu_section(
         intro_formatted = _format_hiring_intro(language)
         await update.message.reply_text(
             intro_formatted,
-            reply_markup=ReplyKeyboardMarkup(back_keyboard(language), resize_keyboard=True),
+            reply_markup=keyboards.get("back", language),
             parse_mode="HTML",
         )
         await ask_current_question(update, session)
@@ -1247,7 +1192,7 @@ async def _open_menu_section(
         await _save_session(update, context, session)  # Save session when entering contact flow
         await update.message.reply_text(
             CONTACT_INFO[language],
-            reply_markup=ReplyKeyboardMarkup(yes_no_keyboard(language), resize_keyboard=True),
+            reply_markup=keyboards.get("yes_no", language),
         )
         return
 
@@ -1286,7 +1231,7 @@ async def handle_exit_confirmation(update: Update, session: UserSession, text: s
         return
     await update.message.reply_text(
         EXIT_CONFIRM_PROMPT[language],
-        reply_markup=ReplyKeyboardMarkup(yes_no_keyboard(language), resize_keyboard=True),
+        reply_markup=keyboards.get("yes_no", language),
     )
 
 
@@ -1310,10 +1255,7 @@ async def resume_flow_after_cancel(update: Update, session: UserSession, context
     if session.flow == Flow.CONTACT_MESSAGE:
         if session.contact_review_pending:
             # Resume at review step
-            review_keyboard = ReplyKeyboardMarkup(
-                [[CONTACT_SEND_BUTTON[language], CONTACT_EDIT_BUTTON[language]]],
-                resize_keyboard=True,
-            )
+            review_keyboard = keyboards.get("contact_review", language)
             await update.message.reply_text(
                 CONTACT_MESSAGE_REVIEW[language].format(message=session.contact_message_draft or ""),
                 reply_markup=review_keyboard,
@@ -1324,7 +1266,7 @@ async def resume_flow_after_cancel(update: Update, session: UserSession, context
             # Resume at Yes/No prompt
             await update.message.reply_text(
                 CONTACT_INFO[language],
-                reply_markup=ReplyKeyboardMarkup(yes_no_keyboard(language), resize_keyboard=True),
+                reply_markup=keyboards.get("yes_no", language),
             )
             return
         else:
@@ -1398,10 +1340,7 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             elif original_flow == Flow.CONTACT_MESSAGE:
                 session.flow = Flow.CONTACT_MESSAGE
                 if session.contact_review_pending:
-                    review_keyboard = ReplyKeyboardMarkup(
-                        [[CONTACT_SEND_BUTTON[language], CONTACT_EDIT_BUTTON[language]]],
-                        resize_keyboard=True,
-                    )
+                    review_keyboard = keyboards.get("contact_review", language)
                     await update.message.reply_text(
                         CONTACT_MESSAGE_REVIEW[language].format(message=session.contact_message_draft or ""),
                         reply_markup=review_keyboard,
@@ -1410,7 +1349,7 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
                 elif session.contact_pending:
                     await update.message.reply_text(
                         CONTACT_INFO[language],
-                        reply_markup=ReplyKeyboardMarkup(yes_no_keyboard(language), resize_keyboard=True),
+                        reply_markup=keyboards.get("yes_no", language),
                     )
                 else:
                     await update.message.reply_text(
@@ -1424,7 +1363,7 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
                     # User was selecting which question to edit
                     await update.message.reply_text(
                         EDIT_PROMPT[language],
-                        reply_markup=ReplyKeyboardMarkup(edit_keyboard(language), resize_keyboard=True),
+                        reply_markup=keyboards.get("edit", language),
                         parse_mode="HTML",
                     )
                 elif session.edit_mode:
@@ -1453,10 +1392,7 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             progress = len([v for v in session.answers.values() if v and str(v).strip()])
             await update.message.reply_text(
                 RESUME_PROMPT[language].format(progress=progress),
-                reply_markup=ReplyKeyboardMarkup(
-                    [[RESUME_YES[language], RESUME_NO[language]]],
-                    resize_keyboard=True,
-                ),
+                reply_markup=keyboards.get("resume", language),
                 parse_mode="HTML",
             )
             return
@@ -1505,7 +1441,7 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             session.request_exit_confirmation(session.flow)
             await update.message.reply_text(
                 EXIT_CONFIRM_PROMPT[language],
-                reply_markup=ReplyKeyboardMarkup(yes_no_keyboard(language), resize_keyboard=True),
+                reply_markup=keyboards.get("yes_no", language),
             )
         else:
             session.reset_hiring()
@@ -1529,7 +1465,7 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             intro_formatted = _format_hiring_intro(language)
             await update.message.reply_text(
                 intro_formatted,
-                reply_markup=ReplyKeyboardMarkup(back_keyboard(language), resize_keyboard=True),
+                reply_markup=keyboards.get("back", language),
                 parse_mode="HTML",
             )
             await ask_current_question(update, session)
@@ -1540,10 +1476,7 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             return
         else:
             # Remind user to use buttons
-            view_roles_keyboard = ReplyKeyboardMarkup(
-                [[VIEW_ROLES_YES[language], VIEW_ROLES_NO[language]]],
-                resize_keyboard=True,
-            )
+            view_roles_keyboard = keyboards.get("view_roles", language)
             await update.message.reply_text(
                 ABOUT_CTA[language],
                 reply_markup=view_roles_keyboard,
@@ -1557,7 +1490,7 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         if number is None or not (1 <= number <= len(HIRING_QUESTIONS) + 1):
             await update.message.reply_text(
                 INVALID_EDIT[language],
-                reply_markup=ReplyKeyboardMarkup(edit_keyboard(language), resize_keyboard=True),
+                reply_markup=keyboards.get("edit", language),
                 parse_mode="HTML",
             )
             return
@@ -1629,13 +1562,13 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             edit_summary = _build_edit_summary(session, language)
             await update.message.reply_text(
                 edit_summary + "\n\n" + EDIT_PROMPT[language],
-                reply_markup=ReplyKeyboardMarkup(edit_keyboard(language), resize_keyboard=True),
+                reply_markup=keyboards.get("edit", language),
                 parse_mode="HTML",
             )
             return
         await update.message.reply_text(
             CONFIRM_PROMPT[language],
-            reply_markup=ReplyKeyboardMarkup(yes_no_keyboard(language), resize_keyboard=True),
+            reply_markup=keyboards.get("yes_no", language),
         )
         return
 
@@ -1660,10 +1593,7 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
                 return
             else:
                 # Remind user to use buttons
-                review_keyboard = ReplyKeyboardMarkup(
-                    [[CONTACT_SEND_BUTTON[language], CONTACT_EDIT_BUTTON[language]]],
-                    resize_keyboard=True,
-                )
+                review_keyboard = keyboards.get("contact_review", language)
                 await update.message.reply_text(
                     CONTACT_MESSAGE_REVIEW[language].format(message=session.contact_message_draft or ""),
                     reply_markup=review_keyboard,
@@ -1696,7 +1626,7 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
                 # User sent text instead of Yes/No - show clarification
                 await update.message.reply_text(
                     CONTACT_DECISION_REMINDER[language],
-                    reply_markup=ReplyKeyboardMarkup(yes_no_keyboard(language), resize_keyboard=True),
+                    reply_markup=keyboards.get("yes_no", language),
                 )
                 return
         else:
@@ -1720,10 +1650,7 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             # Store draft and show review
             session.contact_message_draft = text
             session.contact_review_pending = True
-            review_keyboard = ReplyKeyboardMarkup(
-                [[CONTACT_SEND_BUTTON[language], CONTACT_EDIT_BUTTON[language]]],
-                resize_keyboard=True,
-            )
+            review_keyboard = keyboards.get("contact_review", language)
             await update.message.reply_text(
                 CONTACT_MESSAGE_REVIEW[language].format(message=text),
                 reply_markup=review_keyboard,
@@ -1800,10 +1727,7 @@ async def share_about_story(update: Update, context: ContextTypes.DEFAULT_TYPE,
     
     # Set flag to await user's response about viewing roles
     session.awaiting_view_roles = True
-    view_roles_keyboard = ReplyKeyboardMarkup(
-        [[VIEW_ROLES_YES[language], VIEW_ROLES_NO[language]]],
-        resize_keyboard=True,
-    )
+    view_roles_keyboard = keyboards.get("view_roles", language)
     await update.message.reply_text(
         ABOUT_CTA[language],
         reply_markup=view_roles_keyboard,
@@ -1968,19 +1892,9 @@ async def ask_current_question(update: Update, session: UserSession) -> None:
     
     # Determine keyboard based on input type
     if question.input_type == "contact":
-        contact_btn = KeyboardButton(SHARE_CONTACT_BUTTON[language], request_contact=True)
-        keyboard = ReplyKeyboardMarkup(
-            [[contact_btn], [BACK_TO_MENU[language]]],
-            resize_keyboard=True,
-            one_time_keyboard=True,
-        )
+        keyboard = keyboards.get("share_contact", language, one_time=True)
     elif question.input_type == "location":
-        location_btn = KeyboardButton(SHARE_LOCATION_BUTTON[language], request_location=True)
-        keyboard = ReplyKeyboardMarkup(
-            [[location_btn], [BACK_TO_MENU[language]]],
-            resize_keyboard=True,
-            one_time_keyboard=True,
-        )
+        keyboard = keyboards.get("share_location", language, one_time=True)
     else:
         keyboard_rows = question.keyboard[language] if question.keyboard else None
         keyboard = _keyboard_with_back(keyboard_rows, language)
@@ -2009,49 +1923,27 @@ async def ask_current_question(update: Update, session: UserSession) -> None:
 
 def _validate_email(email: str) -> bool:
     """Basic email validation."""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email.strip()))
+    return validate_email(email)[1] is None
 
 
 def _validate_phone(phone: str) -> bool:
     """Validate phone number format (with country code)."""
-    # Remove common separators and spaces
-    cleaned = re.sub(r'[\s\-\(\)\+]', '', phone.strip())
-    # Should start with + or digits, and have 7-15 digits total
-    pattern = r'^(\+?\d{1,4}[\s\-]?)?\(?\d{1,4}\)?[\s\-]?\d{1,4}[\s\-]?\d{1,9}$'
-    if not re.match(pattern, cleaned):
-        return False
-    # Count digits (should be 7-15)
-    digits = re.sub(r'\D', '', cleaned)
-    return 7 <= len(digits) <= 15
+    return validate_phone(phone)[1] is None
 
 
 def _validate_location(location: str) -> bool:
     """Validate location format: City, Country (Timezone) or similar."""
-    # Should contain at least a comma or parentheses, indicating structure
-    has_comma = ',' in location
-    has_parens = '(' in location and ')' in location
-    # Should have at least 3 words (city, country, timezone or similar)
-    words = location.split()
-    return (has_comma or has_parens) and len(words) >= 2 and len(location.strip()) >= 5
+    return validate_location(location)[1] is None
 
 
 def _validate_url(url: str) -> bool:
     """Validate URL format (http/https or common domains)."""
-    url = url.strip()
-    # Check for common URL patterns
-    url_pattern = r'^(https?://)?([\da-z\.-]+)\.([a-z\.]{2,6})([/\w \.-]*)*/?$'
-    # Also accept common portfolio platforms without full URL
-    common_domains = ['github.com', 'behance.net', 'dribbble.com', 'linkedin.com', 
-                      'portfolio', 'github', 'behance', 'dribbble']
-    if any(domain in url.lower() for domain in common_domains):
-        return True
-    return bool(re.match(url_pattern, url, re.IGNORECASE))
+    return validate_url(url)[1] is None
 
 
 def _validate_text_length(text: str, max_length: int = 1000) -> bool:
     """Validate text input length."""
-    return len(text.strip()) <= max_length
+    return validate_text(text, max_length)[1] is None
 
 
 def _sanitize_html(text: str) -> str:
@@ -2124,36 +2016,14 @@ async def handle_application_answer(
         await _warn_and_repeat_question(update, session, question, language, MISSING_ANSWER[language])
         return
 
-    if cleaned and not _validate_text_length(cleaned, max_length=1000):
-        await _warn_and_repeat_question(update, session, question, language, ERROR_TEXT_TOO_LONG[language])
-        return
-    
-    if question.key == "email" and cleaned and not _validate_email(cleaned):
-        await _warn_and_repeat_question(update, session, question, language, ERROR_EMAIL_INVALID[language])
-        return
-    
-    # Validate contact (phone number) if typed manually
-    if question.key == "contact" and cleaned and question.input_type == "contact":
-        # Only validate if it's typed text (not from contact button)
-        if not _validate_phone(cleaned):
-            await _warn_and_repeat_question(update, session, question, language, ERROR_CONTACT_INVALID[language])
-            return
-
-    # Validate location if typed manually
-    if question.key == "location" and cleaned and question.input_type == "location":
-        # Only validate if it's typed text (not from location button)
-        if not _validate_location(cleaned):
-            await _warn_and_repeat_question(update, session, question, language, ERROR_LOCATION_INVALID[language])
-            return
-
-    # Validate portfolio URL
-    if question.key == "portfolio" and cleaned:
-        if not _validate_url(cleaned):
-            await _warn_and_repeat_question(update, session, question, language, ERROR_URL_INVALID[language])
-            return
-
     if question.optional and cleaned and is_skip(cleaned, language):
         value = None
+    elif cleaned:
+        # Typed answers only; shared contacts/locations arrive through their own handlers
+        value, error = validate_answer(question, cleaned)
+        if error:
+            await _warn_and_repeat_question(update, session, question, language, _VALIDATION_ERRORS[error][language])
+            return
     # Normalize empty strings to None for optional fields to ensure consistent data storage
     if question.optional and value == "":
         value = None
@@ -2214,6 +2084,13 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         )
         return
 
+    if not _check_rate_limit(update.effective_user.id, "voice"):
+        await update.message.reply_text(
+            RATE_LIMIT_MESSAGE[language],
+            parse_mode="HTML",
+        )
+        return
+
     voice_message = update.message.voice
     audio_message = update.message.audio
     telegram_media = voice_message or audio_message
@@ -2323,7 +2200,7 @@ async def prompt_confirmation(update: Update, session: UserSession) -> None:
     
     await update.message.reply_text(
         "\n".join(summary_lines),
-        reply_markup=ReplyKeyboardMarkup(yes_no_keyboard(language), resize_keyboard=True),
+        reply_markup=keyboards.get("yes_no", language),
         parse_mode="HTML",
     )
 
@@ -2368,93 +2245,22 @@ async def finalize_application(update: Update, context: ContextTypes.DEFAULT_TYP
         # Don't clear session - user can try again
         return
     
-    voice_file_url: Optional[str] = None
-    if session.voice_file_id:
-        try:
-            telegram_file = await context.bot.get_file(session.voice_file_id)
-            voice_file_url = telegram_file.file_path
-        except TelegramError as exc:
-            logger.warning("Unable to fetch Telegram voice file URL: %s", exc)
-    
     submitted_at = datetime.now(timezone.utc).isoformat()
-    
-    # Submit to Supabase Edge Function (if configured)
-    supabase_client = _get_supabase_client(context)
-    if supabase_client and supabase_client.supabase_enabled:
-        supabase_payload = {
-            "telegram_user_id": str(applicant["telegram_id"]),
-            "username": applicant.get("username"),
-            "full_name": session.answers.get("full_name"),
-            "email": session.answers.get("email"),
-            "phone": session.answers.get("contact"),
-            "role_focus": session.answers.get("role_category"),
-            "location": session.answers.get("location"),
-            "skills": session.answers.get("skills"),
-            "experience": session.answers.get("experience"),
-            "portfolio_url": session.answers.get("portfolio"),
-            "motivation": session.answers.get("motivation"),
-            "salary_expectations": session.answers.get("salary"),
-            "earliest_start": session.answers.get("start_date"),
-            "working_hours": session.answers.get("working_hours"),
-            "answers": session.answers,
-            "application_id": application_id,
-            "submitted_at": submitted_at,
-            "language": language.value,
-        }
-        # Add voice sample info if available
-        if voice_file_url or session.voice_file_id:
-            supabase_payload["voice_sample"] = {
-                "file_url": voice_file_url,
-                "file_id": session.voice_file_id,
-                "file_name": f"{applicant['telegram_id']}_voice.ogg",
-                "content_type": "audio/ogg",
-            }
-        
-        result = await supabase_client.submit_application(supabase_payload)
-        if result:
-            logger.info(f"Application {application_id} submitted to Supabase: {result.get('applicant_id')}")
-        else:
-            logger.warning(f"Application {application_id} failed to submit to Supabase (will retry later)")
-    
-    # Send to webhook notifier (legacy)
-    notifier = _get_application_notifier(context)
-    await notifier.post(
-        {
-            "application_id": application_id,
-            "submitted_at": submitted_at,
-            "language": language.value,
-            "answers": session.answers,
-            "full_name": session.answers.get("full_name"),
-            "email": session.answers.get("email"),
-            "contact": session.answers.get("contact"),
-            "portfolio": session.answers.get("portfolio"),
-            "voice_file_path": session.voice_file_path,
-            "voice_file_id": session.voice_file_id,
-            "voice_file_url": voice_file_url,
-            "voice_skipped": session.voice_skipped,
-            "telegram_id": applicant["telegram_id"],
-            "telegram_username": applicant["username"],
-            "telegram_first_name": applicant["first_name"],
-            "telegram_last_name": applicant["last_name"],
-        }
-    )
-    # Store all data BEFORE reset_hiring() clears it!
-    answers_copy = dict(session.answers)
-    voice_file_id_for_group = session.voice_file_id
-    voice_message_id_for_group = session.voice_message_id
-    voice_path_for_group = session.voice_file_path
-    voice_skipped_for_group = session.voice_skipped
+    answers = dict(session.answers)
+    voice_file_id = session.voice_file_id
+    voice_message_id = session.voice_message_id
+    voice_file_path = session.voice_file_path
+    voice_skipped = session.voice_skipped
     user_chat_id = session.user_chat_id or update.effective_chat.id
-    
+
     session.is_candidate = True
     session.reset_hiring()  # This clears session.answers, but we have a copy
-    
+
     # Delete saved session since application is complete
     if update.effective_user:
-        storage = _get_storage(context)
         await storage.delete_session(update.effective_user.id)
-    
-    # Send thank you message with application ID
+
+    # The application is on disk, so thank the user before any network side effect
     success_text = remote_config.get_content_text("application_success", language)
     if success_text:
         success_text = success_text.replace("{app_id}", application_id)
@@ -2465,8 +2271,157 @@ async def finalize_application(update: Update, context: ContextTypes.DEFAULT_TYP
         reply_markup=_menu_keyboard(language),
         parse_mode="HTML",
     )
-    
-    # Send confirmation image with CodeX logo
+
+    # Supabase and the webhook both want the voice URL; resolve it once for both
+    voice_url_task: Optional[asyncio.Task] = None
+
+    def voice_url() -> "asyncio.Future[Optional[str]]":
+        nonlocal voice_url_task
+        if voice_url_task is None:
+            voice_url_task = asyncio.ensure_future(_resolve_voice_file_url(context, voice_file_id))
+        # Shared by two stages; one timing out must not cancel the lookup for the other
+        return asyncio.shield(voice_url_task)
+
+    async def submit_to_supabase() -> None:
+        supabase_client = _get_supabase_client(context)
+        if not supabase_client or not supabase_client.supabase_enabled:
+            return
+        supabase_payload = {
+            "telegram_user_id": str(applicant["telegram_id"]),
+            "username": applicant.get("username"),
+            "full_name": answers.get("full_name"),
+            "email": answers.get("email"),
+            "phone": answers.get("contact"),
+            "role_focus": answers.get("role_category"),
+            "location": answers.get("location"),
+            "skills": answers.get("skills"),
+            "experience": answers.get("experience"),
+            "portfolio_url": answers.get("portfolio"),
+            "motivation": answers.get("motivation"),
+            "salary_expectations": answers.get("salary"),
+            "earliest_start": answers.get("start_date"),
+            "working_hours": answers.get("working_hours"),
+            "answers": answers,
+            "application_id": application_id,
+            "submitted_at": submitted_at,
+            "language": language.value,
+        }
+        voice_file_url = await voice_url()
+        # Add voice sample info if available
+        if voice_file_url or voice_file_id:
+            supabase_payload["voice_sample"] = {
+                "file_url": voice_file_url,
+                "file_id": voice_file_id,
+                "file_name": f"{applicant['telegram_id']}_voice.ogg",
+                "content_type": "audio/ogg",
+            }
+        if await _deliver_via_outbox(context, "supabase", f"supabase:{application_id}", supabase_payload):
+            logger.info(f"Application {application_id} submitted to Supabase")
+        else:
+            logger.warning(f"Application {application_id} failed to submit to Supabase (queued in the outbox)")
+
+    async def post_webhook() -> None:
+        # Send to webhook notifier (legacy)
+        if not _get_application_notifier(context).enabled:
+            return
+        await _deliver_via_outbox(
+            context,
+            "webhook",
+            f"webhook:{application_id}",
+            {
+                "application_id": application_id,
+                "submitted_at": submitted_at,
+                "language": language.value,
+                "answers": answers,
+                "full_name": answers.get("full_name"),
+                "email": answers.get("email"),
+                "contact": answers.get("contact"),
+                "portfolio": answers.get("portfolio"),
+                "voice_file_path": voice_file_path,
+                "voice_file_id": voice_file_id,
+                "voice_file_url": await voice_url(),
+                "voice_skipped": voice_skipped,
+                "telegram_id": applicant["telegram_id"],
+                "telegram_username": applicant["username"],
+                "telegram_first_name": applicant["first_name"],
+                "telegram_last_name": applicant["last_name"],
+            },
+        )
+
+    async def announce_to_group() -> None:
+        await announce_group_submission(
+            context,
+            applicant,
+            answers,
+            voice_file_path,
+            voice_file_id,
+            voice_message_id,
+            user_chat_id,
+            voice_skipped,
+            application_id,
+        )
+
+    _get_postcommit(context).submit(
+        application_id,
+        {
+            "supabase": submit_to_supabase,
+            "webhook": post_webhook,
+            "group": announce_to_group,
+            "media": lambda: _send_confirmation_logo(update, context, language),
+        },
+    )
+
+
+def _outbox_handlers(bot_data: Dict[str, Any]) -> Dict[str, OutboxHandler]:
+    """Delivery callbacks for each outbox entry kind."""
+
+    async def supabase(payload: Dict[str, Any], key: str) -> bool:
+        client: Optional[SupabaseBotClient] = bot_data.get("supabase_client")
+        if not client or not client.supabase_enabled:
+            return False
+        return await client.submit_application(payload, idempotency_key=key, raise_on_reject=True) is not None
+
+    async def webhook(payload: Dict[str, Any], key: str) -> bool:
+        notifier: WebhookNotifier = bot_data["application_notifier"]
+        return await notifier.post(payload, idempotency_key=key, raise_on_reject=True)
+
+    async def contact_webhook(payload: Dict[str, Any], key: str) -> bool:
+        notifier: WebhookNotifier = bot_data["contact_notifier"]
+        return await notifier.post(payload, idempotency_key=key, raise_on_reject=True)
+
+    return {"supabase": supabase, "webhook": webhook, "contact_webhook": contact_webhook}
+
+
+async def _deliver_via_outbox(
+    context: ContextTypes.DEFAULT_TYPE,
+    kind: str,
+    key: str,
+    payload: Dict[str, Any],
+) -> bool:
+    """Record ``payload`` in the outbox and attempt it now; retries happen in the outbox job."""
+    worker: Optional[OutboxWorker] = context.application.bot_data.get("outbox_worker")
+    if worker:
+        return await worker.submit(key, kind, payload)
+    try:
+        return await _outbox_handlers(context.application.bot_data)[kind](payload, key)
+    except PermanentDeliveryError as exc:
+        logger.error("Delivery %s rejected: %s", key, exc)
+        return False
+
+
+async def _resolve_voice_file_url(context: ContextTypes.DEFAULT_TYPE, file_id: Optional[str]) -> Optional[str]:
+    if not file_id:
+        return None
+    try:
+        telegram_file = await context.bot.get_file(file_id)
+        return telegram_file.file_path
+    except TelegramError as exc:
+        logger.warning("Unable to fetch Telegram voice file URL: %s", exc)
+        return None
+
+
+async def _send_confirmation_logo(update: Update, context: ContextTypes.DEFAULT_TYPE, language: Language) -> None:
+    """Send confirmation image with CodeX logo."""
     settings = _get_settings(context)
     # Try both .png and .jpg extensions
     confirmation_logo_path = None
@@ -2475,7 +2430,7 @@ async def finalize_application(update: Update, context: ContextTypes.DEFAULT_TYP
         if path.exists():
             confirmation_logo_path = path
             break
-    
+
     if confirmation_logo_path:
         try:
             with open(confirmation_logo_path, "rb") as logo_file:
@@ -2488,19 +2443,6 @@ async def finalize_application(update: Update, context: ContextTypes.DEFAULT_TYP
             logger.warning(f"Failed to send confirmation logo: {exc}")
     else:
         logger.info(f"Confirmation logo not found in {settings.media_dir}. Skipping image.")
-    
-    # Now announce with the stored data
-    await announce_group_submission(
-        context, 
-        applicant, 
-        answers_copy,  # Use the copy, not session.answers (which is now empty)
-        voice_path_for_group,
-        voice_file_id_for_group,
-        voice_message_id_for_group,
-        user_chat_id,
-        voice_skipped_for_group,
-        application_id
-    )
 
 
 def _applicant_payload(update: Update) -> dict:
@@ -2528,15 +2470,19 @@ async def save_contact_message(
         language=language,
         message=message,
     )
-    notifier = _get_contact_notifier(context)
-    await notifier.post(
-        {
-            "submitted_at": datetime.now(timezone.utc).isoformat(),
-            "language": language.value,
-            "message": message,
-            "sender": applicant,
-        }
-    )
+    if _get_contact_notifier(context).enabled:
+        # Retried from the outbox like application webhooks
+        await _deliver_via_outbox(
+            context,
+            "contact_webhook",
+            f"contact:{uuid.uuid4().hex}",
+            {
+                "submitted_at": datetime.now(timezone.utc).isoformat(),
+                "language": language.value,
+                "message": message,
+                "sender": applicant,
+            },
+        )
     
     # Send to Telegram group
     await announce_contact_message(context, applicant, message, language)
@@ -2585,7 +2531,7 @@ async def announce_contact_message(
     ])
     
     try:
-        await context.bot.send_message(chat_id=chat_id, text=notification)
+        await context.bot.send_message(chat_id=chat_id, text=notification, rate_limit_args=PRIORITY_ANNOUNCE)
     except TelegramError as exc:
         logger.warning("Failed to send contact message to group: %s", exc)
 
@@ -2679,7 +2625,9 @@ async def announce_group_submission(
     ])
 
     try:
-        await context.bot.send_message(chat_id=chat_id, text=message, parse_mode="HTML")
+        await context.bot.send_message(
+            chat_id=chat_id, text=message, parse_mode="HTML", rate_limit_args=PRIORITY_ANNOUNCE
+        )
         logger.info(f"✅ Application summary sent to group {chat_id} for application {application_id}")
     except TelegramError as exc:
         logger.error(f"❌ Failed to send application summary to group {chat_id}: {exc}", exc_info=True)
@@ -2697,14 +2645,16 @@ async def announce_group_submission(
             await context.bot.forward_message(
                 chat_id=chat_id,
                 from_chat_id=user_chat_id,
-                message_id=voice_message_id
+                message_id=voice_message_id,
+                rate_limit_args=PRIORITY_ANNOUNCE,
             )
             logger.info(f"Voice message successfully forwarded to group {chat_id}")
             # Add a caption message
             await context.bot.send_message(
                 chat_id=chat_id,
                 text=f"<b>🎙 English Voice Sample</b>\nFrom: {value('full_name')}",
-                parse_mode="HTML"
+                parse_mode="HTML",
+                rate_limit_args=PRIORITY_ANNOUNCE,
             )
         except TelegramError as exc:
             logger.error(f"Failed to forward voice message to group: {exc}", exc_info=True)
@@ -2716,7 +2666,8 @@ async def announce_group_submission(
                         chat_id=chat_id,
                         voice=voice_file_id,
                         caption=f"🎙 English Voice Sample from {value('full_name')}",
-                        parse_mode="HTML"
+                        parse_mode="HTML",
+                        rate_limit_args=PRIORITY_ANNOUNCE,
                     )
                     logger.info(f"Voice file sent via fallback method to group {chat_id}")
                 except TelegramError as exc2:
@@ -2724,7 +2675,8 @@ async def announce_group_submission(
                     try:
                         await context.bot.send_message(
                             chat_id=chat_id,
-                            text=f"⚠️ Voice file forwarding failed: {str(exc2)[:100]}"
+                            text=f"⚠️ Voice file forwarding failed: {str(exc2)[:100]}",
+                            rate_limit_args=PRIORITY_ANNOUNCE,
                         )
                     except:
                         pass
@@ -2736,7 +2688,8 @@ async def announce_group_submission(
                 chat_id=chat_id,
                 voice=voice_file_id,
                 caption=f"🎙 English Voice Sample from {value('full_name')}",
-                parse_mode="HTML"
+                parse_mode="HTML",
+                rate_limit_args=PRIORITY_ANNOUNCE,
             )
             logger.info(f"Voice file sent via file_id to group {chat_id}")
         except TelegramError as exc:
@@ -3054,22 +3007,12 @@ async def handle_admin_status(update: Update, context: ContextTypes.DEFAULT_TYPE
     storage = _get_storage(context)
     settings = _get_settings(context)
     
-    # Count local applications
-    app_count = 0
-    if settings.applications_file.exists():
-        with settings.applications_file.open("r", encoding="utf-8") as f:
-            app_count = sum(1 for line in f if line.strip())
-    
-    # Count contact messages
-    contact_count = 0
-    if settings.contact_file.exists():
-        with settings.contact_file.open("r", encoding="utf-8") as f:
-            contact_count = sum(1 for line in f if line.strip())
+    # Count local applications and contact messages
+    app_count = await storage.count_applications()
+    contact_count = await storage.count_contact_messages()
     
     # Count active sessions
-    session_count = 0
-    if settings.sessions_dir.exists():
-        session_count = len(list(settings.sessions_dir.glob("session_*.json")))
+    session_count = await storage.count_sessions()
     
     # Count voice samples
     voice_count = 0
@@ -3115,8 +3058,57 @@ async def handle_admin_status(update: Update, context: ContextTypes.DEFAULT_TYPE
                 "\n\n⚠️ Supabase: اتصال ناموفق"
             )
     
+    log_status = ""
+    log_stats = supabase_client.log_stats if supabase_client else None
+    if log_stats:
+        log_status = (
+            f"\n\n📝 Chat log queue: {supabase_client.log_pending} pending, "
+            f"{log_stats.sent} sent, {log_stats.dropped} dropped, {log_stats.failed} failed"
+        )
+    send_scheduler: Optional[SendScheduler] = context.application.bot_data.get("send_scheduler")
+    if send_scheduler:
+        send_stats = send_scheduler.stats
+        log_status += (
+            f"\n📤 Send scheduler: {send_scheduler.queued} queued, {send_stats.sent} sent, "
+            f"{send_stats.delayed} delayed, {send_stats.retried} flood retries"
+        )
+    notifier = context.application.bot_data.get("application_notifier")
+    if isinstance(notifier, WebhookNotifier) and notifier.enabled:
+        breaker = notifier.breaker
+        log_status += (
+            f"\n🔌 Webhook circuit: {breaker.state}, {breaker.stats.failures} failures, "
+            f"{breaker.stats.rejected} fast-failed"
+        )
+    responder = _get_ai_responder(context)
+    if responder and responder.enabled:
+        ai_stats = responder.stats
+        log_status += (
+            f"\n🤖 AI fallback: {responder.breaker.state}, {ai_stats.succeeded} ok / {ai_stats.failed} failed, "
+            f"{ai_stats.avg_latency:.1f}s avg, {ai_stats.short_circuited} short-circuited, {ai_stats.shed} shed, "
+            f"{ai_stats.prompt_tokens + ai_stats.completion_tokens} tokens"
+        )
+    ai_cache: Optional[AIResponseCache] = context.application.bot_data.get("ai_cache")
+    if ai_cache is not None and responder and responder.enabled:
+        ai_cache_stats = ai_cache.stats
+        log_status += (
+            f"\n💬 AI reply cache: {len(ai_cache)} entries, {ai_cache_stats.hits} hits ({ai_cache_stats.hit_rate:.0%}), "
+            f"{ai_cache_stats.coalesced} coalesced"
+        )
+    pipeline: Optional[PostCommitPipeline] = context.application.bot_data.get("postcommit")
+    if pipeline and pipeline.stats:
+        stages = ", ".join(
+            f"{name} {stats.avg_seconds:.1f}s avg/{stats.failures + stats.timeouts} failed"
+            for name, stats in pipeline.stats.items()
+        )
+        log_status += f"\n🧾 Post-commit: {pipeline.pending} running; {stages}"
+    cache_stats = storage.session_cache_stats
+    log_status += (
+        f"\n🧠 Session cache: {cache_stats.hits} hits, {cache_stats.misses} misses "
+        f"({cache_stats.hit_rate:.0%}), {cache_stats.evictions} evicted"
+    )
+
     await update.message.reply_text(
-        local_status + supabase_status,
+        local_status + supabase_status + log_status,
         parse_mode="HTML",
     )
 
@@ -3130,54 +3122,18 @@ async def handle_admin_stats(update: Update, context: ContextTypes.DEFAULT_TYPE)
     storage = _get_storage(context)
     settings = _get_settings(context)
     
-    # Read all applications
-    total_apps = 0
-    completed_apps = 0
-    incomplete_apps = 0
-    en_count = 0
-    fa_count = 0
-    unique_users = set()
-    
-    if settings.applications_file.exists():
-        with settings.applications_file.open("r", encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                try:
-                    app = json.loads(line)
-                    total_apps += 1
-                    unique_users.add(app.get("applicant", {}).get("telegram_id"))
-                    
-                    # Check if completed (has application_id)
-                    if app.get("application_id"):
-                        completed_apps += 1
-                    else:
-                        incomplete_apps += 1
-                    
-                    # Count languages
-                    app_lang = app.get("language", "en")
-                    if app_lang == "en":
-                        en_count += 1
-                    elif app_lang == "fa":
-                        fa_count += 1
-                except json.JSONDecodeError:
-                    continue
-    
-    # Count contact messages
-    contact_count = 0
-    if settings.contact_file.exists():
-        with settings.contact_file.open("r", encoding="utf-8") as f:
-            contact_count = sum(1 for line in f if line.strip())
+    # Materialized counters; no file scan on the event loop
+    stats = await storage.get_stats()
     
     await update.message.reply_text(
         ADMIN_STATS[language].format(
-            total_apps=total_apps,
-            completed_apps=completed_apps,
-            incomplete_apps=incomplete_apps,
-            contact_count=contact_count,
-            unique_users=len(unique_users),
-            en_count=en_count,
-            fa_count=fa_count,
+            total_apps=stats.total_applications,
+            completed_apps=stats.completed_applications,
+            incomplete_apps=stats.incomplete_applications,
+            contact_count=stats.contact_messages,
+            unique_users=len(stats.unique_users),
+            en_count=stats.languages.get("en", 0),
+            fa_count=stats.languages.get("fa", 0),
         ),
         parse_mode="HTML",
     )
@@ -3211,10 +3167,7 @@ async def handle_admin_debug(update: Update, context: ContextTypes.DEFAULT_TYPE)
     storage = _get_storage(context)
     
     # Load user session
-    session_data = await storage.load_session(user_id)
-    user_session = None
-    if session_data:
-        user_session = UserSession.from_dict(session_data)
+    user_session = await storage.load_user_session(user_id)
     
     # Get user applications
     user_apps = await storage.get_user_applications(user_id)
@@ -3288,6 +3241,7 @@ async def handle_admin_test_group(update: Update, context: ContextTypes.DEFAULT_
             chat_id=chat_id,
             text=test_message,
             parse_mode="HTML",
+            rate_limit_args=PRIORITY_ANNOUNCE,
         )
         await update.message.reply_text(
             f"✅ Test message sent to group {chat_id}",
@@ -3349,31 +3303,14 @@ async def handle_group_daily_report(update: Update, context: ContextTypes.DEFAUL
     language = session.language or Language.EN
     storage = _get_storage(context)
     
-    now = datetime.now(timezone.utc)
-    today_start = datetime(now.year, now.month, now.day, tzinfo=timezone.utc)
-    week_start = now - timedelta(days=7)
-    month_start = now - timedelta(days=30)
-    
-    # Get applications
-    today_apps = await storage.get_applications_by_date_range(today_start, now)
-    week_apps = await storage.get_applications_by_date_range(week_start, now)
-    month_apps = await storage.get_applications_by_date_range(month_start, now)
-    
-    # Get contact messages
-    today_contacts = await storage.get_contact_messages_by_date_range(today_start, now)
-    week_contacts = await storage.get_contact_messages_by_date_range(week_start, now)
-    month_contacts = await storage.get_contact_messages_by_date_range(month_start, now)
-    
-    # Count voice samples
-    today_voices = sum(1 for app in today_apps if app.get("voice_file_path") or app.get("voice_file_id"))
-    today_skipped = sum(1 for app in today_apps if app.get("voice_skipped", False))
-    
-    # Language breakdown
-    en_count = sum(1 for app in today_apps if app.get("language") == "en")
-    fa_count = sum(1 for app in today_apps if app.get("language") == "fa")
+    # One pass over each store for every window
+    report = await storage.get_activity_report(recent_limit=5)
+    now = report.generated_at
+    en_count = report.today_languages.get("en", 0)
+    fa_count = report.today_languages.get("fa", 0)
     
     # Recent applications list (last 5)
-    recent_apps = today_apps[:5]
+    recent_apps = report.recent_today
     recent_list = ""
     if recent_apps:
         recent_items = []
@@ -3411,16 +3348,16 @@ async def handle_group_daily_report(update: Update, context: ContextTypes.DEFAUL
     await update.message.reply_text(
         GROUP_DAILY_REPORT[language].format(
             date=date_str,
-            today_apps=len(today_apps),
-            today_contacts=len(today_contacts),
-            today_voices=today_voices,
-            today_skipped=today_skipped,
+            today_apps=report.applications.today,
+            today_contacts=report.contacts.today,
+            today_voices=report.today_voices,
+            today_skipped=report.today_skipped,
             en_count=en_count,
             fa_count=fa_count,
-            week_apps=len(week_apps),
-            week_contacts=len(week_contacts),
-            month_apps=len(month_apps),
-            month_contacts=len(month_contacts),
+            week_apps=report.applications.week,
+            week_contacts=report.contacts.week,
+            month_apps=report.applications.month,
+            month_contacts=report.contacts.month,
             recent_list=recent_list,
         ),
         parse_mode="HTML",
@@ -3446,53 +3383,29 @@ async def handle_group_stats(update: Update, context: ContextTypes.DEFAULT_TYPE)
     language = session.language or Language.EN
     storage = _get_storage(context)
     
-    now = datetime.now(timezone.utc)
-    today_start = datetime(now.year, now.month, now.day, tzinfo=timezone.utc)
-    week_start = now - timedelta(days=7)
-    month_start = now - timedelta(days=30)
-    
-    # Get all applications
-    all_apps = await storage.get_all_applications()
-    today_apps = await storage.get_applications_by_date_range(today_start, now)
-    week_apps = await storage.get_applications_by_date_range(week_start, now)
-    month_apps = await storage.get_applications_by_date_range(month_start, now)
-    
-    # Get all contact messages
-    all_contacts = await storage.get_all_contact_messages()
-    
-    # Count unique users
-    unique_users = set()
-    for app in all_apps:
-        applicant = app.get("applicant", {})
-        user_id = applicant.get("telegram_id")
-        if user_id:
-            unique_users.add(user_id)
-    
-    # Voice samples
-    total_voices = sum(1 for app in all_apps if app.get("voice_file_path") or app.get("voice_file_id"))
-    total_skipped = sum(1 for app in all_apps if app.get("voice_skipped", False))
-    
-    # Language breakdown
-    en_count = sum(1 for app in all_apps if app.get("language") == "en")
-    fa_count = sum(1 for app in all_apps if app.get("language") == "fa")
+    # Materialized counters; windows are summed from per-day (UTC) buckets
+    stats = await storage.get_stats()
+    today = datetime.now(timezone.utc).date()
+    en_count = stats.languages.get("en", 0)
+    fa_count = stats.languages.get("fa", 0)
     total_lang = en_count + fa_count
     en_percent = round((en_count / total_lang * 100) if total_lang > 0 else 0, 1)
     fa_percent = round((fa_count / total_lang * 100) if total_lang > 0 else 0, 1)
     
     await update.message.reply_text(
         GROUP_STATS_REPORT[language].format(
-            total_apps=len(all_apps),
-            total_contacts=len(all_contacts),
-            unique_users=len(unique_users),
-            total_voices=total_voices,
-            total_skipped=total_skipped,
+            total_apps=stats.total_applications,
+            total_contacts=stats.contact_messages,
+            unique_users=len(stats.unique_users),
+            total_voices=stats.voice_samples,
+            total_skipped=stats.voice_skipped,
             en_count=en_count,
             en_percent=en_percent,
             fa_count=fa_count,
             fa_percent=fa_percent,
-            today_apps=len(today_apps),
-            week_apps=len(week_apps),
-            month_apps=len(month_apps),
+            today_apps=stats.window("applications", today, 1),
+            week_apps=stats.window("applications", today, 7),
+            month_apps=stats.window("applications", today, 30),
         ),
         parse_mode="HTML",
     )
@@ -3722,6 +3635,50 @@ async def handle_admin_reload_config(update: Update, context: ContextTypes.DEFAU
         )
 
 
+def _format_age(seconds: float) -> str:
+    seconds = max(0, int(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+
+
+async def handle_admin_outbox(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Show pending outbox deliveries (depth, oldest age, next retry) and dead letters."""
+    if not await _require_admin(update, context) or not update.message:
+        return
+    worker: Optional[OutboxWorker] = context.application.bot_data.get("outbox_worker")
+    if not worker:
+        await update.message.reply_text("Outbox is not configured.", parse_mode="HTML")
+        return
+    summary = await asyncio.to_thread(worker.outbox.summary)
+    now = time.time()
+    lines = [
+        "<b>📮 Outbox</b>",
+        f"Pending: {summary.depth}",
+    ]
+    if summary.depth:
+        kinds = ", ".join(f"{kind} {count}" for kind, count in sorted(summary.by_kind.items()))
+        lines.append(f"By kind: {kinds}")
+        lines.append(f"Oldest pending: {_format_age(now - summary.oldest_created_at)} ago")
+        lines.append(f"Next retry: in {_format_age(summary.next_attempt_at - now)}")
+        lines.append(f"Most attempts: {summary.max_attempts}")
+        if summary.last_error:
+            lines.append(f"Last error (oldest): {html.escape(summary.last_error[:200])}")
+    lines.append(f"Dead letters: {summary.dead}")
+    if summary.dead:
+        for entry in await asyncio.to_thread(worker.outbox.dead_letters, 5):
+            error = html.escape((entry.last_error or "unknown error")[:200])
+            lines.append(f"• <code>{html.escape(entry.key)}</code> after {entry.attempts} attempts: {error}")
+    stats = worker.stats
+    lines.append(
+        f"Since start: {stats.delivered} delivered, {stats.deferred} deferred, "
+        f"{stats.dead} dead-lettered, {stats.duplicates} duplicates"
+    )
+    await update.message.reply_text("\n".join(lines), parse_mode="HTML")
+
+
 async def handle_admin_sessions(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """List all active sessions."""
     if not await _require_admin(update, context) or not update.message:
@@ -3731,10 +3688,10 @@ async def handle_admin_sessions(update: Update, context: ContextTypes.DEFAULT_TY
     settings = _get_settings(context)
     storage = _get_storage(context)
     
-    # Get all session files
-    session_files = list(settings.sessions_dir.glob("session_*.json"))
+    # Indexed count plus the 20 most recently active sessions
+    session_count = await storage.count_sessions()
     
-    if not session_files:
+    if not session_count:
         await update.message.reply_text(
             ADMIN_NO_SESSIONS[language],
             parse_mode="HTML",
@@ -3742,16 +3699,13 @@ async def handle_admin_sessions(update: Update, context: ContextTypes.DEFAULT_TY
         return
     
     sessions_list = []
-    for session_file in session_files[:20]:  # Limit to 20 sessions
+    for user_id in await storage.list_session_user_ids(limit=20):  # Limit to 20 sessions
         try:
-            user_id = int(session_file.stem.split("_")[1])
-            session_data = await storage.load_session(user_id)
-            if session_data:
-                user_session = UserSession.from_dict(session_data)
-                if user_session.has_incomplete_application():
-                    progress = len([v for v in user_session.answers.values() if v])
-                    lang = user_session.language.value if user_session.language else "N/A"
-                    sessions_list.append(f"• User {user_id}: {progress} answers, {lang}")
+            user_session = await storage.load_user_session(user_id)
+            if user_session and user_session.has_incomplete_application():
+                progress = len([v for v in user_session.answers.values() if v])
+                lang = user_session.language.value if user_session.language else "N/A"
+                sessions_list.append(f"• User {user_id}: {progress} answers, {lang}")
         except Exception:
             continue
     
@@ -3763,12 +3717,12 @@ async def handle_admin_sessions(update: Update, context: ContextTypes.DEFAULT_TY
         return
     
     sessions_text = "\n".join(sessions_list)
-    if len(session_files) > 20:
-        sessions_text += f"\n\n... and {len(session_files) - 20} more"
+    if session_count > 20:
+        sessions_text += f"\n\n... and {session_count - 20} more"
     
     await update.message.reply_text(
         ADMIN_SESSIONS_LIST[language].format(
-            count=len(session_files),
+            count=session_count,
             sessions_list=sessions_text,
         ),
             parse_mode="HTML",
@@ -3776,17 +3730,102 @@ async def handle_admin_sessions(update: Update, context: ContextTypes.DEFAULT_TY
 
 
 async def _refresh_config_job(context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Periodically refresh remote configuration from Supabase."""
+    """Refresh remote configuration, polling faster for a while after it changes."""
+    settings = context.application.bot_data.get("settings")
+    schedule: Optional[AdaptivePollSchedule] = context.application.bot_data.get("config_schedule")
+    if schedule is None:
+        schedule = AdaptivePollSchedule(
+            getattr(settings, "config_refresh_min_interval", 30.0),
+            getattr(settings, "config_refresh_interval", 300.0),
+        )
+        schedule.current = schedule.max_interval
+        context.application.bot_data["config_schedule"] = schedule
+
+    changed = False
     supabase_client = context.application.bot_data.get("supabase_client")
-    if supabase_client and supabase_client.enabled:
-        try:
-            success = await supabase_client.refresh_remote_content()
-            if success:
-                logger.info("Periodic config refresh completed successfully")
-            else:
-                logger.debug("Periodic config refresh returned no updates")
-        except Exception as exc:  # pylint: disable=broad-except
-            logger.warning("Periodic config refresh failed: %s", exc)
+    try:
+        if supabase_client and supabase_client.enabled:
+            version = remote_config.version
+            try:
+                success = await supabase_client.refresh_remote_content()
+                changed = success and remote_config.version != version
+                if changed:
+                    logger.info("Periodic config refresh applied a new config version")
+                elif success:
+                    logger.debug("Periodic config refresh found no changes")
+                else:
+                    logger.debug("Periodic config refresh returned no updates")
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("Periodic config refresh failed: %s", exc)
+    finally:
+        # An admin edit often comes in a series, so check again soon after one lands
+        delay = schedule.record(changed)
+        if context.job_queue:
+            context.job_queue.run_once(_refresh_config_job, when=delay, name="config_refresh")
+
+
+async def _outbox_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Retry due outbox deliveries, then re-schedule for the next one."""
+    worker: Optional[OutboxWorker] = context.application.bot_data.get("outbox_worker")
+    if not worker:
+        return
+    try:
+        await worker.run_once()
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.error("Outbox retry cycle failed: %s", exc, exc_info=True)
+    finally:
+        if context.job_queue:
+            context.job_queue.run_once(_outbox_job, when=worker.next_delay, name="outbox")
+
+
+async def _on_startup(application: Application) -> None:
+    """Fetch the live remote config in the background when no JobQueue will do it."""
+    supabase_client: Optional[SupabaseBotClient] = application.bot_data.get("supabase_client")
+    if supabase_client and supabase_client.enabled and not application.job_queue:
+        application.create_task(supabase_client.refresh_remote_content())
+
+
+async def _on_stop(application: Application) -> None:
+    """Let post-commit side effects finish while the bot can still send."""
+    pipeline: Optional[PostCommitPipeline] = application.bot_data.get("postcommit")
+    if pipeline and pipeline.pending:
+        logger.info("Waiting for %d post-commit jobs before shutdown", pipeline.pending)
+        await pipeline.drain()
+
+
+async def _on_shutdown(application: Application) -> None:
+    """Release long-lived resources once PTB has stopped processing updates."""
+    storage: Optional[DataStorage] = application.bot_data.get("storage")
+    if storage:
+        # Write-behind sessions must reach disk before the process exits
+        await storage.close()
+    for key in ("application_notifier", "contact_notifier"):
+        notifier: Optional[WebhookNotifier] = application.bot_data.get(key)
+        if notifier:
+            # Buffered webhook batches go out before the pool closes
+            await notifier.aclose()
+    outbox_worker: Optional[OutboxWorker] = application.bot_data.get("outbox_worker")
+    if outbox_worker:
+        outbox_worker.outbox.close()
+    ai_cache: Optional[AIResponseCache] = application.bot_data.get("ai_cache")
+    if ai_cache is not None:
+        await asyncio.to_thread(ai_cache.save)
+    supabase_client: Optional[SupabaseBotClient] = application.bot_data.get("supabase_client")
+    if supabase_client:
+        # Flushes any buffered chat log events before the pool goes away
+        await supabase_client.aclose()
+    http_pool: Optional[SharedHttpClient] = application.bot_data.get("http_client")
+    if http_pool:
+        await http_pool.aclose()
+        logger.info("Closed shared HTTP connection pool")
+
+
+def _webhook_breaker(name: str, settings) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        failure_threshold=settings.webhook_failure_threshold,
+        reset_timeout=settings.webhook_reset_timeout,
+    )
 
 
 def main() -> None:
@@ -3795,63 +3834,163 @@ def main() -> None:
         level=logging.INFO,
     )
     settings = load_settings()
-    storage = DataStorage(settings.applications_file, settings.contact_file, settings.sessions_dir)
+    application_store = None
+    if settings.storage_backend == "sqlite" and settings.sqlite_path:
+        application_store = SQLiteApplicationStore(settings.sqlite_path)
+        # One-shot import of the legacy JSONL file (no-op once recorded)
+        imported = application_store.import_jsonl(settings.applications_file)
+        if imported:
+            logger.info(f"Imported {imported} applications from JSONL into SQLite")
+        logger.info(f"Using SQLite application store at {settings.sqlite_path}")
+    else:
+        application_store = JsonlApplicationStore(settings.applications_file)
+        # Build the offset index up front so the first /app lookup is not a full scan
+        indexed = application_store.refresh()
+        logger.info(f"Indexed {indexed} applications from {settings.applications_file}")
+    session_store = None
+    if settings.session_backend == "sqlite" and settings.sqlite_path:
+        session_store = SQLiteSessionStore(settings.sqlite_path)
+        # One-shot import of the legacy per-user session files (no-op once recorded)
+        imported = session_store.import_files(settings.sessions_dir)
+        if imported:
+            logger.info(f"Imported {imported} session files into SQLite")
+        logger.info(f"Using SQLite session store at {settings.sqlite_path}")
+    storage = DataStorage(
+        settings.applications_file,
+        settings.contact_file,
+        settings.sessions_dir,
+        application_store=application_store,
+        session_flush_delay=settings.session_flush_delay,
+        session_store=session_store,
+        session_cache_size=settings.session_cache_size,
+        session_cache_ttl=settings.session_cache_ttl,
+        stats_flush_delay=settings.stats_flush_delay,
+    )
 
-    supabase_client = SupabaseBotClient(settings)
-    if supabase_client.enabled:
-        try:
-            asyncio.run(supabase_client.refresh_remote_content())
-            logger.info("Initial remote config loaded from Supabase")
-        except Exception as exc:  # pylint: disable=broad-except
-            logger.warning("Failed to bootstrap remote config: %s", exc)
+    http_pool = SharedHttpClient.from_settings(settings)
+    supabase_client = SupabaseBotClient(settings, http=http_pool)
+    # Serve the last good config right away; the live fetch runs once polling has started
+    if supabase_client.enabled and not supabase_client.load_config_snapshot():
+        logger.info("No remote config snapshot yet; using built-in defaults until Supabase responds")
 
     # Ensure there's an event loop for PTB when running under Python 3.12+
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
 
-    application = Application.builder().token(settings.bot_token).build()
+    # Every Bot API send is paced per chat and globally, with priority lanes
+    send_scheduler = SendScheduler(
+        global_per_second=settings.send_global_per_second,
+        group_per_minute=settings.send_group_per_minute,
+    )
+    application = (
+        Application.builder()
+        .token(settings.bot_token)
+        .rate_limiter(send_scheduler)
+        .post_init(_on_startup)
+        .post_stop(_on_stop)
+        .post_shutdown(_on_shutdown)
+        .build()
+    )
     application.bot_data["storage"] = storage
+    application.bot_data["http_client"] = http_pool
+    application.bot_data["send_scheduler"] = send_scheduler
     application.bot_data["settings"] = settings
+    application.bot_data["postcommit"] = PostCommitPipeline(stage_timeout=settings.postcommit_stage_timeout)
+    webhook_options = dict(
+        http=http_pool,
+        timeout=settings.webhook_timeout,
+        batch_size=settings.webhook_batch_size,
+        batch_interval=settings.webhook_batch_interval,
+    )
+    application_webhook_url = settings.application_webhook_url
+    contact_webhook_url = settings.contact_webhook_url or application_webhook_url
+    application_breaker = _webhook_breaker("application webhook", settings)
+    # One endpoint, one health state
+    contact_breaker = (
+        application_breaker
+        if contact_webhook_url == application_webhook_url
+        else _webhook_breaker("contact webhook", settings)
+    )
     application.bot_data["application_notifier"] = WebhookNotifier(
-        settings.application_webhook_url,
+        application_webhook_url,
         settings.application_webhook_token,
         "application",
+        breaker=application_breaker,
+        **webhook_options,
     )
     application.bot_data["contact_notifier"] = WebhookNotifier(
-        settings.contact_webhook_url or settings.application_webhook_url,
+        contact_webhook_url,
         settings.application_webhook_token,
         "contact",
+        breaker=contact_breaker,
+        **webhook_options,
     )
     application.bot_data["group_chat_id"] = settings.group_chat_id
     application.bot_data["ai_responder"] = OpenAIFallback(
         settings.openai_api_key,
         settings.openai_model,
+        settings.openai_timeout,
+        http=http_pool,
+        max_concurrency=settings.openai_max_concurrency,
+        queue_timeout=settings.openai_queue_timeout,
+        breaker=CircuitBreaker(
+            "openai",
+            failure_threshold=settings.openai_failure_threshold,
+            reset_timeout=settings.openai_reset_timeout,
+        ),
     )
+    if settings.ai_cache_size > 0:
+        ai_cache = AIResponseCache(
+            max_entries=settings.ai_cache_size,
+            ttl=settings.ai_cache_ttl,
+            path=settings.data_dir / "ai_cache.json" if settings.ai_cache_persist else None,
+        )
+        restored = ai_cache.load()
+        if restored:
+            logger.info(f"Restored {restored} cached AI replies")
+        application.bot_data["ai_cache"] = ai_cache
     application.bot_data["supabase_client"] = supabase_client
+    # Supabase submissions and webhooks that fail are retried from disk, across restarts
+    application.bot_data["outbox_worker"] = OutboxWorker(
+        Outbox(settings.data_dir / "outbox.db"),
+        _outbox_handlers(application.bot_data),
+        base_delay=settings.outbox_base_delay,
+        max_delay=settings.outbox_max_delay,
+        poll_interval=settings.outbox_poll_interval,
+        max_attempts=settings.outbox_max_attempts,
+    )
+    if application.job_queue:
+        application.job_queue.run_once(_outbox_job, when=5, name="outbox")
     init_conversation_logger(supabase_client if supabase_client.enabled else None)
 
-    # Schedule periodic config refresh every 5 minutes if Supabase is enabled
+    # Schedule config refresh and outbound polling if Supabase is enabled
     if supabase_client.enabled and application.job_queue:
-        application.job_queue.run_repeating(
-            _refresh_config_job,
-            interval=300,  # 5 minutes
-            first=300,  # First run after 5 minutes
-            name="config_refresh",
-        )
-        application.job_queue.run_repeating(
+        # Both jobs re-schedule themselves with an adaptive delay; the first
+        # config refresh runs immediately and hot-swaps the snapshot loaded above
+        application.job_queue.run_once(_refresh_config_job, when=0, name="config_refresh")
+        application.job_queue.run_once(
             _outbound_poll_job,
-            interval=30,
-            first=30,
+            when=settings.outbound_poll_min_interval,
             name="outbound_poll",
         )
-        logger.info("Scheduled periodic config refresh every 5 minutes")
-        logger.info("Scheduled outbound message polling every 30 seconds")
+        logger.info(
+            "Scheduled config refresh now, then adaptive (%.0fs after a change, up to %.0fs)",
+            settings.config_refresh_min_interval,
+            settings.config_refresh_interval,
+        )
+        logger.info(
+            "Scheduled adaptive outbound polling (%.0f-%.0fs%s)",
+            settings.outbound_poll_min_interval,
+            settings.outbound_poll_max_interval,
+            f", long-poll {settings.outbound_long_poll:.0f}s" if settings.outbound_long_poll else "",
+        )
     elif supabase_client.enabled:
         logger.warning("JobQueue not available - periodic config refresh disabled")
         logger.warning("JobQueue not available - outbound message polling disabled")
 
-    # Log every incoming update (group -1 ensures it's first)
-    application.add_handler(MessageHandler(filters.ALL, handle_conversation_logging), group=-1)
+    # Log every incoming update (group -2 ensures it's first), then throttle commands
+    application.add_handler(MessageHandler(filters.ALL, handle_conversation_logging), group=-2)
+    application.add_handler(MessageHandler(filters.COMMAND, handle_command_rate_limit), group=-1)
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("menu", menu_command))
     application.add_handler(CommandHandler("help", handle_help))
@@ -3867,6 +4006,7 @@ def main() -> None:
     application.add_handler(CommandHandler("sessions", handle_admin_sessions))
     application.add_handler(CommandHandler("cleanup", handle_admin_cleanup))
     application.add_handler(CommandHandler("reloadconfig", handle_admin_reload_config))
+    application.add_handler(CommandHandler("outbox", handle_admin_outbox))
     application.add_handler(CommandHandler("testgroup", handle_admin_test_group))
     # Group commands (work in both private and group chats, but require admin in groups)
     application.add_handler(CommandHandler("daily", handle_group_daily_report))
@@ -3892,7 +4032,10 @@ def main() -> None:
         logger.info(f"✅ Supabase integration ENABLED")
         logger.info(f"   - URL: {settings.supabase_url}")
         logger.info(f"   - Applications endpoint: telegram-applications")
-        logger.info(f"   - Config refresh: every 5 minutes")
+        logger.info(
+            f"   - Config refresh: at startup, then every {settings.config_refresh_min_interval:.0f}s "
+            f"after a change, backing off to {settings.config_refresh_interval:.0f}s"
+        )
     else:
         logger.info("📴 Supabase integration not configured (local storage only)")
     
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+@dataclass(slots=True)
+class CircuitStats:
+    successes: int = 0
+    failures: int = 0
+    rejected: int = 0
+    opened: int = 0
+
+
+class CircuitBreaker:
+    """Fails fast while a remote endpoint keeps erroring.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    ``allow`` returns False for ``reset_timeout`` seconds. Then one probe call is
+    let through (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_timeout = max(0.0, reset_timeout)
+        self._clock = clock
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self.stats = CircuitStats()
+
+    @property
+    def state(self) -> str:
+        if self._state == STATE_OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+            return STATE_HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; the first call after the timeout is the probe."""
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        now = self._clock()
+        # A probe that never reported back (e.g. cancelled) stops blocking after another timeout
+        if state == STATE_HALF_OPEN and (
+            self._state != STATE_HALF_OPEN or now - self._probe_started >= self._reset_timeout
+        ):
+            self._state = STATE_HALF_OPEN
+            self._probe_started = now
+            return True
+        self.stats.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.stats.successes += 1
+        if self._state != STATE_CLOSED:
+            logger.info("Circuit %s closed; endpoint recovered", self.name)
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        self.stats.failures += 1
+        self._consecutive_failures += 1
+        if self._state == STATE_HALF_OPEN or self._consecutive_failures >= self._failure_threshold:
+            if self._state != STATE_OPEN:
+                self.stats.opened += 1
+                logger.warning(
+                    "Circuit %s opened after %d failures; failing fast for %.0fs",
+                    self.name,
+                    self._consecutive_failures,
+                    self._reset_timeout,
+                )
+            self._state = STATE_OPEN
+            self._opened_at = self._clock()
@@ -24,6 +24,37 @@ def _sanitize_secret(value: Optional[str], label: str) -> Optional[str]:
     return cleaned or None
 
 
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to ``default``."""
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning(f"Invalid {name}: {raw}. Using default {default}.")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to ``default``."""
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning(f"Invalid {name}: {raw}. Using default {default}.")
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    return raw.lower() in {"1", "true", "yes", "on"}
+
+
 @dataclass(slots=True)
 class Settings:
     bot_token: str
@@ -50,6 +81,65 @@ class Settings:
     supabase_url: Optional[str]
     supabase_anon_key: Optional[str]
     bot_webhook_secret: Optional[str]
+    # Shared HTTP connection pool
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry: float = 30.0
+    http2_enabled: bool = True
+    # Batched conversation-log shipping
+    log_batch_size: int = 50
+    log_flush_interval: float = 2.0
+    log_queue_size: int = 1000
+    log_overflow: str = "drop_oldest"
+    # POST {"events": [...]} per batch; off (or a 4xx reply) sends one event per request
+    log_batch_requests: bool = True
+    # Application storage backend: "jsonl" (default) or "sqlite"
+    storage_backend: str = "jsonl"
+    sqlite_path: Optional[Path] = None
+    # Session backend: "file" (one JSON file per user, default) or "sqlite"
+    session_backend: str = "file"
+    # Seconds to coalesce session saves before writing them (0 = write-through)
+    session_flush_delay: float = 1.0
+    stats_flush_delay: float = 30.0
+    # LRU cache of deserialized sessions
+    session_cache_size: int = 1000
+    session_cache_ttl: float = 600.0
+    # Outbound Telegram pacing (Bot API flood limits)
+    send_global_per_second: float = 30.0
+    send_group_per_minute: int = 20
+    # Outbound queue (bot-outbound) deliveries in flight at once
+    outbound_concurrency: int = 8
+    # Adaptive outbound polling: back off from min to max while idle
+    outbound_poll_min_interval: float = 2.0
+    outbound_poll_max_interval: float = 60.0
+    # Seconds the bot-outbound endpoint may hold a poll open (0 = plain polling)
+    outbound_long_poll: float = 0.0
+    # Remote config refresh; drops to the min interval after a change and backs off again
+    config_refresh_interval: float = 300.0
+    config_refresh_min_interval: float = 30.0
+    # Upper bound for each background side effect of a saved application
+    postcommit_stage_timeout: float = 120.0
+    # Outbox retries: exponential backoff from base to max delay, checked every poll interval
+    outbox_base_delay: float = 30.0
+    outbox_max_delay: float = 3600.0
+    outbox_poll_interval: float = 60.0
+    outbox_max_attempts: int = 20
+    # Application/contact webhooks: circuit breaker and optional batching (0 = one POST per payload)
+    webhook_timeout: float = 10.0
+    webhook_failure_threshold: int = 5
+    webhook_reset_timeout: float = 30.0
+    webhook_batch_size: int = 0
+    webhook_batch_interval: float = 1.0
+    # OpenAI fallback: concurrent requests, queue wait before shedding, circuit breaker
+    openai_timeout: float = 15.0
+    openai_max_concurrency: int = 4
+    openai_queue_timeout: float = 5.0
+    openai_failure_threshold: int = 3
+    openai_reset_timeout: float = 60.0
+    # Cached AI fallback replies (0 entries = off); persisted to data/ai_cache.json
+    ai_cache_size: int = 512
+    ai_cache_ttl: float = 3600.0
+    ai_cache_persist: bool = True
 
 
 def load_settings() -> Settings:
@@ -130,6 +220,21 @@ def load_settings() -> Settings:
     if supabase_url and not bot_log_url:
         bot_log_url = f"{supabase_url}/functions/v1/bot-log"
     
+    log_overflow = (os.getenv("BOT_LOG_OVERFLOW") or "drop_oldest").strip().lower()
+    if log_overflow not in {"drop_oldest", "block"}:
+        logger.warning(f"Invalid BOT_LOG_OVERFLOW: {log_overflow}. Using drop_oldest.")
+        log_overflow = "drop_oldest"
+
+    storage_backend = (os.getenv("STORAGE_BACKEND") or "jsonl").strip().lower()
+    if storage_backend not in {"jsonl", "sqlite"}:
+        logger.warning(f"Invalid STORAGE_BACKEND: {storage_backend}. Using jsonl.")
+        storage_backend = "jsonl"
+
+    session_backend = (os.getenv("SESSION_BACKEND") or "file").strip().lower()
+    if session_backend not in {"file", "sqlite"}:
+        logger.warning(f"Invalid SESSION_BACKEND: {session_backend}. Using file.")
+        session_backend = "file"
+
     # Load admin user IDs (comma-separated)
     admin_ids_str = os.getenv("ADMIN_USER_IDS", "")
     admin_user_ids: List[int] = []
@@ -166,5 +271,47 @@ def load_settings() -> Settings:
         supabase_url=supabase_url,
         supabase_anon_key=supabase_anon_key,
         bot_webhook_secret=bot_webhook_secret,
+        http_max_connections=_env_int("HTTP_MAX_CONNECTIONS", 20),
+        http_max_keepalive_connections=_env_int("HTTP_MAX_KEEPALIVE_CONNECTIONS", 10),
+        http_keepalive_expiry=_env_float("HTTP_KEEPALIVE_EXPIRY", 30.0),
+        http2_enabled=_env_bool("HTTP2_ENABLED", True),
+        log_batch_size=_env_int("BOT_LOG_BATCH_SIZE", 50),
+        log_flush_interval=_env_float("BOT_LOG_FLUSH_INTERVAL", 2.0),
+        log_queue_size=_env_int("BOT_LOG_QUEUE_SIZE", 1000),
+        log_overflow=log_overflow,
+        log_batch_requests=_env_bool("BOT_LOG_BATCH_REQUESTS", True),
+        storage_backend=storage_backend,
+        sqlite_path=data_dir / "codexs.db",
+        session_backend=session_backend,
+        session_flush_delay=_env_float("SESSION_FLUSH_DELAY", 1.0),
+        stats_flush_delay=_env_float("STATS_FLUSH_DELAY", 30.0),
+        session_cache_size=_env_int("SESSION_CACHE_SIZE", 1000),
+        session_cache_ttl=_env_float("SESSION_CACHE_TTL", 600.0),
+        send_global_per_second=_env_float("SEND_GLOBAL_PER_SECOND", 30.0),
+        send_group_per_minute=_env_int("SEND_GROUP_PER_MINUTE", 20),
+        outbound_concurrency=_env_int("OUTBOUND_CONCURRENCY", 8),
+        outbound_poll_min_interval=_env_float("OUTBOUND_POLL_MIN_INTERVAL", 2.0),
+        outbound_poll_max_interval=_env_float("OUTBOUND_POLL_MAX_INTERVAL", 60.0),
+        outbound_long_poll=_env_float("OUTBOUND_LONG_POLL_SECONDS", 0.0),
+        config_refresh_interval=_env_float("CONFIG_REFRESH_INTERVAL", 300.0),
+        config_refresh_min_interval=_env_float("CONFIG_REFRESH_MIN_INTERVAL", 30.0),
+        postcommit_stage_timeout=_env_float("POSTCOMMIT_STAGE_TIMEOUT", 120.0),
+        outbox_base_delay=_env_float("OUTBOX_BASE_DELAY", 30.0),
+        outbox_max_delay=_env_float("OUTBOX_MAX_DELAY", 3600.0),
+        outbox_poll_interval=_env_float("OUTBOX_POLL_INTERVAL", 60.0),
+        outbox_max_attempts=_env_int("OUTBOX_MAX_ATTEMPTS", 20),
+        webhook_timeout=_env_float("WEBHOOK_TIMEOUT", 10.0),
+        webhook_failure_threshold=_env_int("WEBHOOK_FAILURE_THRESHOLD", 5),
+        webhook_reset_timeout=_env_float("WEBHOOK_RESET_TIMEOUT", 30.0),
+        webhook_batch_size=_env_int("WEBHOOK_BATCH_SIZE", 0),
+        webhook_batch_interval=_env_float("WEBHOOK_BATCH_INTERVAL", 1.0),
+        openai_timeout=_env_float("OPENAI_TIMEOUT", 15.0),
+        openai_max_concurrency=_env_int("OPENAI_MAX_CONCURRENCY", 4),
+        openai_queue_timeout=_env_float("OPENAI_QUEUE_TIMEOUT", 5.0),
+        openai_failure_threshold=_env_int("OPENAI_FAILURE_THRESHOLD", 3),
+        openai_reset_timeout=_env_float("OPENAI_RESET_TIMEOUT", 60.0),
+        ai_cache_size=_env_int("AI_CACHE_SIZE", 512),
+        ai_cache_ttl=_env_float("AI_CACHE_TTL", 3600.0),
+        ai_cache_persist=_env_bool("AI_CACHE_PERSIST", True),
     )
 
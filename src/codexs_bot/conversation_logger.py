@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import Any, Dict, Optional
 
@@ -39,7 +38,8 @@ async def capture_incoming(update: Update) -> None:
     payload = _build_payload_from_message(message)
 
     try:
-        await _supabase_client.log_message(
+        # Never wait for queue space here: this runs ahead of every update's handlers
+        _supabase_client.queue_log_message(
             telegram_user_id=user.id,
             username=user.username,
             direction="incoming",
@@ -72,7 +72,7 @@ def _patch_bot_methods() -> None:
                 if not text:
                     text = f"[{message_type}]"
                 username = _usernames.get(chat_id) if isinstance(chat_id, int) else None
-                _schedule_outgoing_log(chat_id, username, text, message_type)
+                _log_outgoing(chat_id, username, text, message_type)
             except Exception as exc:  # pylint: disable=broad-except
                 logger.debug("Failed to log outgoing %s: %s", method_name, exc)
             return result
@@ -89,24 +89,25 @@ def _patch_bot_methods() -> None:
     _wrap("send_contact", "contact", text_kw="first_name")
 
 
-def _schedule_outgoing_log(chat_id: Optional[int], username: Optional[str], text: str, message_type: str) -> None:
+def _log_outgoing(chat_id: Optional[int], username: Optional[str], text: str, message_type: str) -> None:
+    """Queue an outgoing message for the batched chat log shipper.
+
+    Never waits for queue space, whatever the overflow policy: replies must not
+    stall behind logging.
+    """
     if not _supabase_client or chat_id is None:
         return
-
-    async def _log() -> None:
-        try:
-            await _supabase_client.log_message(
-                telegram_user_id=chat_id,
-                username=username,
-                direction="outgoing",
-                message_type=message_type,
-                text=text,
-                payload={},
-            )
-        except Exception as exc:  # pylint: disable=broad-except
-            logger.debug("Failed to log outgoing message: %s", exc)
-
-    asyncio.create_task(_log())
+    try:
+        _supabase_client.queue_log_message(
+            telegram_user_id=chat_id,
+            username=username,
+            direction="outgoing",
+            message_type=message_type,
+            text=text,
+            payload={},
+        )
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.debug("Failed to log outgoing message: %s", exc)
 
 
 def _infer_message_type(message: Message) -> str:
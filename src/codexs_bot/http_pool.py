@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import importlib.util
+import logging
+from typing import Optional
+
+import httpx
+
+from .config import Settings
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class SharedHttpClient:
+    """Owns one long-lived, connection-pooled ``httpx.AsyncClient``.
+
+    The client is created lazily on first use so it binds to the event loop that
+    actually serves requests, and is released with ``aclose()`` on shutdown.
+    Calling ``client`` again after ``aclose()`` opens a fresh pool.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self._timeout = timeout
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and not HTTP2_AVAILABLE:
+            logger.info("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+        self._http2 = http2 and HTTP2_AVAILABLE
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "SharedHttpClient":
+        return cls(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+            http2=settings.http2_enabled,
+        )
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None and not self._client.is_closed
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if not self.is_open:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=self._limits,
+                http2=self._http2,
+                transport=self._transport,
+            )
+        return self._client  # type: ignore[return-value]
+
+    async def aclose(self) -> None:
+        """Close pooled connections. Safe to call more than once."""
+        client, self._client = self._client, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .localization import (
+    NO_KEYWORDS,
+    NO_LABEL,
+    SKIP_KEYWORDS,
+    SKIP_LABEL,
+    YES_KEYWORDS,
+    YES_LABEL,
+    Language,
+    normalize_answer,
+)
+
+logger = logging.getLogger(__name__)
+
+# How an intent's keywords are compared with a message
+MODE_CONTAINS = "contains"  # keyword occurs anywhere in the normalized text
+MODE_COMMAND = "command"  # whole message, spaces removed, equals the keyword
+MODE_ANSWER = "answer"  # whole message, answer-normalized, equals the keyword
+
+# Whole-message matches outrank any number of partial keyword hits
+_EXACT_SCORE = 100
+
+_NON_INTENT_CHARS = re.compile(r"[^a-zA-Z0-9\u0600-\u06FF\s]")
+
+
+@lru_cache(maxsize=4096)
+def normalize_intent_text(text: str) -> str:
+    """Lowercase and replace everything but Latin/Persian letters, digits and spaces."""
+    return _NON_INTENT_CHARS.sub(" ", text).lower()
+
+
+def collapse_intent_text(text: str) -> str:
+    return normalize_intent_text(text).replace(" ", "")
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher: one pass over the text finds every pattern."""
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Any]] = [[]]
+        for pattern, value in patterns:
+            if pattern:
+                self._add(pattern, value)
+        self._link()
+
+    def _add(self, pattern: str, value: Any) -> None:
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(value)
+
+    def _link(self) -> None:
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Any]:
+        """Yield the value of every pattern occurrence in ``text``."""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                yield from output[node]
+
+
+@dataclass(frozen=True, slots=True)
+class IntentSpec:
+    name: str
+    mode: str
+    keywords: Mapping[Language, Tuple[str, ...]]
+    # Intents in one group compete, e.g. menu topics
+    group: Optional[str] = None
+    # Button labels that always trigger the intent, even when remote keywords replace ``keywords``
+    labels: Mapping[Language, Tuple[str, ...]] = field(default_factory=dict)
+
+    def patterns(self, language: Language) -> Tuple[str, ...]:
+        return tuple(self.keywords.get(language, ())) + tuple(self.labels.get(language, ()))
+
+
+@dataclass(frozen=True, slots=True)
+class IntentMatch:
+    intent: str
+    score: int
+    group: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class IntentResult:
+    """Every intent found in one message, best first."""
+
+    normalized: str
+    matches: Tuple[IntentMatch, ...]
+
+    def has(self, intent: str) -> bool:
+        return any(match.intent == intent for match in self.matches)
+
+    def best(self, group: Optional[str] = None) -> Optional[str]:
+        for match in self.matches:
+            if group is None or match.group == group:
+                return match.intent
+        return None
+
+
+class IntentEngine:
+    """Matches a message against every intent's keywords at once.
+
+    Per language, ``contains`` keywords are compiled into one Aho-Corasick
+    automaton and ``command``/``answer`` keywords into dicts, so a message is
+    normalized once and scanned once. Results are ranked by score (distinct
+    keyword hits, or ``_EXACT_SCORE`` for whole-message matches), then by the
+    order the intents were declared. ``analyze`` is memoized until ``rebuild``.
+    """
+
+    def __init__(self, specs: Iterable[IntentSpec]) -> None:
+        self._base_specs = list(specs)
+        self.rebuild()
+
+    def rebuild(self, overrides: Optional[Mapping[str, Any]] = None) -> None:
+        """Recompile, replacing keywords of known intents with ``overrides``.
+
+        ``overrides`` maps an intent name to ``{"en": [...], "fa": [...]}``
+        (the ``intent_keywords`` remote setting). Unknown intents and languages
+        are ignored.
+        """
+        specs = []
+        for spec in self._base_specs:
+            custom = (overrides or {}).get(spec.name)
+            if isinstance(custom, Mapping):
+                keywords = dict(spec.keywords)
+                for language in Language:
+                    values = custom.get(language.value)
+                    if isinstance(values, (list, tuple)):
+                        keywords[language] = tuple(str(value) for value in values)
+                spec = IntentSpec(spec.name, spec.mode, keywords, spec.group, spec.labels)
+            specs.append(spec)
+        if overrides:
+            logger.info("Rebuilt intent matcher with remote keywords for: %s", ", ".join(sorted(overrides)))
+        self._specs = specs
+        self._order = {spec.name: index for index, spec in enumerate(specs)}
+        self._groups = {spec.name: spec.group for spec in specs}
+        self._automata: Dict[Language, AhoCorasick] = {}
+        self._exact: Dict[Tuple[str, Language], Dict[str, List[str]]] = {}
+        for language in Language:
+            patterns = []
+            for spec in specs:
+                for keyword in spec.patterns(language):
+                    if spec.mode == MODE_CONTAINS:
+                        patterns.append((normalize_intent_text(keyword), (spec.name, keyword)))
+                    else:
+                        form = collapse_intent_text(keyword) if spec.mode == MODE_COMMAND else normalize_answer(keyword)
+                        names = self._exact.setdefault((spec.mode, language), {}).setdefault(form, [])
+                        if spec.name not in names:
+                            names.append(spec.name)
+            self._automata[language] = AhoCorasick(patterns)
+        self._cached_analyze = lru_cache(maxsize=2048)(self._analyze)
+
+    def analyze(self, text: str, language: Language) -> IntentResult:
+        return self._cached_analyze(text, language)
+
+    def _analyze(self, text: str, language: Language) -> IntentResult:
+        normalized = normalize_intent_text(text)
+        hits: Dict[str, set] = {}
+        for name, keyword in self._automata[language].iter_matches(normalized):
+            hits.setdefault(name, set()).add(keyword)
+        scores = {name: len(keywords) for name, keywords in hits.items()}
+        for mode, form in (
+            (MODE_COMMAND, normalized.replace(" ", "")),
+            (MODE_ANSWER, normalize_answer(text)),
+        ):
+            for name in self._exact.get((mode, language), {}).get(form, ()):
+                scores[name] = _EXACT_SCORE
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self._order[item[0]]))
+        return IntentResult(
+            normalized=normalized,
+            matches=tuple(IntentMatch(name, score, self._groups[name]) for name, score in ranked),
+        )
+
+
+def _answer_spec(name: str, keywords: Mapping[Language, Iterable[str]], label: Mapping[Language, str]) -> IntentSpec:
+    return IntentSpec(
+        name,
+        MODE_ANSWER,
+        {language: tuple(keywords[language]) for language in Language},
+        labels={language: (label[language],) for language in Language},
+    )
+
+
+DEFAULT_INTENTS = (
+    IntentSpec(
+        "menu",
+        MODE_COMMAND,
+        {
+            Language.EN: ("menu", "mainmenu", "startover", "cancel", "stop", "quit", "restart"),
+            Language.FA: ("منو", "منویاصلی", "بازگشتبمنو", "بازگشتبهمنو", "لغو"),
+        },
+    ),
+    IntentSpec(
+        "back",
+        MODE_COMMAND,
+        {
+            Language.EN: ("back", "previous", "goback"),
+            Language.FA: ("بازگشت", "برگشت", "قبلی"),
+        },
+    ),
+    IntentSpec(
+        "repeat",
+        MODE_COMMAND,
+        {
+            Language.EN: ("repeat", "again", "what", "pardon", "huh"),
+            Language.FA: ("تکرار", "دوباره", "چی", "??"),
+        },
+    ),
+    _answer_spec("yes", YES_KEYWORDS, YES_LABEL),
+    _answer_spec("no", NO_KEYWORDS, NO_LABEL),
+    _answer_spec("skip", SKIP_KEYWORDS, SKIP_LABEL),
+    IntentSpec(
+        "question",
+        MODE_CONTAINS,
+        {
+            Language.EN: ("what", "why", "how", "help", "where", "who"),
+            Language.FA: ("چی", "چطور", "چرا", "کمک", "کجا", "کی"),
+        },
+    ),
+    IntentSpec(
+        "apply",
+        MODE_CONTAINS,
+        {
+            Language.EN: ("apply", "application", "job", "career", "role", "position", "hire"),
+            Language.FA: ("درخواست", "شغل", "کار", "استخدام", "فرصت"),
+        },
+        group="menu_topic",
+    ),
+    IntentSpec(
+        "about",
+        MODE_CONTAINS,
+        {
+            Language.EN: ("about", "studio", "company", "codexs"),
+            Language.FA: ("درباره", "استودیو", "codexs", "شرکت"),
+        },
+        group="menu_topic",
+    ),
+    IntentSpec(
+        "updates",
+        MODE_CONTAINS,
+        {
+            Language.EN: ("news", "update", "launch", "what's new", "latest"),
+            Language.FA: ("خبر", "آپدیت", "به‌روزرسانی", "لانچ", "جدید"),
+        },
+        group="menu_topic",
+    ),
+    IntentSpec(
+        "contact",
+        MODE_CONTAINS,
+        {
+            Language.EN: ("contact", "support", "help", "reach", "message"),
+            Language.FA: ("تماس", "پشتیبانی", "کمک", "پیام"),
+        },
+        group="menu_topic",
+    ),
+)
+
+intent_engine = IntentEngine(DEFAULT_INTENTS)
+
+
+def is_yes(text: str, language: Language) -> bool:
+    return intent_engine.analyze(text, language).has("yes")
+
+
+def is_no(text: str, language: Language) -> bool:
+    return intent_engine.analyze(text, language).has("no")
+
+
+def is_skip(text: str, language: Language) -> bool:
+    return intent_engine.analyze(text, language).has("skip")
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from telegram import KeyboardButton, ReplyKeyboardMarkup
+
+from .localization import (
+    BACK_TO_MENU,
+    CONTACT_EDIT_BUTTON,
+    CONTACT_SEND_BUTTON,
+    RESUME_NO,
+    RESUME_YES,
+    SHARE_CONTACT_BUTTON,
+    SHARE_LOCATION_BUTTON,
+    VIEW_ROLES_NO,
+    VIEW_ROLES_YES,
+    Language,
+    back_keyboard,
+    edit_keyboard,
+    language_keyboard,
+    yes_no_keyboard,
+)
+from .remote_config import default_menu_rows, remote_config
+
+Row = List[Union[str, KeyboardButton]]
+
+# Layouts by keyboard kind; "menu" depends on the remote config, the rest are static
+LAYOUTS: Dict[str, Callable[[Language], List[Row]]] = {
+    "menu": default_menu_rows,
+    "language": lambda language: language_keyboard(),
+    "back": back_keyboard,
+    "yes_no": yes_no_keyboard,
+    "edit": edit_keyboard,
+    "resume": lambda language: [[RESUME_YES[language], RESUME_NO[language]]],
+    "contact_review": lambda language: [[CONTACT_SEND_BUTTON[language], CONTACT_EDIT_BUTTON[language]]],
+    "view_roles": lambda language: [[VIEW_ROLES_YES[language], VIEW_ROLES_NO[language]]],
+    "share_contact": lambda language: [
+        [KeyboardButton(SHARE_CONTACT_BUTTON[language], request_contact=True)],
+        [BACK_TO_MENU[language]],
+    ],
+    "share_location": lambda language: [
+        [KeyboardButton(SHARE_LOCATION_BUTTON[language], request_location=True)],
+        [BACK_TO_MENU[language]],
+    ],
+}
+
+
+class KeyboardCache:
+    """Ready-made ``ReplyKeyboardMarkup`` objects keyed by (language, kind, config version).
+
+    PTB markup objects are frozen after construction, so one instance can be
+    shared by every reply. The cache is dropped as soon as ``remote_config``
+    reports a new version, which rebuilds each keyboard once per config change.
+    """
+
+    def __init__(self, layouts: Dict[str, Callable[[Language], List[Row]]], max_entries: int = 512) -> None:
+        self._layouts = layouts
+        self._max_entries = max_entries
+        self._version: Optional[str] = None
+        self._entries: Dict[Tuple, ReplyKeyboardMarkup] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Tuple, build: Callable[[], List[Row]], one_time: bool) -> ReplyKeyboardMarkup:
+        if remote_config.version != self._version:
+            self._entries.clear()
+            self._version = remote_config.version
+        markup = self._entries.get(key)
+        if markup is None:
+            if len(self._entries) >= self._max_entries:
+                self._entries.clear()
+            markup = self._entries[key] = ReplyKeyboardMarkup(
+                build(),
+                resize_keyboard=True,
+                one_time_keyboard=one_time,
+            )
+        return markup
+
+    def get(self, kind: str, language: Language, *, one_time: bool = False) -> ReplyKeyboardMarkup:
+        layout = self._layouts[kind]
+        return self._lookup((language, kind, one_time), lambda: layout(language), one_time)
+
+    def with_back(
+        self,
+        base_rows: Optional[Sequence[Sequence[str]]],
+        language: Language,
+        *,
+        one_time: bool = False,
+    ) -> ReplyKeyboardMarkup:
+        """``base_rows`` followed by a back-to-menu row."""
+        if not base_rows:
+            return self.get("back", language, one_time=one_time)
+        rows = tuple(tuple(row) for row in base_rows)
+        return self._lookup(
+            (language, "with_back", rows, one_time),
+            lambda: [list(row) for row in rows] + [[BACK_TO_MENU[language]]],
+            one_time,
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+keyboards = KeyboardCache(LAYOUTS)
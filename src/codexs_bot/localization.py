@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from enum import Enum
 from copy import deepcopy
+from functools import lru_cache
 import re
 from typing import Any, Dict, List, Optional
 
@@ -184,6 +185,11 @@ MENU_LABELS: Dict[str, Dict[Language, str]] = {
     },
 }
 
+# Label -> MENU_LABELS key, per language
+MENU_LABEL_INDEX: Dict[Language, Dict[str, str]] = {
+    language: {labels[language]: key for key, labels in MENU_LABELS.items()} for language in Language
+}
+
 MENU_TOPIC_TITLES = {
     "apply": {
         Language.EN: "applications and open roles",
@@ -252,6 +258,8 @@ class Question:
     keyboard: Optional[Dict[Language, List[List[str]]]] = None
     optional: bool = False
     input_type: str = "text"  # "text", "contact", "location"
+    # Named validator from validation.VALIDATORS; otherwise chosen by input_type
+    validator: Optional[str] = None
 
 
 _DEFAULT_HIRING_QUESTIONS: List[Question] = [
@@ -268,6 +276,7 @@ _DEFAULT_HIRING_QUESTIONS: List[Question] = [
     ),
     Question(
         key="email",
+        validator="email",
         prompts={
             Language.EN: "<b>What's your primary email address?</b>\n<i>We'll use this for all official Codexs communication</i>",
             Language.FA: "<b>آدرس ایمیل اصلی شما چیست؟</b>\n<i>برای تمام ارتباطات رسمی Codexs استفاده می‌شود</i>",
@@ -338,6 +347,7 @@ _DEFAULT_HIRING_QUESTIONS: List[Question] = [
     ),
     Question(
         key="portfolio",
+        validator="url",
         prompts={
             Language.EN: "<b>Show us your work</b>\n<i>Share a portfolio link, GitHub, Behance, or brief description of past projects</i>",
             Language.FA: "<b>کارهای خود را به ما نشان دهید</b>\n<i>لینک پورتفولیو، GitHub، Behance یا توضیح مختصری از پروژه‌های گذشته بدهید</i>",
@@ -754,6 +764,7 @@ def apply_remote_questions(remote_questions: List[Dict[str, Any]]) -> None:
                 keyboard=template.keyboard,
                 optional=template.optional if optional_override is None else optional_override,
                 input_type=template.input_type,
+                validator=entry.get("validator") or template.validator,
             )
         else:
             fallback_label = key.replace("_", " ").title()
@@ -770,6 +781,7 @@ def apply_remote_questions(remote_questions: List[Dict[str, Any]]) -> None:
                     Language.FA: fallback_label,
                 },
                 optional=optional_override if optional_override is not None else False,
+                validator=entry.get("validator"),
             )
 
         new_questions.append(question)
@@ -1062,6 +1074,7 @@ ADMIN_MENU = {
         "/debug &lt;user_id&gt; – Debug user session\n"
         "/sessions – List active sessions\n"
         "/cleanup – Clean up old session files\n"
+        "/outbox – Pending Supabase/webhook deliveries\n"
         "/testgroup – Test group notification\n\n"
         "All commands require admin privileges."
     ),
@@ -1074,6 +1087,7 @@ ADMIN_MENU = {
         "/debug &lt;user_id&gt; – اشکال‌زدایی جلسه کاربر\n"
         "/sessions – لیست جلسات فعال\n"
         "/cleanup – پاکسازی فایل‌های جلسه قدیمی\n"
+        "/outbox – ارسال‌های در انتظار Supabase/وب‌هوک\n"
         "/testgroup – تست اعلان گروه\n\n"
         "همه دستورات نیاز به دسترسی ادمین دارند."
     ),
@@ -1328,55 +1342,28 @@ def is_back_button(text: str, language: Language) -> bool:
     return text.strip() == BACK_TO_MENU[language]
 
 
-_YES_KEYWORDS = {
+YES_KEYWORDS = {
     Language.EN: {"yes", "y", "yeah", "yep", "sure", "ok", "okay", "affirmative", "confirm"},
     Language.FA: {"بله", "بلی", "اره", "آره", "اوکی", "باشه", "حتما", "حتماً"},
 }
 
-_NO_KEYWORDS = {
+NO_KEYWORDS = {
     Language.EN: {"no", "n", "nope", "nah"},
     Language.FA: {"خیر", "نه", "نخیر"},
 }
 
-_SKIP_KEYWORDS = {
+SKIP_KEYWORDS = {
     Language.EN: {"skip", "pass", "later", "notnow"},
     Language.FA: {"رد", "ردکردن", "بعدا", "بعداً", "فعلاخیر", "بیخیال"},
 }
 
-_QUESTION_KEYWORDS = {
-    Language.EN: {"what", "why", "how", "help", "explain", "where", "who"},
-    Language.FA: {"چی", "چطور", "چرا", "کمک", "کجا", "کی"},
-}
-
-
-def _normalize_answer(text: str) -> str:
-    lowered = text.strip().lower()
-    cleaned = re.sub(r"[^\w\u0600-\u06FF]+", "", lowered)
-    return cleaned
-
-
-def is_yes(text: str, language: Language) -> bool:
-    stripped = text.strip()
-    if stripped == YES_LABEL[language]:
-        return True
-    normalized = _normalize_answer(stripped)
-    return normalized in _YES_KEYWORDS[language]
-
 
-def is_no(text: str, language: Language) -> bool:
-    stripped = text.strip()
-    if stripped == NO_LABEL[language]:
-        return True
-    normalized = _normalize_answer(stripped)
-    return normalized in _NO_KEYWORDS[language]
+_NON_ANSWER_CHARS = re.compile(r"[^\w\u0600-\u06FF]+")
 
 
-def is_skip(text: str, language: Language) -> bool:
-    stripped = text.strip()
-    if stripped.lower() == SKIP_LABEL[language].lower():
-        return True
-    normalized = _normalize_answer(stripped)
-    return normalized in _SKIP_KEYWORDS[language]
+@lru_cache(maxsize=4096)
+def normalize_answer(text: str) -> str:
+    return _NON_ANSWER_CHARS.sub("", text.strip().lower())
 
 
 PERSIAN_DIGITS = {
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_BLOCK = "block"
+
+
+@dataclass(slots=True)
+class LogShipperStats:
+    queued: int = 0
+    sent: int = 0
+    dropped: int = 0
+    failed: int = 0
+
+
+class LogShipper:
+    """Buffers conversation-log events in a bounded queue and ships them in batches.
+
+    A single background task flushes whenever ``batch_size`` events are waiting
+    or ``flush_interval`` seconds have passed. When the queue is full the oldest
+    event is dropped (``drop_oldest``) or the producer waits for room (``block``).
+    ``send_batch`` may return one flag per event when only some were accepted;
+    ``None`` means the whole batch was.
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[List[Dict[str, Any]]], Awaitable[Optional[List[bool]]]],
+        *,
+        max_queue: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 2.0,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+    ) -> None:
+        if overflow not in {OVERFLOW_DROP_OLDEST, OVERFLOW_BLOCK}:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self._send_batch = send_batch
+        self._max_queue = max(1, max_queue)
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._overflow = overflow
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._task: Optional[asyncio.Task] = None
+        # Created lazily so they bind to the loop that actually runs the flusher
+        self._wakeup: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Event] = None
+        self._closing = False
+        self.stats = LogShipperStats()
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _ensure_started(self) -> None:
+        if self.running:
+            return
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def put(self, event: Dict[str, Any]) -> None:
+        """Queue an event, applying the configured overflow policy."""
+        self._ensure_started()
+        if self._overflow == OVERFLOW_BLOCK:
+            while len(self._buffer) >= self._max_queue and self.running:
+                self._space.clear()
+                self._wakeup.set()
+                await self._space.wait()
+        self._append(event)
+
+    def put_nowait(self, event: Dict[str, Any]) -> None:
+        """Queue an event without waiting; always drops the oldest event on overflow."""
+        self._ensure_started()
+        self._append(event)
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        if len(self._buffer) >= self._max_queue:
+            self._buffer.popleft()
+            self.stats.dropped += 1
+        self._buffer.append(event)
+        self.stats.queued += 1
+        if len(self._buffer) >= self._batch_size:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Ship everything currently buffered, one batch at a time."""
+        while self._buffer:
+            count = min(self._batch_size, len(self._buffer))
+            batch = [self._buffer.popleft() for _ in range(count)]
+            if self._space:
+                self._space.set()
+            try:
+                results = await self._send_batch(batch)
+                sent = len(batch) if results is None else sum(1 for ok in results if ok)
+                self.stats.sent += sent
+                self.stats.failed += len(batch) - sent
+            except Exception as exc:  # pylint: disable=broad-except
+                self.stats.failed += len(batch)
+                logger.debug("Failed to ship %d chat log events: %s", len(batch), exc)
+
+    async def stop(self) -> None:
+        """Stop the flusher and ship whatever is still buffered."""
+        task, self._task = self._task, None
+        self._closing = True
+        if task and not task.done():
+            self._wakeup.set()
+            try:
+                await task
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.debug("Chat log flusher exited with error: %s", exc)
+        await self.flush()
+        if self._space:
+            self._space.set()
@@ -1,28 +1,141 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-import httpx
+from .circuit import CircuitBreaker
+from .http_pool import SharedHttpClient
+from .outbox import PermanentDeliveryError, is_permanent_rejection
+
+logger = logging.getLogger(__name__)
 
 
 class WebhookNotifier:
-    """Sends application/contact payloads to an external HTTP endpoint."""
+    """Sends application/contact payloads to an external HTTP endpoint.
+
+    Requests go through the shared connection pool and a circuit breaker, so a
+    dead endpoint costs one fast ``False`` instead of a timeout per payload.
+    With ``batch_size`` > 1 payloads are buffered and posted as a JSON array
+    once ``batch_size`` are waiting or ``batch_interval`` seconds have passed;
+    every caller gets the outcome of the batch its payload went out in. When a
+    batch is rejected outright, its payloads are re-posted one by one so a
+    single bad payload only fails its own caller.
+    """
 
-    def __init__(self, url: Optional[str], token: Optional[str], label: str) -> None:
+    def __init__(
+        self,
+        url: Optional[str],
+        token: Optional[str],
+        label: str,
+        *,
+        http: Optional[SharedHttpClient] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        timeout: float = 10.0,
+        batch_size: int = 0,
+        batch_interval: float = 1.0,
+    ) -> None:
         self._url = url
         self._token = token
         self._label = label
+        self._http = http or SharedHttpClient()
+        self.breaker = breaker or CircuitBreaker(f"{label} webhook")
+        self._timeout = timeout
+        self._batch_size = batch_size if batch_size > 1 else 0
+        self._batch_interval = batch_interval
+        self._batch: List[Tuple[Dict[str, Any], Optional[str], asyncio.Future]] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._sending: Set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._url)
+
+    async def post(
+        self,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        *,
+        raise_on_reject: bool = False,
+    ) -> bool:
+        """Returns True once the endpoint accepted the payload (or none is configured).
 
-    async def post(self, payload: Dict[str, Any]) -> None:
+        With ``raise_on_reject`` a 4xx that retrying cannot fix raises
+        ``PermanentDeliveryError`` instead of returning False.
+        """
         if not self._url:
-            return
+            return True
+        if not self._batch_size:
+            status = await self._send(payload, [idempotency_key] if idempotency_key else [])
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._batch.append((payload, idempotency_key, future))
+            if len(self._batch) >= self._batch_size:
+                self._flush()
+            elif self._flush_timer is None:
+                self._flush_timer = asyncio.get_running_loop().call_later(self._batch_interval, self._flush)
+            status = await future
+        if status is None:
+            return False
+        if raise_on_reject and is_permanent_rejection(status):
+            raise PermanentDeliveryError(f"{self._label} webhook rejected payload: HTTP {status}")
+        return 200 <= status < 300
+
+    def _flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._batch = self._batch, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._send_batch(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send_batch(self, batch: List[Tuple[Dict[str, Any], Optional[str], asyncio.Future]]) -> None:
+        status: Optional[int] = None
+        try:
+            keys = [key or "" for _, key, _ in batch]
+            status = await self._send([payload for payload, _, _ in batch], keys if any(keys) else [])
+            if status is not None and is_permanent_rejection(status) and len(batch) > 1:
+                statuses = await asyncio.gather(
+                    *(self._send(payload, [key] if key else []) for payload, key, _ in batch)
+                )
+                for (_, _, future), item_status in zip(batch, statuses):
+                    if not future.done():
+                        future.set_result(item_status)
+        finally:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(status)
+
+    async def _send(self, body: Any, idempotency_keys: List[str]) -> Optional[int]:
+        """HTTP status of the post; None if it was not sent or got no response."""
+        if not self.breaker.allow():
+            logger.debug("%s webhook circuit is open; not posting", self._label)
+            return None
         headers = {"Content-Type": "application/json"}
         if self._token:
             headers["Authorization"] = f"Bearer {self._token}"
+        if idempotency_keys:
+            # Batches carry one key per payload, in body order
+            headers["Idempotency-Key"] = ",".join(idempotency_keys)
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                await client.post(self._url, json=payload, headers=headers)
+            response = await self._http.client.post(self._url, json=body, headers=headers, timeout=self._timeout)
         except Exception as exc:  # pylint: disable=broad-except
-            logging.warning("Failed to send %s webhook: %s", self._label, exc)
+            self.breaker.record_failure()
+            logger.warning("Failed to send %s webhook: %s", self._label, exc)
+            return None
+        # 4xx means this payload was rejected, not that the endpoint is down
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        if not response.is_success:
+            logger.warning("%s webhook rejected payload: HTTP %s", self._label, response.status_code)
+        return response.status_code
 
+    async def aclose(self) -> None:
+        """Post anything still buffered and wait for batches in flight (called on shutdown)."""
+        self._flush()
+        if self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
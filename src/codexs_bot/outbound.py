@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from telegram import Bot
+
+from .http_pool import SharedHttpClient
+from .send_scheduler import PRIORITY_BROADCAST
+
+logger = logging.getLogger(__name__)
+
+# Ack endpoint responses that mean "batch acks are not understood here"
+_BATCH_ACK_UNSUPPORTED = {400, 404, 405, 422}
+
+
+@dataclass(slots=True)
+class OutboundStats:
+    fetched: int = 0
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0
+    acked: int = 0
+    ack_failures: int = 0
+
+
+class AdaptivePollSchedule:
+    """Delay before the next outbound poll.
+
+    Drops to ``min_interval`` as soon as a poll finds messages and grows by
+    ``backoff`` after every empty poll, up to ``max_interval``.
+    """
+
+    def __init__(self, min_interval: float = 2.0, max_interval: float = 60.0, backoff: float = 2.0) -> None:
+        self.min_interval = max(0.0, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.backoff = max(1.0, backoff)
+        self.current = self.min_interval
+
+    def record(self, found: bool) -> float:
+        if found:
+            self.current = self.min_interval
+        else:
+            self.current = min(self.max_interval, max(self.current, 0.5) * self.backoff)
+        return self.current
+
+
+class OutboundDelivery:
+    """Delivers messages queued in the ``bot-outbound`` Edge Function.
+
+    Each ``run_once`` fetches pending messages page by page, prefetching the
+    next page while the current one is sent. Messages to the same chat are sent
+    in queue order; up to ``concurrency`` chats are served at once and the
+    bot's ``SendScheduler`` keeps them under Telegram's limits.
+    Every outcome is acknowledged in one batched POST at the end of the cycle.
+    Acks that could not be posted are retried next cycle and their messages
+    are not sent again in the meantime.
+
+    With ``long_poll`` > 0 the first fetch asks the endpoint to hold the
+    request open for up to that many seconds until a message is queued
+    (``?wait=``). While the server honours it ``next_delay`` is 0, so the
+    caller re-polls at once; otherwise ``schedule`` backs off as usual.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        http: SharedHttpClient,
+        endpoint: str,
+        headers: Dict[str, str],
+        *,
+        concurrency: int = 8,
+        page_size: int = 100,
+        max_pages: int = 10,
+        priority: int = PRIORITY_BROADCAST,
+        long_poll: float = 0.0,
+        schedule: Optional[AdaptivePollSchedule] = None,
+    ) -> None:
+        self._bot = bot
+        self._http = http
+        self._endpoint = endpoint
+        self._ack_endpoint = f"{endpoint}/ack"
+        self._headers = headers
+        self._concurrency = max(1, concurrency)
+        self._page_size = page_size
+        self._max_pages = max(1, max_pages)
+        self._priority = priority
+        self._unacked: Dict[Any, str] = {}
+        self._batch_acks = True
+        self._long_poll = max(0.0, long_poll)
+        self.schedule = schedule or AdaptivePollSchedule()
+        self.next_delay = self.schedule.current
+        self.stats = OutboundStats()
+
+    @property
+    def unacked(self) -> int:
+        return len(self._unacked)
+
+    async def _fetch_page(self, cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        params: Dict[str, Any] = {"limit": self._page_size}
+        timeout: Any = httpx.USE_CLIENT_DEFAULT
+        if cursor:
+            params["cursor"] = cursor
+        elif self._long_poll:
+            params["wait"] = self._long_poll
+            timeout = self._long_poll + 10.0
+        try:
+            response = await self._http.client.get(
+                self._endpoint, headers=self._headers, params=params, timeout=timeout
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error("Error polling outbound messages: %s", exc)
+            return [], None
+        if response.status_code != 200:
+            logger.error("Failed to fetch outbound messages: HTTP %s", response.status_code)
+            return [], None
+        payload = response.json()
+        return payload.get("messages", []) or [], payload.get("next_cursor")
+
+    async def _deliver(self, message: Dict[str, Any], semaphore: asyncio.Semaphore) -> str:
+        msg_id = message["id"]
+        telegram_user_id = message["telegram_user_id"]
+        async with semaphore:
+            try:
+                await self._bot.send_message(
+                    chat_id=int(telegram_user_id),
+                    text=message["message_text"],
+                    rate_limit_args=self._priority,
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error("❌ Failed to send outbound message %s: %s", msg_id, exc)
+                return "failed"
+        logger.info("✅ Sent outbound message %s to user %s", msg_id, telegram_user_id)
+        return "sent"
+
+    async def _deliver_page(
+        self,
+        messages: List[Dict[str, Any]],
+        acks: Dict[Any, str],
+        semaphore: asyncio.Semaphore,
+        cycle: OutboundStats,
+    ) -> None:
+        by_chat: Dict[str, List[Dict[str, Any]]] = {}
+        for message in messages:
+            msg_id = message.get("id")
+            if not msg_id or not message.get("telegram_user_id") or not message.get("message_text"):
+                logger.warning("Skipping outbound message with missing fields: %s", message)
+                continue
+            # Already handled this cycle (overlapping pages) or awaiting a retried ack
+            if msg_id in acks or msg_id in self._unacked:
+                cycle.skipped += 1
+                continue
+            acks[msg_id] = "pending"
+            by_chat.setdefault(str(message["telegram_user_id"]), []).append(message)
+
+        async def deliver_chat(chat_messages: List[Dict[str, Any]]) -> None:
+            # One chat's messages go out in queue order; different chats run concurrently
+            for message in chat_messages:
+                status = await self._deliver(message, semaphore)
+                acks[message["id"]] = status
+                if status == "sent":
+                    cycle.sent += 1
+                else:
+                    cycle.failed += 1
+
+        await asyncio.gather(*(deliver_chat(chat_messages) for chat_messages in by_chat.values()))
+
+    async def _post_acks(self, acks: Dict[Any, str]) -> bool:
+        client = self._http.client
+        if self._batch_acks:
+            response = await client.post(
+                self._ack_endpoint,
+                headers=self._headers,
+                json={"acks": [{"message_id": msg_id, "status": status} for msg_id, status in acks.items()]},
+            )
+            if response.status_code not in _BATCH_ACK_UNSUPPORTED:
+                return response.status_code < 300
+            logger.warning("Outbound ack endpoint rejected a batch (HTTP %s); acking one by one", response.status_code)
+            self._batch_acks = False
+        responses = await asyncio.gather(
+            *(
+                client.post(self._ack_endpoint, headers=self._headers, json={"message_id": msg_id, "status": status})
+                for msg_id, status in acks.items()
+            )
+        )
+        return all(response.status_code < 300 for response in responses)
+
+    async def _acknowledge(self, acks: Dict[Any, str], cycle: OutboundStats) -> None:
+        # Sends interrupted by cancellation stay unacked and are fetched again
+        acks = {**self._unacked, **{msg_id: status for msg_id, status in acks.items() if status != "pending"}}
+        if not acks:
+            return
+        try:
+            ok = await self._post_acks(acks)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error("Failed to acknowledge %d outbound messages: %s", len(acks), exc)
+            ok = False
+        if ok:
+            self._unacked.clear()
+            cycle.acked += len(acks)
+        else:
+            self._unacked = acks
+            cycle.ack_failures += len(acks)
+
+    async def run_once(self) -> OutboundStats:
+        """Run one poll cycle and return its counters (also added to ``stats``)."""
+        cycle = OutboundStats()
+        acks: Dict[Any, str] = {}
+        semaphore = asyncio.Semaphore(self._concurrency)
+        next_page: Optional[asyncio.Task] = asyncio.create_task(self._fetch_page(None))
+        pages = 0
+        started = time.monotonic()
+        held = False
+        try:
+            while next_page is not None:
+                messages, cursor = await next_page
+                next_page = None
+                pages += 1
+                if pages == 1 and self._long_poll:
+                    # An empty reply that came back early means the endpoint does not hold requests
+                    held = time.monotonic() - started >= self._long_poll / 2
+                if cursor and pages < self._max_pages:
+                    next_page = asyncio.create_task(self._fetch_page(cursor))
+                if messages:
+                    cycle.fetched += len(messages)
+                    logger.info("📤 Found %d pending outbound messages", len(messages))
+                    await self._deliver_page(messages, acks, semaphore, cycle)
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+            await self._acknowledge(acks, cycle)
+        if cycle.fetched:
+            self.next_delay = self.schedule.record(True)
+        elif held:
+            self.next_delay = 0.0
+        else:
+            self.next_delay = self.schedule.record(False)
+        for counter in fields(OutboundStats):
+            setattr(self.stats, counter.name, getattr(self.stats, counter.name) + getattr(cycle, counter.name))
+        return cycle
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Set
+
+from .sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+# (payload, idempotency key) -> delivered? Raise PermanentDeliveryError for rejections
+Handler = Callable[[Dict[str, Any], str], Awaitable[bool]]
+
+# Client errors that may succeed later: timeout, too early, rate limited
+_RETRYABLE_CLIENT_ERRORS = {408, 425, 429}
+
+
+class PermanentDeliveryError(Exception):
+    """The receiver rejected the payload; retrying it would fail the same way."""
+
+
+def is_permanent_rejection(status_code: int) -> bool:
+    return 400 <= status_code < 500 and status_code not in _RETRYABLE_CLIENT_ERRORS
+
+
+_OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    delivered_at REAL,
+    dead_at REAL,
+    last_error TEXT
+);
+"""
+
+# Pending = neither delivered nor dead-lettered
+_PENDING = "delivered_at IS NULL AND dead_at IS NULL"
+
+
+@dataclass(slots=True)
+class OutboxEntry:
+    key: str
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    created_at: float
+    next_attempt_at: float
+    last_error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class OutboxSummary:
+    depth: int = 0
+    oldest_created_at: Optional[float] = None
+    next_attempt_at: Optional[float] = None
+    max_attempts: int = 0
+    by_kind: Dict[str, int] = field(default_factory=dict)
+    dead: int = 0
+    # Error of the oldest pending entry
+    last_error: Optional[str] = None
+
+
+class Outbox:
+    """Pending deliveries in SQLite, one row per idempotency key.
+
+    Delivered rows are kept (``delivered_at`` set) until pruned, so adding the
+    same key again is a no-op instead of a duplicate delivery. Rows that were
+    rejected or ran out of attempts are dead letters (``dead_at`` set): kept for
+    inspection, never retried.
+    """
+
+    def __init__(self, db_path: Path, clock: Callable[[], float] = time.time) -> None:
+        self._db_path = db_path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = connect(db_path)
+        self._conn.executescript(_OUTBOX_SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(outbox)")}
+        if "dead_at" not in columns:
+            # Outbox files created before dead letters existed
+            self._conn.execute("ALTER TABLE outbox ADD COLUMN dead_at REAL")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (delivered_at, dead_at, next_attempt_at)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def add(self, key: str, kind: str, payload: Dict[str, Any], lease: float = 0.0) -> bool:
+        """Queue a delivery; False if ``key`` is already queued or delivered.
+
+        The first attempt becomes due after ``lease`` seconds, which leaves the
+        caller that time to attempt it directly.
+        """
+        now = self._clock()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO outbox (key, kind, payload, created_at, next_attempt_at) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, json.dumps(payload, ensure_ascii=False), now, now + lease),
+            )
+        return cursor.rowcount == 1
+
+    @staticmethod
+    def _entry(row: Any) -> OutboxEntry:
+        return OutboxEntry(
+            key=row["key"],
+            kind=row["kind"],
+            payload=json.loads(row["payload"]),
+            attempts=row["attempts"],
+            created_at=row["created_at"],
+            next_attempt_at=row["next_attempt_at"],
+            last_error=row["last_error"],
+        )
+
+    def get(self, key: str) -> Optional[OutboxEntry]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM outbox WHERE key = ?", (key,)).fetchone()
+        return self._entry(row) if row else None
+
+    def due(self, limit: int = 50) -> List[OutboxEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM outbox WHERE {_PENDING} AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (self._clock(), limit),
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def complete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET delivered_at = ?, attempts = attempts + 1, last_error = NULL WHERE key = ?",
+                (self._clock(), key),
+            )
+
+    def defer(self, key: str, delay: float, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, next_attempt_at = ?, last_error = ? WHERE key = ?",
+                (self._clock() + delay, error, key),
+            )
+
+    def kill(self, key: str, error: Optional[str]) -> None:
+        """Move an entry to the dead letters."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, dead_at = ?, last_error = ? WHERE key = ?",
+                (self._clock(), error, key),
+            )
+
+    def dead_letters(self, limit: int = 5) -> List[OutboxEntry]:
+        """Most recent dead letters first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM outbox WHERE dead_at IS NOT NULL ORDER BY dead_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def prune(self, older_than: float) -> int:
+        """Forget deliveries completed, or dead-lettered, more than ``older_than`` seconds ago."""
+        cutoff = self._clock() - older_than
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM outbox WHERE delivered_at < ? OR dead_at < ?",
+                (cutoff, cutoff),
+            )
+        return cursor.rowcount
+
+    def summary(self) -> OutboxSummary:
+        with self._lock:
+            totals = self._conn.execute(
+                f"SELECT COUNT(*), MIN(created_at), MIN(next_attempt_at), MAX(attempts) FROM outbox WHERE {_PENDING}"
+            ).fetchone()
+            kinds = self._conn.execute(f"SELECT kind, COUNT(*) FROM outbox WHERE {_PENDING} GROUP BY kind").fetchall()
+            oldest = self._conn.execute(
+                f"SELECT last_error FROM outbox WHERE {_PENDING} ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            dead = self._conn.execute("SELECT COUNT(*) FROM outbox WHERE dead_at IS NOT NULL").fetchone()
+        return OutboxSummary(
+            depth=totals[0],
+            oldest_created_at=totals[1],
+            next_attempt_at=totals[2],
+            max_attempts=totals[3] or 0,
+            by_kind={kind: count for kind, count in kinds},
+            dead=dead[0],
+            last_error=oldest[0] if oldest else None,
+        )
+
+
+@dataclass(slots=True)
+class OutboxStats:
+    delivered: int = 0
+    deferred: int = 0
+    duplicates: int = 0
+    dead: int = 0
+
+
+class OutboxWorker:
+    """Delivers outbox entries through per-kind handlers, retrying until they succeed.
+
+    ``submit`` stores an entry and attempts it right away; ``run_once`` retries
+    whatever is due. A failed attempt is deferred with exponential backoff
+    (``base_delay`` doubling up to ``max_delay``) scaled by a random factor in
+    [0.5, 1) so a recovering endpoint is not hit by every retry at once.
+    Pending entries survive restarts and are picked up by the next ``run_once``.
+    An entry becomes a dead letter when its handler raises
+    ``PermanentDeliveryError`` or after ``max_attempts`` failed attempts.
+    """
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        handlers: Mapping[str, Handler],
+        *,
+        base_delay: float = 30.0,
+        max_delay: float = 3600.0,
+        poll_interval: float = 60.0,
+        batch_size: int = 50,
+        max_attempts: int = 20,
+        retention: float = 7 * 24 * 3600.0,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.outbox = outbox
+        self._handlers = dict(handlers)
+        self._base_delay = max(0.0, base_delay)
+        self._max_delay = max(self._base_delay, max_delay)
+        self._poll_interval = max(1.0, poll_interval)
+        self._batch_size = max(1, batch_size)
+        self._max_attempts = max(1, max_attempts)
+        self._retention = retention
+        self._rng = rng
+        self._in_flight: Set[str] = set()
+        self.next_delay = self._poll_interval
+        self.stats = OutboxStats()
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before retry number ``attempts`` (1 = first retry)."""
+        delay = min(self._max_delay, self._base_delay * 2 ** max(0, attempts - 1))
+        return delay * (0.5 + self._rng() / 2)
+
+    async def submit(self, key: str, kind: str, payload: Dict[str, Any]) -> bool:
+        """Queue ``payload`` under ``key`` and try to deliver it now."""
+        # Until the direct attempt finishes, run_once leaves the entry alone
+        added = await asyncio.to_thread(self.outbox.add, key, kind, payload, self._base_delay)
+        if not added:
+            self.stats.duplicates += 1
+            logger.info("Outbox entry %s already exists; not delivering it again", key)
+            return False
+        entry = OutboxEntry(key, kind, payload, attempts=0, created_at=time.time(), next_attempt_at=0.0)
+        return await self._attempt(entry)
+
+    async def _attempt(self, entry: OutboxEntry) -> bool:
+        if entry.key in self._in_flight:
+            return False
+        self._in_flight.add(entry.key)
+        try:
+            handler = self._handlers.get(entry.kind)
+            error: Optional[str] = None
+            permanent = False
+            try:
+                if handler is None:
+                    raise PermanentDeliveryError(f"no handler for {entry.kind!r}")
+                delivered = await handler(entry.payload, entry.key)
+                if not delivered:
+                    error = "handler reported failure"
+            except PermanentDeliveryError as exc:
+                delivered = False
+                permanent = True
+                error = str(exc) or type(exc).__name__
+            except Exception as exc:  # pylint: disable=broad-except
+                delivered = False
+                error = str(exc) or type(exc).__name__
+            if delivered:
+                await asyncio.to_thread(self.outbox.complete, entry.key)
+                self.stats.delivered += 1
+                return True
+            if permanent or entry.attempts + 1 >= self._max_attempts:
+                await asyncio.to_thread(self.outbox.kill, entry.key, error)
+                self.stats.dead += 1
+                logger.error(
+                    "Outbox delivery %s dead-lettered after %d attempts: %s",
+                    entry.key,
+                    entry.attempts + 1,
+                    error,
+                )
+                return False
+            delay = self.backoff(entry.attempts + 1)
+            await asyncio.to_thread(self.outbox.defer, entry.key, delay, error)
+            self.stats.deferred += 1
+            logger.warning(
+                "Outbox delivery %s failed (attempt %d): %s; retrying in %.0fs",
+                entry.key,
+                entry.attempts + 1,
+                error,
+                delay,
+            )
+            return False
+        finally:
+            self._in_flight.discard(entry.key)
+
+    async def run_once(self) -> int:
+        """Retry every due entry; returns how many were delivered."""
+        entries = await asyncio.to_thread(self.outbox.due, self._batch_size)
+        results = await asyncio.gather(*(self._attempt(entry) for entry in entries))
+        delivered = sum(1 for result in results if result)
+        if entries:
+            logger.info("Outbox retried %d entries, %d delivered", len(entries), delivered)
+        await asyncio.to_thread(self.outbox.prune, self._retention)
+        summary = await asyncio.to_thread(self.outbox.summary)
+        if len(entries) == self._batch_size:
+            self.next_delay = 1.0
+        elif summary.next_attempt_at is not None:
+            wait = summary.next_attempt_at - time.time()
+            self.next_delay = min(self._poll_interval, max(1.0, wait))
+        else:
+            self.next_delay = self._poll_interval
+        return delivered
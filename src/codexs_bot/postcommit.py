@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+Stage = Callable[[], Awaitable[Any]]
+
+
+@dataclass(slots=True)
+class StageStats:
+    runs: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    total_seconds: float = 0.0
+    last_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.total_seconds / self.runs if self.runs else 0.0
+
+    def record(self, seconds: float) -> None:
+        self.runs += 1
+        self.total_seconds += seconds
+        self.last_seconds = seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+
+class PostCommitPipeline:
+    """Runs the side effects of a durably saved record in the background.
+
+    ``submit`` starts one tracked task per record; its stages run concurrently
+    and a failing or slow stage never affects the others. Stage durations are
+    kept per stage name in ``stats``. ``drain`` waits for jobs still in flight,
+    so they finish before the bot's HTTP clients are closed.
+    """
+
+    def __init__(self, *, stage_timeout: Optional[float] = None) -> None:
+        self._stage_timeout = stage_timeout if stage_timeout and stage_timeout > 0 else None
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats: Dict[str, StageStats] = {}
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    def submit(self, job_id: str, stages: Mapping[str, Stage]) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._run(job_id, dict(stages)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, job_id: str, stages: Dict[str, Stage]) -> Dict[str, float]:
+        started = time.monotonic()
+        durations = await asyncio.gather(*(self._run_stage(job_id, name, stage) for name, stage in stages.items()))
+        timings = dict(zip(stages, durations))
+        logger.info(
+            "Post-commit %s finished in %.2fs (%s)",
+            job_id,
+            time.monotonic() - started,
+            ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()),
+        )
+        return timings
+
+    async def _run_stage(self, job_id: str, name: str, stage: Stage) -> float:
+        stats = self.stats.setdefault(name, StageStats())
+        started = time.monotonic()
+        try:
+            if self._stage_timeout:
+                await asyncio.wait_for(stage(), self._stage_timeout)
+            else:
+                await stage()
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.error("Post-commit stage %s for %s timed out after %.0fs", name, job_id, self._stage_timeout)
+        except Exception as exc:  # pylint: disable=broad-except
+            stats.failures += 1
+            logger.error("Post-commit stage %s for %s failed: %s", name, job_id, exc, exc_info=True)
+        seconds = time.monotonic() - started
+        stats.record(seconds)
+        return seconds
+
+    async def drain(self, timeout: float = 30.0) -> int:
+        """Wait up to ``timeout`` seconds for running jobs; cancel and return the rest."""
+        if not self._tasks:
+            return 0
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning("Cancelled %d post-commit jobs still running at shutdown", len(pending))
+        return len(pending)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitPolicy:
+    """Bucket size and refill rate for one kind of request."""
+
+    capacity: float
+    refill_per_second: float
+
+    @classmethod
+    def per_window(cls, max_requests: int, window_seconds: float) -> "RateLimitPolicy":
+        """Allow bursts of ``max_requests`` refilling fully over ``window_seconds``."""
+        return cls(float(max_requests), max_requests / window_seconds)
+
+
+@dataclass(slots=True)
+class TokenBucket:
+    tokens: float
+    updated_at: float
+
+
+class RateLimiter:
+    """Per-user token buckets, one set per policy name ("text", "voice", ...).
+
+    Each user costs two floats per policy they have used. Buckets that have
+    been idle long enough to refill completely are indistinguishable from new
+    ones, so a periodic sweep drops them without changing any decision.
+    """
+
+    def __init__(
+        self,
+        policies: Mapping[str, RateLimitPolicy],
+        *,
+        sweep_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._policies = dict(policies)
+        self._buckets: Dict[str, Dict[int, TokenBucket]] = {name: {} for name in self._policies}
+        self._sweep_interval = sweep_interval
+        self._clock = clock
+        self._next_sweep = clock() + sweep_interval
+
+    def __len__(self) -> int:
+        return sum(len(buckets) for buckets in self._buckets.values())
+
+    def _refill(self, policy: RateLimitPolicy, bucket: TokenBucket, now: float) -> None:
+        elapsed = now - bucket.updated_at
+        if elapsed > 0:
+            bucket.tokens = min(policy.capacity, bucket.tokens + elapsed * policy.refill_per_second)
+            bucket.updated_at = now
+
+    def allow(self, kind: str, user_id: int, cost: float = 1.0) -> bool:
+        """Take ``cost`` tokens from the user's ``kind`` bucket; False if there are not enough."""
+        policy = self._policies[kind]
+        now = self._clock()
+        if now >= self._next_sweep:
+            self.evict_idle(now)
+        buckets = self._buckets[kind]
+        bucket = buckets.get(user_id)
+        if bucket is None:
+            bucket = buckets[user_id] = TokenBucket(policy.capacity, now)
+        else:
+            self._refill(policy, bucket, now)
+        if bucket.tokens < cost:
+            return False
+        bucket.tokens -= cost
+        return True
+
+    def refund(self, kind: str, user_id: int, cost: float = 1.0) -> None:
+        """Give back tokens taken for a request that ended up not counting."""
+        bucket = self._buckets[kind].get(user_id)
+        if bucket is not None:
+            bucket.tokens = min(self._policies[kind].capacity, bucket.tokens + cost)
+
+    def retry_after(self, kind: str, user_id: int, cost: float = 1.0) -> float:
+        """Seconds until ``cost`` tokens are available (0 if they are now)."""
+        policy = self._policies[kind]
+        bucket = self._buckets[kind].get(user_id)
+        if bucket is None:
+            return 0.0
+        self._refill(policy, bucket, self._clock())
+        return max(0.0, (cost - bucket.tokens) / policy.refill_per_second)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Drop buckets that have refilled completely. Returns the number removed."""
+        now = self._clock() if now is None else now
+        removed = 0
+        for kind, buckets in self._buckets.items():
+            policy = self._policies[kind]
+            idle = [
+                user_id
+                for user_id, bucket in buckets.items()
+                if bucket.tokens + (now - bucket.updated_at) * policy.refill_per_second >= policy.capacity
+            ]
+            for user_id in idle:
+                del buckets[user_id]
+            removed += len(idle)
+        self._next_sweep = now + self._sweep_interval
+        return removed
+
+    def reset(self, user_id: Optional[int] = None) -> None:
+        """Forget one user's buckets, or everything when ``user_id`` is None."""
+        for buckets in self._buckets.values():
+            if user_id is None:
+                buckets.clear()
+            else:
+                buckets.pop(user_id, None)
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
 
 from .localization import Language, main_menu_labels
 
+logger = logging.getLogger(__name__)
+
+CONFIG_SNAPSHOT_VERSION = 1
+
 
 def _normalize_content_payload(content_payload: Any) -> Dict[str, Dict[str, Optional[str]]]:
     """
@@ -52,6 +61,76 @@ def _ensure_dict_by_key(items: Any, key_name: str) -> Dict[str, Dict[str, Any]]:
     return mapped
 
 
+def config_fingerprint(payload: Dict[str, Any]) -> str:
+    """Content hash of a config payload, ignoring the per-request ``fetched_at`` stamp."""
+    canonical = json.dumps(
+        {key: value for key, value in payload.items() if key != "fetched_at"},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def save_config_snapshot(path: Path, payload: Dict[str, Any], version: str, etag: Optional[str]) -> None:
+    """Persist the last good config payload atomically (temp file + rename)."""
+    record = {
+        "v": CONFIG_SNAPSHOT_VERSION,
+        "version": version,
+        "etag": etag,
+        "saved_at": datetime.now(timezone.utc).isoformat(),
+        "payload": payload,
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = path.with_suffix(path.suffix + ".tmp")
+        with temp_file.open("w", encoding="utf-8") as handle:
+            json.dump(record, handle, ensure_ascii=False, separators=(",", ":"))
+        temp_file.replace(path)
+    except (OSError, TypeError, ValueError) as exc:
+        logger.warning(f"Failed to write remote config snapshot {path}: {exc}")
+
+
+def load_config_snapshot(path: Path) -> Optional[Dict[str, Any]]:
+    """Read a snapshot written by ``save_config_snapshot``; None if missing or unusable."""
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            record = json.load(handle)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.warning(f"Ignoring unreadable remote config snapshot {path}: {exc}")
+        return None
+    if (
+        not isinstance(record, dict)
+        or record.get("v") != CONFIG_SNAPSHOT_VERSION
+        or not isinstance(record.get("payload"), dict)
+    ):
+        return None
+    return record
+
+
+def _changed_keys(old: Dict[str, Any], new: Dict[str, Any]) -> Set[str]:
+    """Keys added, removed or modified between two keyed sections."""
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
+@dataclass(slots=True)
+class ConfigDiff:
+    """What changed between two config payloads."""
+
+    questions: Set[str] = field(default_factory=set)
+    flows: Set[str] = field(default_factory=set)
+    content: Set[str] = field(default_factory=set)
+    # Other top-level sections that changed ("menu_buttons", "settings", ...)
+    sections: Set[str] = field(default_factory=set)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.questions or self.flows or self.content or self.sections)
+
+
 @dataclass
 class RemoteConfig:
     menu_buttons: List[Dict[str, Any]] = field(default_factory=list)
@@ -63,17 +142,63 @@ class RemoteConfig:
     buttons: List[Dict[str, Any]] = field(default_factory=list)
     exams: List[Dict[str, Any]] = field(default_factory=list)
     last_refresh: Optional[str] = None
+    # Content hash of the applied payload; changes whenever the config does
+    version: Optional[str] = None
+    # Stripped label (either language, with or without emoji) -> menu button
+    label_index: Dict[str, Dict[str, Any]] = field(default_factory=dict, repr=False)
 
-    def update_from_payload(self, payload: Dict[str, Any]) -> None:
-        self.menu_buttons = payload.get("menu_buttons", []) or []
-        self.flows = _ensure_dict_by_key(payload.get("flows") or [], "flow_key")
-        self.questions = _ensure_dict_by_key(payload.get("questions") or [], "question_key")
-        self.content_blocks = _normalize_content_payload(payload.get("content"))
-        self.settings = payload.get("settings", {}) or {}
-        self.commands = payload.get("commands", []) or []
-        self.buttons = payload.get("buttons", []) or []
-        self.exams = payload.get("exams", []) or []
+    def update_from_payload(self, payload: Dict[str, Any], version: Optional[str] = None) -> ConfigDiff:
+        """Apply ``payload`` and return what changed.
+
+        ``version`` is the payload's ``config_fingerprint`` if the caller already
+        has it. A payload with the current version only bumps ``last_refresh``.
+        """
+        version = version or config_fingerprint(payload)
         self.last_refresh = payload.get("fetched_at")
+        if version == self.version:
+            return ConfigDiff()
+
+        flows = _ensure_dict_by_key(payload.get("flows") or [], "flow_key")
+        questions = _ensure_dict_by_key(payload.get("questions") or [], "question_key")
+        content_blocks = _normalize_content_payload(payload.get("content"))
+        lists = {
+            "menu_buttons": payload.get("menu_buttons", []) or [],
+            "settings": payload.get("settings", {}) or {},
+            "commands": payload.get("commands", []) or [],
+            "buttons": payload.get("buttons", []) or [],
+            "exams": payload.get("exams", []) or [],
+        }
+        diff = ConfigDiff(
+            questions=_changed_keys(self.questions, questions),
+            flows=_changed_keys(self.flows, flows),
+            content=_changed_keys(self.content_blocks, content_blocks),
+            sections={name for name, value in lists.items() if getattr(self, name) != value},
+        )
+
+        self.flows = flows
+        self.questions = questions
+        self.content_blocks = content_blocks
+        for name, value in lists.items():
+            setattr(self, name, value)
+        self.label_index = self._build_label_index(self.menu_buttons)
+        self.version = version
+        return diff
+
+    @classmethod
+    def _build_label_index(cls, menu_buttons: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        index: Dict[str, Dict[str, Any]] = {}
+        for button in menu_buttons:
+            labels = (
+                cls._button_label(button, Language.EN),
+                cls._button_label(button, Language.FA),
+                (button.get("en_text") or "").strip(),
+                (button.get("fa_text") or "").strip(),
+            )
+            for label in labels:
+                if label:
+                    # Earlier buttons win, as with the old first-match scan
+                    index.setdefault(label, button)
+        return index
 
     def has_menu(self) -> bool:
         return bool(self.menu_buttons)
@@ -100,17 +225,7 @@ class RemoteConfig:
         return keyboard
 
     def find_menu_button(self, text: str, language: Language) -> Optional[Dict[str, Any]]:
-        normalized = text.strip()
-        for button in self.menu_buttons:
-            labels = {
-                self._button_label(button, Language.EN),
-                self._button_label(button, Language.FA),
-                (button.get("en_text") or "").strip(),
-                (button.get("fa_text") or "").strip(),
-            }
-            if normalized in {label for label in labels if label}:
-                return button
-        return None
+        return self.label_index.get(text.strip())
 
     def get_flow(self, flow_key: Optional[str]) -> Optional[Dict[str, Any]]:
         if not flow_key:
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple, Union
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from .rate_limit import RateLimiter, RateLimitPolicy, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes, passed to bot methods as ``rate_limit_args``; lower runs first
+PRIORITY_REPLY = 0
+PRIORITY_ANNOUNCE = 1
+PRIORITY_BROADCAST = 2
+
+
+@dataclass(slots=True)
+class SendSchedulerStats:
+    sent: int = 0
+    delayed: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+class SendScheduler(BaseRateLimiter[int]):
+    """Paces every Bot API request that targets a chat.
+
+    Requests first wait on a per-chat bucket (groups/channels and private chats
+    have separate limits) and then on one global bucket. Waiters for the global
+    bucket are served by priority lane, so user replies go ahead of group
+    announcements, which go ahead of broadcasts. On ``RetryAfter`` all sends
+    pause for the requested time and the request is retried.
+    Requests without a ``chat_id`` (``getUpdates``, ``getMe``...) are not paced.
+    """
+
+    def __init__(
+        self,
+        *,
+        global_per_second: float = 30.0,
+        group_per_minute: int = 20,
+        private_per_second: float = 1.0,
+        private_burst: int = 3,
+        max_retries: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._global_policy = RateLimitPolicy(global_per_second, global_per_second)
+        self._global = TokenBucket(global_per_second, clock())
+        self._chats = RateLimiter(
+            {
+                "group": RateLimitPolicy.per_window(group_per_minute, 60),
+                "private": RateLimitPolicy(float(private_burst), private_per_second),
+            },
+            clock=clock,
+        )
+        self._max_retries = max_retries
+        self._clock = clock
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._pump_task: Optional[asyncio.Task] = None
+        self._paused_until = 0.0
+        self.stats = SendSchedulerStats()
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        task, self._pump_task = self._pump_task, None
+        if task and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        for _, _, future in self._waiters:
+            if not future.done():
+                future.cancel()
+        self._waiters.clear()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @staticmethod
+    def _chat_kind(chat_id: Any) -> Tuple[int, str]:
+        with contextlib.suppress(ValueError, TypeError):
+            chat_id = int(chat_id)
+        if isinstance(chat_id, int):
+            return chat_id, "group" if chat_id < 0 else "private"
+        # @channelusername targets are always channels/supergroups
+        return hash(chat_id), "group"
+
+    async def _wait_for_chat(self, chat_id: Any) -> None:
+        key, kind = self._chat_kind(chat_id)
+        while not self._chats.allow(kind, key):
+            self.stats.delayed += 1
+            await asyncio.sleep(self._chats.retry_after(kind, key))
+
+    async def _wait_for_global(self, priority: int) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.get_running_loop().create_task(self._pump())
+        await future
+
+    async def _pump(self) -> None:
+        """Hand out global tokens to waiters in priority order."""
+        while self._waiters:
+            now = self._clock()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            elapsed = now - self._global.updated_at
+            if elapsed > 0:
+                self._global.tokens = min(
+                    self._global_policy.capacity,
+                    self._global.tokens + elapsed * self._global_policy.refill_per_second,
+                )
+                self._global.updated_at = now
+            if self._global.tokens < 1:
+                self.stats.delayed += 1
+                await asyncio.sleep((1 - self._global.tokens) / self._global_policy.refill_per_second)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._global.tokens -= 1
+            future.set_result(None)
+            # Let the released request start before handing out the next token
+            await asyncio.sleep(0)
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Union[bool, Dict[str, Any], List[Dict[str, Any]]]]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[int],
+    ) -> Union[bool, Dict[str, Any], List[Dict[str, Any]]]:
+        chat_id = data.get("chat_id")
+        priority = PRIORITY_REPLY if rate_limit_args is None else rate_limit_args
+        for attempt in range(self._max_retries + 1):
+            if chat_id is not None:
+                await self._wait_for_chat(chat_id)
+                await self._wait_for_global(priority)
+            try:
+                result = await callback(*args, **kwargs)
+                if chat_id is not None:
+                    self.stats.sent += 1
+                return result
+            except RetryAfter as exc:
+                retry_after = float(exc.retry_after)
+                if attempt == self._max_retries:
+                    self.stats.failed += 1
+                    logger.error(f"{endpoint} still flood-limited after {attempt} retries; giving up")
+                    raise
+                self.stats.retried += 1
+                # Telegram's flood wait applies to the whole bot, so pause every lane
+                self._paused_until = max(self._paused_until, self._clock() + retry_after + 0.1)
+                logger.warning(f"{endpoint} hit RetryAfter; pausing sends for {retry_after:.1f}s")
+                await asyncio.sleep(max(0.0, self._paused_until - self._clock()))
+        raise AssertionError("unreachable")  # pragma: no cover
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
+import logging
+from dataclasses import dataclass, field, fields
 from enum import Enum, auto
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from .localization import Language
 
+logger = logging.getLogger(__name__)
+
+# Version 1 (no "v" key) stored every field; version 2 stores only non-default fields.
+SESSION_SCHEMA_VERSION = 2
+
 
 class Flow(Enum):
     IDLE = auto()
@@ -15,7 +20,7 @@ class Flow(Enum):
     CONFIRM = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class UserSession:
     language: Optional[Language] = None
     flow: Flow = Flow.IDLE
@@ -38,8 +43,6 @@ class UserSession:
     resume_original_flow: Optional[Flow] = None  # Store original flow during resume prompt
     awaiting_view_roles: bool = False
     last_menu_choice: Optional[str] = None
-    ai_reply_count: int = 0
-    ai_window_start: Optional[datetime] = None
     remote_flow_key: Optional[str] = None
     remote_flow_step: int = 0
     remote_flow_answers: Dict[str, Optional[str]] = field(default_factory=dict)
@@ -111,41 +114,28 @@ class UserSession:
         self.exit_confirmation_flow = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """Serialize session to dictionary for persistence."""
-        return {
-            "language": self.language.value if self.language else None,
-            "flow": self.flow.name if self.flow else None,
-            "question_index": self.question_index,
-            "answers": self.answers,
-            "waiting_voice": self.waiting_voice,
-            "voice_file_path": self.voice_file_path,
-            "voice_file_id": self.voice_file_id,
-            "voice_message_id": self.voice_message_id,
-            "user_chat_id": self.user_chat_id,
-            "is_candidate": self.is_candidate,
-            "edit_mode": self.edit_mode,
-            "contact_pending": self.contact_pending,
-            "contact_message_draft": self.contact_message_draft,
-            "contact_review_pending": self.contact_review_pending,
-            "awaiting_edit_selection": self.awaiting_edit_selection,
-            "voice_skipped": self.voice_skipped,
-            "exit_confirmation_pending": self.exit_confirmation_pending,
-            "exit_confirmation_flow": self.exit_confirmation_flow.name if self.exit_confirmation_flow else None,
-            "awaiting_view_roles": self.awaiting_view_roles,
-            "last_menu_choice": self.last_menu_choice,
-            "ai_reply_count": self.ai_reply_count,
-            "ai_window_start": self.ai_window_start.isoformat() if self.ai_window_start else None,
-            "remote_flow_key": self.remote_flow_key,
-            "remote_flow_step": self.remote_flow_step,
-            "remote_flow_answers": self.remote_flow_answers,
-            "remote_flow_waiting_question": self.remote_flow_waiting_question,
-        }
+        """Serialize session for persistence, keeping only fields that differ from the defaults."""
+        data: Dict[str, Any] = {"v": SESSION_SCHEMA_VERSION}
+        for name in _PERSISTED_FIELDS:
+            value = getattr(self, name)
+            if value == _DEFAULTS[name]:
+                continue
+            encode = _ENCODERS.get(name)
+            data[name] = encode(value) if encode and value is not None else value
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "UserSession":
-        """Deserialize session from dictionary with defensive error handling."""
+        """Deserialize session from dictionary with defensive error handling.
+
+        Accepts both the compact format and legacy full dumps (missing keys fall
+        back to defaults); legacy files are rewritten compactly on their next save.
+        """
         session = cls()
         try:
+            version = int(data.get("v") or 1)
+            if version > SESSION_SCHEMA_VERSION:
+                logger.warning(f"Session schema v{version} is newer than supported v{SESSION_SCHEMA_VERSION}")
             if data.get("language"):
                 try:
                     session.language = Language(data["language"])
@@ -185,12 +175,6 @@ class UserSession:
                     session.exit_confirmation_flow = None
             session.awaiting_view_roles = data.get("awaiting_view_roles", False)
             session.last_menu_choice = data.get("last_menu_choice")
-            session.ai_reply_count = data.get("ai_reply_count", 0)
-            if data.get("ai_window_start"):
-                try:
-                    session.ai_window_start = datetime.fromisoformat(data["ai_window_start"])
-                except (ValueError, TypeError):
-                    session.ai_window_start = None
             session.remote_flow_key = data.get("remote_flow_key")
             session.remote_flow_step = data.get("remote_flow_step", 0)
             remote_flow_answers = data.get("remote_flow_answers", {})
@@ -216,6 +200,16 @@ class UserSession:
         )
 
 
+_ENCODERS: Dict[str, Callable[[Any], Any]] = {
+    "language": lambda value: value.value,
+    "flow": lambda value: value.name,
+    "exit_confirmation_flow": lambda value: value.name,
+}
+# resume_original_flow only lives for the duration of a resume prompt and is not persisted
+_PERSISTED_FIELDS = tuple(f.name for f in fields(UserSession) if f.name != "resume_original_flow")
+_DEFAULTS = {name: getattr(UserSession(), name) for name in _PERSISTED_FIELDS}
+
+
 def get_session(user_data: Dict[str, Any]) -> UserSession:
     session = user_data.get("session")
     if not isinstance(session, UserSession):
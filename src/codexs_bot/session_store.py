@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+from .session import UserSession
+from .sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore(Protocol):
+    """Synchronous session persistence; ``DataStorage`` runs it in a worker thread."""
+
+    def load(self, user_id: int) -> Optional[Dict[str, Any]]: ...
+
+    def save_many(self, batch: Dict[int, Dict[str, Any]]) -> Dict[int, Exception]: ...
+
+    def delete(self, user_id: int) -> None: ...
+
+    def count(self) -> int: ...
+
+    def list_user_ids(self, limit: Optional[int] = None) -> List[int]: ...
+
+    def cleanup(self, older_than: float) -> int: ...
+
+    def close(self) -> None: ...
+
+
+class FileSessionStore:
+    """One ``session_<user_id>.json`` file per user (the original layout)."""
+
+    def __init__(self, sessions_dir: Path) -> None:
+        self._sessions_dir = sessions_dir
+        self._sessions_dir.mkdir(parents=True, exist_ok=True)
+
+    def _session_file(self, user_id: int) -> Path:
+        """Get session file path for a user."""
+        return self._sessions_dir / f"session_{user_id}.json"
+
+    @staticmethod
+    def _user_id(session_file: Path) -> Optional[int]:
+        try:
+            return int(session_file.stem.split("_", 1)[1])
+        except (IndexError, ValueError):
+            return None
+
+    def load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        session_file = self._session_file(user_id)
+        if not session_file.exists():
+            return None
+        with session_file.open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def save_many(self, batch: Dict[int, Dict[str, Any]]) -> Dict[int, Exception]:
+        failed: Dict[int, Exception] = {}
+        for user_id, session_data in batch.items():
+            try:
+                self._write_session(self._session_file(user_id), session_data)
+            except Exception as exc:  # pylint: disable=broad-except
+                failed[user_id] = exc
+        return failed
+
+    @staticmethod
+    def _write_session(session_file: Path, session_data: Dict[str, Any]) -> None:
+        session_file.parent.mkdir(parents=True, exist_ok=True)
+        # Use atomic write: write to temp file, then rename
+        temp_file = session_file.with_suffix(session_file.suffix + ".tmp")
+        with temp_file.open("w", encoding="utf-8") as handle:
+            json.dump(session_data, handle, ensure_ascii=False, separators=(",", ":"))
+        # Atomic rename (works on most filesystems)
+        temp_file.replace(session_file)
+
+    def delete(self, user_id: int) -> None:
+        self._session_file(user_id).unlink(missing_ok=True)
+
+    def count(self) -> int:
+        if not self._sessions_dir.exists():
+            return 0
+        return sum(1 for _ in self._sessions_dir.glob("session_*.json"))
+
+    def list_user_ids(self, limit: Optional[int] = None) -> List[int]:
+        """User ids ordered by most recently saved first."""
+        entries = []
+        for session_file in self._sessions_dir.glob("session_*.json"):
+            user_id = self._user_id(session_file)
+            if user_id is None:
+                continue
+            try:
+                entries.append((session_file.stat().st_mtime, user_id))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+        return [user_id for _, user_id in entries[:limit]]
+
+    def cleanup(self, older_than: float) -> int:
+        deleted_count = 0
+        for session_file in self._sessions_dir.glob("session_*.json"):
+            try:
+                if session_file.stat().st_mtime < older_than:
+                    session_file.unlink()
+                    deleted_count += 1
+            except Exception:
+                continue
+        return deleted_count
+
+    def close(self) -> None:
+        pass
+
+
+_SESSION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    user_id INTEGER PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SQLiteSessionStore:
+    """All sessions in one SQLite (WAL) table keyed by user id.
+
+    ``updated_at`` is indexed so counting, listing and cleanup are queries
+    instead of directory scans. Batches are written in a single transaction.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self._db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = connect(db_path)
+        self._conn.executescript(_SESSION_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM sessions WHERE user_id = ?", (user_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def save_many(self, batch: Dict[int, Dict[str, Any]]) -> Dict[int, Exception]:
+        failed: Dict[int, Exception] = {}
+        rows = []
+        now = time.time()
+        for user_id, session_data in batch.items():
+            try:
+                rows.append((user_id, now, json.dumps(session_data, ensure_ascii=False, separators=(",", ":"))))
+            except (TypeError, ValueError) as exc:
+                failed[user_id] = exc
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO sessions (user_id, updated_at, data) VALUES (?, ?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET updated_at = excluded.updated_at, data = excluded.data",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as exc:
+                self._conn.execute("ROLLBACK")
+                for user_id, _, _ in rows:
+                    failed[user_id] = exc
+        return failed
+
+    def delete(self, user_id: int) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def list_user_ids(self, limit: Optional[int] = None) -> List[int]:
+        """User ids ordered by most recently saved first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT user_id FROM sessions ORDER BY updated_at DESC LIMIT ?",
+                (-1 if limit is None else limit,),
+            ).fetchall()
+        return [row["user_id"] for row in rows]
+
+    def cleanup(self, older_than: float) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (older_than,)).rowcount
+
+    def import_files(self, sessions_dir: Path) -> int:
+        """One-shot import of ``session_*.json`` files, keeping their modification times.
+
+        Recorded in ``store_meta`` so later calls for the same directory are
+        no-ops. Existing rows are not overwritten. Returns the number imported.
+        """
+        if not sessions_dir.exists():
+            return 0
+        marker = f"sessions_imported:{sessions_dir.resolve()}"
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM store_meta WHERE key = ?", (marker,)).fetchone():
+                return 0
+            imported = 0
+            self._conn.execute("BEGIN")
+            try:
+                for session_file in sessions_dir.glob("session_*.json"):
+                    user_id = FileSessionStore._user_id(session_file)
+                    if user_id is None:
+                        continue
+                    try:
+                        data = session_file.read_text(encoding="utf-8")
+                        json.loads(data)
+                        updated_at = session_file.stat().st_mtime
+                    except (OSError, ValueError):
+                        continue
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO sessions (user_id, updated_at, data) VALUES (?, ?, ?)",
+                        (user_id, updated_at, data),
+                    )
+                    imported += cursor.rowcount
+                self._conn.execute(
+                    "INSERT INTO store_meta (key, value) VALUES (?, ?)",
+                    (marker, datetime.now(timezone.utc).isoformat()),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        logger.info("Imported %d sessions from %s into %s", imported, sessions_dir, self._db_path)
+        return imported
+
+
+@dataclass(slots=True)
+class SessionCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    data: Optional[Dict[str, Any]]
+    session: Optional[UserSession]
+    expires_at: float
+
+
+class SessionCache:
+    """Bounded LRU with TTL of deserialized ``UserSession`` objects, keyed by user id.
+
+    ``put`` stores a private copy of the session dict; the object is hydrated on
+    the next ``get`` and kept until the entry is replaced, dropped or expires. A
+    known absence (``put(user_id, None)``) is cached too, so new users do not hit
+    the store on every ``/start``. ``UserSession`` shares its ``answers`` dicts
+    with the dict it was built from, so every ``get`` hands out its own copy and
+    later changes by the caller never reach the cached snapshot.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 600.0) -> None:
+        self._max_entries = max(0, max_entries)
+        self._ttl = ttl
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self.stats = SessionCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: int) -> Tuple[bool, Optional[UserSession]]:
+        """Return ``(found, session)``; ``(True, None)`` is a cached absence."""
+        entry = self._entries.get(user_id)
+        if entry is None or entry.expires_at < time.monotonic():
+            if entry is not None:
+                del self._entries[user_id]
+            self.stats.misses += 1
+            return False, None
+        self._entries.move_to_end(user_id)
+        self.stats.hits += 1
+        if entry.session is None and entry.data is not None:
+            entry.session = UserSession.from_dict(copy.deepcopy(entry.data))
+        return True, copy.deepcopy(entry.session)
+
+    def put(
+        self,
+        user_id: int,
+        data: Optional[Dict[str, Any]],
+        session: Optional[UserSession] = None,
+    ) -> None:
+        """Cache a copy of ``data`` (and of its already-hydrated ``session``, if the caller has one)."""
+        if not self._max_entries:
+            return
+        self._entries[user_id] = _CacheEntry(
+            copy.deepcopy(data),
+            copy.deepcopy(session),
+            time.monotonic() + self._ttl,
+        )
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def discard(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rows read per lock acquisition by iterators, so a slow consumer never blocks writers
+ITER_CHUNK_SIZE = 500
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """Open a WAL-mode SQLite connection that may be used from worker threads.
+
+    Callers must serialize access to the returned connection themselves.
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def normalize_timestamp(value: Any) -> Optional[str]:
+    """Normalize ``submitted_at`` to a fixed-width UTC string so it sorts lexically."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+_APPLICATION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    application_id TEXT UNIQUE,
+    telegram_id INTEGER,
+    submitted_at TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_applications_telegram_id ON applications (telegram_id, submitted_at);
+CREATE INDEX IF NOT EXISTS idx_applications_submitted_at ON applications (submitted_at);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SQLiteApplicationStore:
+    """Application records in SQLite (WAL) with indexed lookups.
+
+    Provides the same synchronous interface as ``JsonlApplicationStore`` so it
+    can back ``DataStorage`` unchanged. The full record is stored as JSON next
+    to indexed ``application_id``, ``telegram_id`` and ``submitted_at`` columns.
+    Saving an ``application_id`` again replaces the stored record, matching the
+    JSONL store where the latest line for an id wins.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self._db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = connect(db_path)
+        self._conn.executescript(_APPLICATION_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _row_values(payload: Dict[str, Any]) -> tuple:
+        applicant = payload.get("applicant") or {}
+        telegram_id = applicant.get("telegram_id") if isinstance(applicant, dict) else None
+        return (
+            payload.get("application_id"),
+            telegram_id if isinstance(telegram_id, int) else None,
+            normalize_timestamp(payload.get("submitted_at")),
+            json.dumps(payload, ensure_ascii=False),
+        )
+
+    def append(self, payload: Dict[str, Any]) -> bool:
+        """Store ``payload``; True if it is a new record, False if it replaced one."""
+        values = self._row_values(payload)
+        with self._lock:
+            exists = values[0] is not None and self._conn.execute(
+                "SELECT 1 FROM applications WHERE application_id = ?", (values[0],)
+            ).fetchone() is not None
+            self._conn.execute(
+                "INSERT INTO applications (application_id, telegram_id, submitted_at, payload) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (application_id) DO UPDATE SET telegram_id = excluded.telegram_id, "
+                "submitted_at = excluded.submitted_at, payload = excluded.payload",
+                values,
+            )
+        return not exists
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row["payload"]) for row in rows]
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Return all applications, newest first."""
+        return self._query("SELECT payload FROM applications ORDER BY submitted_at DESC, id DESC")
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+
+    def get_by_id(self, application_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT payload FROM applications WHERE application_id = ? LIMIT 1",
+            (application_id,),
+        )
+        return rows[0] if rows else None
+
+    def get_by_user(self, user_id: int) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT payload FROM applications WHERE telegram_id = ? "
+            "ORDER BY submitted_at DESC, id DESC",
+            (user_id,),
+        )
+
+    def get_recent(self, limit: int) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT payload FROM applications ORDER BY submitted_at DESC, id DESC LIMIT ?",
+            (limit,),
+        )
+
+    def get_range(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT payload FROM applications WHERE submitted_at BETWEEN ? AND ? "
+            "ORDER BY submitted_at DESC, id DESC",
+            (normalize_timestamp(start_date.isoformat()), normalize_timestamp(end_date.isoformat())),
+        )
+
+    def iter_since(self, start_date: datetime) -> Iterator[Dict[str, Any]]:
+        """Yield applications submitted at or after ``start_date``.
+
+        Rows are fetched ``ITER_CHUNK_SIZE`` at a time; the lock is not held while
+        they are yielded.
+        """
+        start_key = normalize_timestamp(start_date.isoformat())
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, payload FROM applications WHERE submitted_at >= ? AND id > ? ORDER BY id LIMIT ?",
+                    (start_key, last_id, ITER_CHUNK_SIZE),
+                ).fetchall()
+            for row in rows:
+                yield json.loads(row["payload"])
+            if len(rows) < ITER_CHUNK_SIZE:
+                return
+            last_id = rows[-1]["id"]
+
+    def import_jsonl(self, jsonl_path: Path) -> int:
+        """One-shot import of an existing ``applications.jsonl`` file.
+
+        The import is recorded in ``store_meta`` so later calls for the same file
+        are no-ops. Rows whose ``application_id`` already exists are skipped.
+        Returns the number of imported rows.
+        """
+        if not jsonl_path.exists():
+            return 0
+        marker = f"jsonl_imported:{jsonl_path.resolve()}"
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM store_meta WHERE key = ?", (marker,)).fetchone():
+                return 0
+            imported = 0
+            self._conn.execute("BEGIN")
+            try:
+                with jsonl_path.open("r", encoding="utf-8") as handle:
+                    for line in handle:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            payload = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if not isinstance(payload, dict):
+                            continue
+                        cursor = self._conn.execute(
+                            "INSERT OR IGNORE INTO applications "
+                            "(application_id, telegram_id, submitted_at, payload) VALUES (?, ?, ?, ?)",
+                            self._row_values(payload),
+                        )
+                        imported += cursor.rowcount
+                self._conn.execute(
+                    "INSERT INTO store_meta (key, value) VALUES (?, ?)",
+                    (marker, datetime.now(timezone.utc).isoformat()),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        logger.info("Imported %d applications from %s into %s", imported, jsonl_path, self._db_path)
+        return imported
+
+
+if __name__ == "__main__":  # pragma: no cover - manual maintenance entry point
+    import sys
+
+    if len(sys.argv) != 3:
+        print("Usage: python -m codexs_bot.sqlite_store <applications.jsonl> <database.db>")
+        sys.exit(1)
+    logging.basicConfig(level=logging.INFO)
+    store = SQLiteApplicationStore(Path(sys.argv[2]))
+    print(f"Imported {store.import_jsonl(Path(sys.argv[1]))} applications")
+    store.close()
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from .sqlite_store import normalize_timestamp
+
+logger = logging.getLogger(__name__)
+
+STATS_VERSION = 1
+# Per-day buckets older than this are pruned; reports only look back 30 days
+DAILY_RETENTION_DAYS = 90
+
+
+@dataclass(slots=True)
+class StatsSnapshot:
+    """Running totals over every stored application and contact message."""
+
+    total_applications: int = 0
+    completed_applications: int = 0
+    incomplete_applications: int = 0
+    contact_messages: int = 0
+    voice_samples: int = 0
+    voice_skipped: int = 0
+    languages: Dict[str, int] = field(default_factory=dict)
+    unique_users: Set[int] = field(default_factory=set)
+    # "YYYY-MM-DD" (UTC) -> {"applications": n, "contacts": n}
+    daily: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "v": STATS_VERSION,
+            "total_applications": self.total_applications,
+            "completed_applications": self.completed_applications,
+            "incomplete_applications": self.incomplete_applications,
+            "contact_messages": self.contact_messages,
+            "voice_samples": self.voice_samples,
+            "voice_skipped": self.voice_skipped,
+            "languages": self.languages,
+            "unique_users": sorted(self.unique_users),
+            "daily": self.daily,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StatsSnapshot":
+        return cls(
+            total_applications=int(data.get("total_applications", 0)),
+            completed_applications=int(data.get("completed_applications", 0)),
+            incomplete_applications=int(data.get("incomplete_applications", 0)),
+            contact_messages=int(data.get("contact_messages", 0)),
+            voice_samples=int(data.get("voice_samples", 0)),
+            voice_skipped=int(data.get("voice_skipped", 0)),
+            languages=dict(data.get("languages") or {}),
+            unique_users=set(data.get("unique_users") or []),
+            daily={day: dict(counts) for day, counts in (data.get("daily") or {}).items()},
+        )
+
+    def copy(self) -> "StatsSnapshot":
+        return StatsSnapshot(
+            total_applications=self.total_applications,
+            completed_applications=self.completed_applications,
+            incomplete_applications=self.incomplete_applications,
+            contact_messages=self.contact_messages,
+            voice_samples=self.voice_samples,
+            voice_skipped=self.voice_skipped,
+            languages=dict(self.languages),
+            unique_users=set(self.unique_users),
+            daily={day: dict(counts) for day, counts in self.daily.items()},
+        )
+
+    def window(self, kind: str, today: date, days: int) -> int:
+        """Sum ``kind`` ("applications" or "contacts") over the last ``days`` calendar days."""
+        return sum(
+            self.daily.get((today - timedelta(days=offset)).isoformat(), {}).get(kind, 0)
+            for offset in range(days)
+        )
+
+    def _bump_day(self, submitted_at: Any, kind: str) -> None:
+        key = normalize_timestamp(submitted_at)
+        if key is None:
+            return
+        bucket = self.daily.setdefault(key[:10], {})
+        bucket[kind] = bucket.get(kind, 0) + 1
+
+    def add_application(self, payload: Dict[str, Any]) -> None:
+        self.total_applications += 1
+        if payload.get("application_id"):
+            self.completed_applications += 1
+        else:
+            self.incomplete_applications += 1
+        if payload.get("voice_file_path") or payload.get("voice_file_id"):
+            self.voice_samples += 1
+        if payload.get("voice_skipped", False):
+            self.voice_skipped += 1
+        app_lang = payload.get("language") or "en"
+        self.languages[app_lang] = self.languages.get(app_lang, 0) + 1
+        applicant = payload.get("applicant")
+        telegram_id = applicant.get("telegram_id") if isinstance(applicant, dict) else None
+        if isinstance(telegram_id, int):
+            self.unique_users.add(telegram_id)
+        self._bump_day(payload.get("submitted_at"), "applications")
+
+    def add_contact(self, payload: Dict[str, Any]) -> None:
+        self.contact_messages += 1
+        self._bump_day(payload.get("submitted_at"), "contacts")
+
+    def prune(self, today: date) -> None:
+        cutoff = (today - timedelta(days=DAILY_RETENTION_DAYS)).isoformat()
+        for day in [day for day in self.daily if day < cutoff]:
+            del self.daily[day]
+
+
+class StatsTracker:
+    """Keeps a ``StatsSnapshot`` in memory and persists it to ``stats.json``.
+
+    ``DataStorage`` calls ``record_*`` after every write. With ``deferred``
+    the snapshot is only marked dirty and the caller is expected to ``flush``
+    it periodically; otherwise every record writes the file. On first use the
+    snapshot on disk is checked against the stores' record counts and rebuilt
+    with one pass if it is missing or out of date, which also covers records
+    that were not flushed before a crash. All methods are synchronous and
+    thread-safe; callers run them in a worker thread.
+    """
+
+    def __init__(self, stats_file: Path, deferred: bool = False) -> None:
+        self._stats_file = stats_file
+        self._deferred = deferred
+        self._lock = threading.Lock()
+        self._snapshot: Optional[StatsSnapshot] = None
+        self._dirty = False
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def copy(self) -> Optional[StatsSnapshot]:
+        """A copy of the snapshot taken under the lock, or ``None`` until ``load`` has run."""
+        with self._lock:
+            return self._snapshot.copy() if self._snapshot is not None else None
+
+    def _read(self) -> Optional[StatsSnapshot]:
+        try:
+            with self._stats_file.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable stats snapshot {self._stats_file}: {exc}")
+            return None
+        if not isinstance(data, dict) or data.get("v") != STATS_VERSION:
+            return None
+        return StatsSnapshot.from_dict(data)
+
+    def _write(self) -> None:
+        try:
+            self._stats_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self._stats_file.with_suffix(self._stats_file.suffix + ".tmp")
+            with temp_file.open("w", encoding="utf-8") as handle:
+                json.dump(self._snapshot.to_dict(), handle, ensure_ascii=False, separators=(",", ":"))
+            temp_file.replace(self._stats_file)
+        except OSError as exc:
+            # The snapshot is rebuilt from the stores on the next start if this fails
+            logger.error(f"Failed to write stats snapshot {self._stats_file}: {exc}")
+
+    def load(
+        self,
+        application_count: int,
+        contact_count: int,
+        applications: Callable[[], Iterable[Dict[str, Any]]],
+        contacts: Callable[[], Iterable[Dict[str, Any]]],
+    ) -> StatsSnapshot:
+        """Load the snapshot, rebuilding it if it disagrees with the store counts.
+
+        ``applications`` and ``contacts`` return the stored records and are only
+        called when a rebuild is needed.
+        """
+        with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            snapshot = self._read()
+            stale = (
+                snapshot is None
+                or snapshot.total_applications != application_count
+                or snapshot.contact_messages != contact_count
+            )
+            if stale:
+                logger.info("Rebuilding stats snapshot from stored records")
+                snapshot = StatsSnapshot()
+                for payload in applications():
+                    snapshot.add_application(payload)
+                for payload in contacts():
+                    snapshot.add_contact(payload)
+            self._snapshot = snapshot
+            if stale:
+                self._write()
+            return snapshot
+
+    def _changed(self, today: date) -> None:
+        """Caller holds ``_lock``."""
+        self._snapshot.prune(today)
+        if self._deferred:
+            self._dirty = True
+        else:
+            self._write()
+
+    def record_application(self, payload: Dict[str, Any], today: date) -> None:
+        with self._lock:
+            # Before the first load the count check will pick this record up
+            if self._snapshot is None:
+                return
+            self._snapshot.add_application(payload)
+            self._changed(today)
+
+    def record_contact(self, payload: Dict[str, Any], today: date) -> None:
+        with self._lock:
+            if self._snapshot is None:
+                return
+            self._snapshot.add_contact(payload)
+            self._changed(today)
+
+    def flush(self) -> bool:
+        """Write the snapshot if records arrived since the last write."""
+        with self._lock:
+            if not self._dirty or self._snapshot is None:
+                return False
+            self._write()
+            self._dirty = False
+            return True
@@ -1,27 +1,341 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import copy
+import heapq
 import json
 import logging
-from datetime import datetime, timedelta, timezone
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from .localization import Language
+from .session import UserSession
+from .session_store import FileSessionStore, SessionCache, SessionCacheStats, SessionStore
+from .sqlite_store import ITER_CHUNK_SIZE, SQLiteApplicationStore, normalize_timestamp
+from .stats import StatsSnapshot, StatsTracker
 
 logger = logging.getLogger(__name__)
 
 
+def _iter_jsonl(file_path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream every valid JSON line from a file, skipping blanks and corrupt rows."""
+    with file_path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _read_jsonl(file_path: Path) -> List[Dict[str, Any]]:
+    """Read every valid JSON line from a file, skipping blanks and corrupt rows."""
+    return list(_iter_jsonl(file_path))
+
+
+def _write_jsonl(file_path: Path, payload: Dict[str, Any]) -> None:
+    """Write JSONL entry with error handling."""
+    try:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with file_path.open("a", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+            handle.write("\n")
+    except (OSError, IOError, json.JSONEncodeError) as exc:
+        # Log error but re-raise to be handled by caller
+        logger.error(f"Failed to write JSONL to {file_path}: {exc}", exc_info=True)
+        raise
+
+
+class JsonlApplicationStore:
+    """Application records kept in an append-only JSONL file.
+
+    An in-memory index maps ``application_id`` and ``telegram_id`` to byte
+    offsets and keeps offsets sorted by submission time, so lookups are a seek
+    plus one ``json.loads`` rather than a full-file parse. The index is built on
+    first use, updated on ``append`` and tails the file from the last indexed
+    offset to pick up lines written by other processes. If the file shrinks
+    (rotation or manual edit) the index is rebuilt.
+
+    All methods are synchronous and are run in a worker thread by ``DataStorage``.
+    """
+
+    def __init__(self, applications_file: Path) -> None:
+        self._applications_file = applications_file
+        self._lock = threading.Lock()
+        self._reset_index()
+
+    def _reset_index(self) -> None:
+        self._indexed_size = 0
+        self._by_id: Dict[str, int] = {}
+        self._by_id_key: Dict[str, str] = {}
+        self._by_user: Dict[int, List[int]] = {}
+        # (normalized submitted_at, offset), ascending; unparsable dates sort first as ""
+        self._by_date: List[Tuple[str, int]] = []
+
+    def _index_record(self, payload: Any, offset: int) -> None:
+        if not isinstance(payload, dict):
+            return
+        key = normalize_timestamp(payload.get("submitted_at")) or ""
+        application_id = payload.get("application_id")
+        if application_id and key >= self._by_id_key.get(application_id, ""):
+            self._by_id[application_id] = offset
+            self._by_id_key[application_id] = key
+        applicant = payload.get("applicant")
+        telegram_id = applicant.get("telegram_id") if isinstance(applicant, dict) else None
+        if isinstance(telegram_id, int):
+            bisect.insort(self._by_user.setdefault(telegram_id, []), (key, offset))
+        bisect.insort(self._by_date, (key, offset))
+
+    def _refresh(self) -> None:
+        """Bring the index up to date with the file. Caller holds ``_lock``."""
+        try:
+            size = self._applications_file.stat().st_size
+        except FileNotFoundError:
+            if self._indexed_size:
+                self._reset_index()
+            return
+        if size < self._indexed_size:
+            logger.info(f"{self._applications_file} shrank; rebuilding application index")
+            self._reset_index()
+        if size == self._indexed_size:
+            return
+        with self._applications_file.open("rb") as handle:
+            handle.seek(self._indexed_size)
+            offset = self._indexed_size
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    # Partially written line; pick it up on the next refresh
+                    break
+                if line.strip():
+                    try:
+                        self._index_record(json.loads(line), offset)
+                    except json.JSONDecodeError:
+                        pass
+                offset += len(line)
+        self._indexed_size = offset
+
+    def refresh(self) -> int:
+        """Build or catch up the index and return the number of indexed records."""
+        with self._lock:
+            self._refresh()
+            return len(self._by_date)
+
+    def _read_at(self, offsets: List[int]) -> List[Dict[str, Any]]:
+        if not offsets:
+            return []
+        records = []
+        with self._applications_file.open("rb") as handle:
+            for offset in offsets:
+                handle.seek(offset)
+                records.append(json.loads(handle.readline()))
+        return records
+
+    def append(self, payload: Dict[str, Any]) -> bool:
+        """Append ``payload``; always True, since every line is a stored record here."""
+        line = (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._refresh()
+            try:
+                self._applications_file.parent.mkdir(parents=True, exist_ok=True)
+                with self._applications_file.open("ab") as handle:
+                    handle.seek(0, 2)
+                    offset = handle.tell()
+                    handle.write(line)
+            except OSError as exc:
+                logger.error(f"Failed to write JSONL to {self._applications_file}: {exc}", exc_info=True)
+                raise
+            # Another writer may have appended since the refresh; let tailing catch up then
+            if offset == self._indexed_size:
+                self._index_record(payload, offset)
+                self._indexed_size = offset + len(line)
+        return True
+
+    def _newest_first(self, entries: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+        return self._read_at([offset for _, offset in reversed(entries)])
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Return all applications, newest first."""
+        with self._lock:
+            self._refresh()
+            return self._newest_first(self._by_date)
+
+    def count(self) -> int:
+        return self.refresh()
+
+    def get_by_id(self, application_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            offset = self._by_id.get(application_id)
+            if offset is None:
+                return None
+            return self._read_at([offset])[0]
+
+    def get_by_user(self, user_id: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            return self._newest_first(self._by_user.get(user_id, []))
+
+    def get_recent(self, limit: int) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+        with self._lock:
+            self._refresh()
+            return self._newest_first(self._by_date[-limit:])
+
+    def get_range(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+        start_key = normalize_timestamp(start_date.isoformat())
+        end_key = normalize_timestamp(end_date.isoformat())
+        with self._lock:
+            self._refresh()
+            lo = bisect.bisect_left(self._by_date, (start_key, -1))
+            hi = bisect.bisect_right(self._by_date, (end_key, float("inf")))
+            return self._newest_first(self._by_date[lo:hi])
+
+    def iter_since(self, start_date: datetime) -> Iterator[Dict[str, Any]]:
+        """Yield applications submitted at or after ``start_date`` in file order.
+
+        Records are read ``ITER_CHUNK_SIZE`` at a time under the lock, which is
+        released before they are yielded, so a slow consumer never blocks writers.
+        """
+        start_key = normalize_timestamp(start_date.isoformat())
+        with self._lock:
+            self._refresh()
+            lo = bisect.bisect_left(self._by_date, (start_key, -1))
+            offsets = sorted(offset for _, offset in self._by_date[lo:])
+        for start in range(0, len(offsets), ITER_CHUNK_SIZE):
+            with self._lock:
+                records = self._read_at(offsets[start:start + ITER_CHUNK_SIZE])
+            yield from records
+
+
+@dataclass(slots=True)
+class WindowCounts:
+    today: int = 0
+    week: int = 0
+    month: int = 0
+
+
+@dataclass(slots=True)
+class ActivityReport:
+    """Windowed aggregates for the group ``/daily`` report."""
+
+    generated_at: datetime
+    applications: WindowCounts = field(default_factory=WindowCounts)
+    contacts: WindowCounts = field(default_factory=WindowCounts)
+    today_voices: int = 0
+    today_skipped: int = 0
+    today_languages: Dict[str, int] = field(default_factory=dict)
+    # Today's applications, newest first
+    recent_today: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def build_activity_report(
+    applications: Iterable[Dict[str, Any]],
+    contacts: Iterable[Dict[str, Any]],
+    now: datetime,
+    recent_limit: int = 5,
+) -> ActivityReport:
+    """Compute every window of an ``ActivityReport`` in one pass over each source.
+
+    Windows are today, the last 7 and the last 30 calendar days including today
+    (from midnight, up to ``now``), the same windows ``StatsSnapshot.window``
+    sums from its daily buckets. Records without a parsable ``submitted_at`` are
+    ignored.
+    """
+    now_key = normalize_timestamp(now.isoformat())
+    midnight = datetime(now.year, now.month, now.day, tzinfo=now.tzinfo or timezone.utc)
+    today_key = normalize_timestamp(midnight.isoformat())
+    week_key = normalize_timestamp((midnight - timedelta(days=6)).isoformat())
+    month_key = normalize_timestamp((midnight - timedelta(days=29)).isoformat())
+    report = ActivityReport(generated_at=now)
+    languages: Counter = Counter()
+    recent: List[Tuple[str, int, Dict[str, Any]]] = []
+
+    def _bucket(record: Dict[str, Any], counts: WindowCounts) -> Optional[str]:
+        key = normalize_timestamp(record.get("submitted_at"))
+        if key is None or key > now_key or key < month_key:
+            return None
+        counts.month += 1
+        if key >= week_key:
+            counts.week += 1
+        if key >= today_key:
+            counts.today += 1
+            return key
+        return None
+
+    for seq, app in enumerate(applications):
+        key = _bucket(app, report.applications)
+        if key is None:
+            continue
+        if app.get("voice_file_path") or app.get("voice_file_id"):
+            report.today_voices += 1
+        if app.get("voice_skipped", False):
+            report.today_skipped += 1
+        languages[app.get("language")] += 1
+        if recent_limit > 0:
+            # Min-heap of the newest ``recent_limit`` entries; seq breaks timestamp ties
+            entry = (key, seq, app)
+            if len(recent) < recent_limit:
+                heapq.heappush(recent, entry)
+            elif entry[:2] > recent[0][:2]:
+                heapq.heapreplace(recent, entry)
+
+    for message in contacts:
+        _bucket(message, report.contacts)
+
+    report.today_languages = dict(languages)
+    report.recent_today = [app for _, _, app in sorted(recent, key=lambda item: item[:2], reverse=True)]
+    return report
+
+
 class DataStorage:
     """Handles persistence for applications, contact messages, sessions, and metadata."""
 
-    def __init__(self, applications_file: Path, contact_file: Path, sessions_dir: Path) -> None:
+    def __init__(
+        self,
+        applications_file: Path,
+        contact_file: Path,
+        sessions_dir: Path,
+        application_store: Optional[Union[JsonlApplicationStore, SQLiteApplicationStore]] = None,
+        stats_file: Optional[Path] = None,
+        session_flush_delay: float = 0.0,
+        session_store: Optional[SessionStore] = None,
+        session_cache_size: int = 1000,
+        session_cache_ttl: float = 600.0,
+        stats_flush_delay: float = 0.0,
+    ) -> None:
         self._applications_file = applications_file
+        # Pluggable backend for applications (JSONL by default, SQLite when configured)
+        self._applications = application_store or JsonlApplicationStore(applications_file)
         self._contact_file = contact_file
-        self._sessions_dir = sessions_dir
+        # Pluggable session backend (file per user by default, SQLite when configured)
+        self._sessions: SessionStore = session_store or FileSessionStore(sessions_dir)
         self._application_lock = asyncio.Lock()
         self._contact_lock = asyncio.Lock()
-        self._sessions_dir.mkdir(parents=True, exist_ok=True)
+        # Materialized totals for /stats and /gstats, updated on every write and
+        # persisted at most once per stats_flush_delay seconds
+        self._stats_flush_delay = stats_flush_delay
+        self._stats = StatsTracker(
+            stats_file or applications_file.parent / "stats.json",
+            deferred=stats_flush_delay > 0,
+        )
+        self._stats_flush_task: Optional[asyncio.Task] = None
+        # Write-behind session cache: the latest unsaved state per user, flushed in batches
+        self._session_flush_delay = session_flush_delay
+        self._dirty_sessions: Dict[int, Dict[str, Any]] = {}
+        # The batch being written; loads read it until the write has finished
+        self._flushing_sessions: Dict[int, Dict[str, Any]] = {}
+        self._session_flush_task: Optional[asyncio.Task] = None
+        self._session_io_lock = asyncio.Lock()
+        # Hydrated UserSession objects for warm users, kept coherent on save/delete
+        self._session_cache = SessionCache(session_cache_size, session_cache_ttl)
 
     @staticmethod
     def _timestamp() -> str:
@@ -47,7 +361,11 @@ class DataStorage:
             "voice_file_id": voice_file_id,
             "voice_skipped": voice_skipped,
         }
-        await self._append_jsonl(self._applications_file, payload, self._application_lock)
+        async with self._application_lock:
+            inserted = await asyncio.to_thread(self._applications.append, payload)
+            # Saving an application_id again replaces it (SQLite) and is not a new application
+            if inserted:
+                await self._record_stats(self._stats.record_application, payload)
 
     async def save_contact_message(
         self,
@@ -61,189 +379,189 @@ class DataStorage:
             "sender": applicant,
             "message": message,
         }
-        await self._append_jsonl(self._contact_file, payload, self._contact_lock)
-
-    async def _append_jsonl(self, file_path: Path, payload: Dict[str, Any], lock: asyncio.Lock) -> None:
-        async with lock:
-            await asyncio.to_thread(self._write_jsonl, file_path, payload)
+        async with self._contact_lock:
+            await asyncio.to_thread(_write_jsonl, self._contact_file, payload)
+            await self._record_stats(self._stats.record_contact, payload)
 
-    @staticmethod
-    def _write_jsonl(file_path: Path, payload: Dict[str, Any]) -> None:
-        """Write JSONL entry with error handling."""
+    async def _record_stats(self, record: Callable[[Dict[str, Any], date], None], payload: Dict[str, Any]) -> None:
+        """Count a stored record; a failure here must not fail the save that already happened."""
         try:
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            with file_path.open("a", encoding="utf-8") as handle:
-                json.dump(payload, handle, ensure_ascii=False)
-                handle.write("\n")
-        except (OSError, IOError, json.JSONEncodeError) as exc:
-            # Log error but re-raise to be handled by caller
-            logger.error(f"Failed to write JSONL to {file_path}: {exc}", exc_info=True)
-            raise
-
-    def _session_file(self, user_id: int) -> Path:
-        """Get session file path for a user."""
-        return self._sessions_dir / f"session_{user_id}.json"
+            await asyncio.to_thread(record, payload, datetime.now(timezone.utc).date())
+        except Exception as exc:  # pylint: disable=broad-except
+            # The count check at the next start rebuilds the snapshot
+            logger.error(f"Failed to update stats snapshot: {exc}", exc_info=True)
+            return
+        self._schedule_stats_flush()
+
+    def _schedule_stats_flush(self) -> None:
+        if not self._stats.dirty:
+            return
+        if self._stats_flush_task is None or self._stats_flush_task.done():
+            self._stats_flush_task = asyncio.get_running_loop().create_task(self._flush_stats_later())
+
+    async def _flush_stats_later(self) -> None:
+        await asyncio.sleep(self._stats_flush_delay)
+        await asyncio.to_thread(self._stats.flush)
 
     async def save_session(self, user_id: int, session_data: Dict[str, Any]) -> None:
-        """Save user session to disk with error handling."""
-        session_file = self._session_file(user_id)
-        try:
-            await asyncio.to_thread(self._write_session, session_file, session_data)
-        except Exception as exc:
+        """Queue the user's session for a coalesced write.
+
+        Repeated saves within ``session_flush_delay`` seconds only write the
+        latest state. With a delay of 0 the session is written immediately.
+        """
+        # Detach from the live session, whose answers dicts keep changing in place
+        session_data = copy.deepcopy(session_data)
+        self._dirty_sessions[user_id] = session_data
+        self._session_cache.put(user_id, session_data)
+        if self._session_flush_delay <= 0:
+            await self.flush_sessions()
+            return
+        if self._session_flush_task is None or self._session_flush_task.done():
+            self._session_flush_task = asyncio.get_running_loop().create_task(self._flush_sessions_later())
+
+    async def _flush_sessions_later(self) -> None:
+        await asyncio.sleep(self._session_flush_delay)
+        await self.flush_sessions()
+
+    @property
+    def session_cache_stats(self) -> SessionCacheStats:
+        return self._session_cache.stats
+
+    @property
+    def pending_sessions(self) -> int:
+        return len(self._dirty_sessions)
+
+    async def flush_sessions(self) -> int:
+        """Write every pending session in one worker-thread batch. Returns the number written."""
+        async with self._session_io_lock:
+            if not self._dirty_sessions:
+                return 0
+            batch, self._dirty_sessions = self._dirty_sessions, {}
+            self._flushing_sessions = batch
+            try:
+                failed = await asyncio.to_thread(self._sessions.save_many, batch)
+            finally:
+                self._flushing_sessions = {}
+        for user_id, exc in failed.items():
             # Log error but don't crash - session will be lost but bot continues
-            logger.error(f"Failed to save session for user {user_id}: {exc}", exc_info=True)
+            logger.error(f"Failed to save session for user {user_id}: {exc}")
+        return len(batch) - len(failed)
 
-    @staticmethod
-    def _write_session(session_file: Path, session_data: Dict[str, Any]) -> None:
-        """Write session data to file with error handling."""
-        try:
-            session_file.parent.mkdir(parents=True, exist_ok=True)
-            # Use atomic write: write to temp file, then rename
-            temp_file = session_file.with_suffix(session_file.suffix + ".tmp")
-            with temp_file.open("w", encoding="utf-8") as handle:
-                json.dump(session_data, handle, ensure_ascii=False, indent=2)
-            # Atomic rename (works on most filesystems)
-            temp_file.replace(session_file)
-        except (OSError, IOError, json.JSONEncodeError) as exc:
-            # Re-raise to be caught by save_session
-            raise
+    async def close(self) -> None:
+        """Cancel the delayed flushes and write pending sessions and stats (call on shutdown)."""
+        for task in (self._session_flush_task, self._stats_flush_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._session_flush_task = self._stats_flush_task = None
+        await asyncio.to_thread(self._stats.flush)
+        written = await self.flush_sessions()
+        if written:
+            logger.info(f"Flushed {written} pending sessions on shutdown")
+        await asyncio.to_thread(self._sessions.close)
 
     async def load_session(self, user_id: int) -> Optional[Dict[str, Any]]:
-        """Load user session from disk with error handling."""
-        session_file = self._session_file(user_id)
-        if not session_file.exists():
-            return None
+        """Load user session (pending or in-flight state first, then disk) with error handling."""
+        for pending in (self._dirty_sessions, self._flushing_sessions):
+            if user_id in pending:
+                return copy.deepcopy(pending[user_id])
         try:
-            return await asyncio.to_thread(self._read_session, session_file)
+            return await asyncio.to_thread(self._sessions.load, user_id)
         except Exception as exc:
             # Log error but don't crash - session will be lost but bot continues
             logger.warning(f"Failed to load session for user {user_id}: {exc}", exc_info=True)
             return None
 
-    @staticmethod
-    def _read_session(session_file: Path) -> Dict[str, Any]:
-        """Read session data from file with error handling."""
-        try:
-            with session_file.open("r", encoding="utf-8") as handle:
-                return json.load(handle)
-        except (json.JSONDecodeError, IOError, OSError) as exc:
-            # Re-raise to be caught by load_session
-            raise
+    async def load_user_session(self, user_id: int) -> Optional[UserSession]:
+        """Load the user's session as a ``UserSession``, served from the LRU cache when warm.
+
+        The returned object is the caller's own; changing it does not affect the cache.
+        """
+        found, session = self._session_cache.get(user_id)
+        if found:
+            return session
+        session_data = await self.load_session(user_id)
+        session = UserSession.from_dict(session_data) if session_data else None
+        self._session_cache.put(user_id, session_data, session)
+        return session
 
     async def delete_session(self, user_id: int) -> None:
-        """Delete user session file."""
-        session_file = self._session_file(user_id)
-        if session_file.exists():
-            await asyncio.to_thread(session_file.unlink)
+        """Delete the user's stored session and drop any pending write for it."""
+        # Serialize with flushes so an in-flight batch cannot recreate the session
+        async with self._session_io_lock:
+            self._dirty_sessions.pop(user_id, None)
+            self._session_cache.put(user_id, None)
+            await asyncio.to_thread(self._sessions.delete, user_id)
 
     async def get_user_applications(self, user_id: int) -> List[Dict[str, Any]]:
-        """Get all applications submitted by a user."""
-        if not self._applications_file.exists():
-            return []
+        """Get all applications submitted by a user (newest first)."""
         try:
-            return await asyncio.to_thread(self._read_user_applications, self._applications_file, user_id)
+            return await asyncio.to_thread(self._applications.get_by_user, user_id)
         except Exception:
             return []
 
-    @staticmethod
-    def _read_user_applications(applications_file: Path, user_id: int) -> List[Dict[str, Any]]:
-        """Read and filter applications by user ID."""
-        applications = []
-        with applications_file.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    app = json.loads(line)
-                    applicant = app.get("applicant", {})
-                    if applicant.get("telegram_id") == user_id:
-                        applications.append(app)
-                except json.JSONDecodeError:
-                    continue
-        # Sort by submission date (newest first)
-        applications.sort(key=lambda x: x.get("submitted_at", ""), reverse=True)
-        return applications
-    
     async def cleanup_old_sessions(self, days_old: int = 30) -> int:
-        """Clean up session files older than specified days. Returns number of files deleted."""
-        if not self._sessions_dir.exists():
-            return 0
-        
-        from datetime import timedelta
+        """Delete sessions not saved for ``days_old`` days. Returns the number deleted."""
         cutoff_time = (datetime.now(timezone.utc) - timedelta(days=days_old)).timestamp()
-        deleted_count = 0
-        
-        def _cleanup_sessions():
-            nonlocal deleted_count
-            for session_file in self._sessions_dir.glob("session_*.json"):
-                try:
-                    if session_file.stat().st_mtime < cutoff_time:
-                        session_file.unlink()
-                        deleted_count += 1
-                except Exception:
-                    continue
-            return deleted_count
-        
-        return await asyncio.to_thread(_cleanup_sessions)
+        async with self._session_io_lock:
+            self._session_cache.clear()
+            return await asyncio.to_thread(self._sessions.cleanup, cutoff_time)
+
+    async def count_sessions(self) -> int:
+        """Count stored sessions (pending writes are flushed first)."""
+        await self.flush_sessions()
+        try:
+            return await asyncio.to_thread(self._sessions.count)
+        except Exception:
+            return 0
+
+    async def list_session_user_ids(self, limit: Optional[int] = None) -> List[int]:
+        """User ids with a stored session, most recently saved first."""
+        await self.flush_sessions()
+        try:
+            return await asyncio.to_thread(self._sessions.list_user_ids, limit)
+        except Exception:
+            return []
 
     async def get_all_applications(self) -> List[Dict[str, Any]]:
         """Get all applications from storage."""
-        if not self._applications_file.exists():
-            return []
         try:
-            return await asyncio.to_thread(self._read_all_applications, self._applications_file)
+            return await asyncio.to_thread(self._applications.all)
         except Exception:
             return []
 
-    @staticmethod
-    def _read_all_applications(applications_file: Path) -> List[Dict[str, Any]]:
-        """Read all applications from file."""
-        applications = []
-        with applications_file.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    app = json.loads(line)
-                    applications.append(app)
-                except json.JSONDecodeError:
-                    continue
-        # Sort by submission date (newest first)
-        applications.sort(key=lambda x: x.get("submitted_at", ""), reverse=True)
-        return applications
+    async def count_applications(self) -> int:
+        """Count stored applications."""
+        try:
+            return await asyncio.to_thread(self._applications.count)
+        except Exception:
+            return 0
 
     async def get_applications_by_date_range(
         self, start_date: datetime, end_date: datetime
     ) -> List[Dict[str, Any]]:
         """Get applications within a date range."""
-        all_apps = await self.get_all_applications()
-        filtered = []
-        for app in all_apps:
-            submitted_at_str = app.get("submitted_at")
-            if not submitted_at_str:
-                continue
-            try:
-                submitted_at = datetime.fromisoformat(submitted_at_str.replace("Z", "+00:00"))
-                if start_date <= submitted_at <= end_date:
-                    filtered.append(app)
-            except (ValueError, TypeError):
-                continue
-        return filtered
+        try:
+            return await asyncio.to_thread(self._applications.get_range, start_date, end_date)
+        except Exception:
+            return []
 
     async def get_recent_applications(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most recent applications."""
-        all_apps = await self.get_all_applications()
-        return all_apps[:limit]
+        try:
+            return await asyncio.to_thread(self._applications.get_recent, limit)
+        except Exception:
+            return []
 
     async def get_application_by_id(self, application_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific application by ID."""
-        all_apps = await self.get_all_applications()
-        for app in all_apps:
-            if app.get("application_id") == application_id:
-                return app
-        return None
+        try:
+            return await asyncio.to_thread(self._applications.get_by_id, application_id)
+        except Exception:
+            return None
 
     async def get_all_contact_messages(self) -> List[Dict[str, Any]]:
         """Get all contact messages from storage."""
@@ -257,21 +575,74 @@ class DataStorage:
     @staticmethod
     def _read_all_contact_messages(contact_file: Path) -> List[Dict[str, Any]]:
         """Read all contact messages from file."""
-        messages = []
-        with contact_file.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    msg = json.loads(line)
-                    messages.append(msg)
-                except json.JSONDecodeError:
-                    continue
+        messages = _read_jsonl(contact_file)
         # Sort by submission date (newest first)
         messages.sort(key=lambda x: x.get("submitted_at", ""), reverse=True)
         return messages
 
+    def _count_contacts(self) -> int:
+        if not self._contact_file.exists():
+            return 0
+        with self._contact_file.open("r", encoding="utf-8") as handle:
+            return sum(1 for line in handle if line.strip())
+
+    async def count_contact_messages(self) -> int:
+        """Count stored contact messages without parsing them."""
+        try:
+            return await asyncio.to_thread(self._count_contacts)
+        except Exception:
+            return 0
+
+    async def get_stats(self) -> StatsSnapshot:
+        """Return a copy of the materialized stats snapshot.
+
+        The first call verifies the persisted snapshot against the stores (and
+        rebuilds it if needed) in a worker thread. The copy is taken under the
+        tracker's lock, so saves running in other threads cannot change it.
+        """
+        snapshot = await asyncio.to_thread(self._stats.copy)
+        if snapshot is not None:
+            return snapshot
+
+        def _contacts() -> Iterable[Dict[str, Any]]:
+            return _iter_jsonl(self._contact_file) if self._contact_file.exists() else ()
+
+        def _load() -> StatsSnapshot:
+            self._stats.load(
+                self._applications.count(),
+                self._count_contacts(),
+                self._applications.all,
+                _contacts,
+            )
+            return self._stats.copy()
+
+        # Hold both write locks so no save lands between the count check and the rebuild
+        async with self._application_lock, self._contact_lock:
+            try:
+                return await asyncio.to_thread(_load)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error(f"Failed to load stats snapshot: {exc}", exc_info=True)
+                return StatsSnapshot()
+
+    async def get_activity_report(
+        self, now: Optional[datetime] = None, recent_limit: int = 5
+    ) -> ActivityReport:
+        """Aggregate today/7-day/30-day activity in a single pass over each store."""
+        now = now or datetime.now(timezone.utc)
+
+        def _build() -> ActivityReport:
+            month_start = now - timedelta(days=30)
+            contacts = _iter_jsonl(self._contact_file) if self._contact_file.exists() else ()
+            return build_activity_report(
+                self._applications.iter_since(month_start), contacts, now, recent_limit
+            )
+
+        try:
+            return await asyncio.to_thread(_build)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error(f"Failed to build activity report: {exc}", exc_info=True)
+            return ActivityReport(generated_at=now)
+
     async def get_contact_messages_by_date_range(
         self, start_date: datetime, end_date: datetime
     ) -> List[Dict[str, Any]]:
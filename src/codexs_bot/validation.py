@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, Optional, Tuple
+
+from .localization import Question
+
+# Error codes; bot.py maps them to localized messages
+ERROR_TOO_LONG = "too_long"
+ERROR_EMAIL = "email_invalid"
+ERROR_PHONE = "phone_invalid"
+ERROR_LOCATION = "location_invalid"
+ERROR_URL = "url_invalid"
+
+MAX_ANSWER_LENGTH = 1000
+
+# (normalized value, error code or None)
+ValidationResult = Tuple[str, Optional[str]]
+Validator = Callable[[str], ValidationResult]
+
+_EMAIL = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+_PHONE_SEPARATORS = re.compile(r"[\s\-\(\)\+]")
+_PHONE = re.compile(r"^(\+?\d{1,4}[\s\-]?)?\(?\d{1,4}\)?[\s\-]?\d{1,4}[\s\-]?\d{1,9}$")
+_URL = re.compile(r"^(https?://)?([\da-z\.-]+)\.([a-z\.]{2,6})([/\w \.-]*)*/?$", re.IGNORECASE)
+# Portfolio platforms accepted without a full URL
+_PORTFOLIO_HINTS = (
+    "github.com",
+    "behance.net",
+    "dribbble.com",
+    "linkedin.com",
+    "portfolio",
+    "github",
+    "behance",
+    "dribbble",
+)
+
+
+def validate_text(text: str, max_length: int = MAX_ANSWER_LENGTH) -> ValidationResult:
+    value = text.strip()
+    return value, None if len(value) <= max_length else ERROR_TOO_LONG
+
+
+def validate_email(text: str) -> ValidationResult:
+    """Lowercases the domain, which is case-insensitive."""
+    value = text.strip()
+    if not _EMAIL.match(value):
+        return value, ERROR_EMAIL
+    local, _, domain = value.rpartition("@")
+    return f"{local}@{domain.lower()}", None
+
+
+def validate_phone(text: str) -> ValidationResult:
+    """Country code plus 7-15 digits; common separators are allowed."""
+    value = " ".join(text.split())
+    cleaned = _PHONE_SEPARATORS.sub("", value)
+    # With separators gone the pattern only admits digits, so the length is the digit count
+    if not _PHONE.match(cleaned) or not 7 <= len(cleaned) <= 15:
+        return value, ERROR_PHONE
+    return value, None
+
+
+def validate_location(text: str) -> ValidationResult:
+    """City, Country (Timezone) or similar: needs a comma or parentheses."""
+    words = text.split()
+    value = " ".join(words)
+    structured = "," in value or ("(" in value and ")" in value)
+    ok = structured and len(words) >= 2 and len(value) >= 5
+    return value, None if ok else ERROR_LOCATION
+
+
+def validate_url(text: str) -> ValidationResult:
+    """A URL, or a mention of a common portfolio platform."""
+    value = text.strip()
+    lowered = value.lower()
+    if any(hint in lowered for hint in _PORTFOLIO_HINTS) or _URL.match(value):
+        return value, None
+    return value, ERROR_URL
+
+
+VALIDATORS: Dict[str, Validator] = {
+    "text": validate_text,
+    "email": validate_email,
+    "phone": validate_phone,
+    "location": validate_location,
+    "url": validate_url,
+}
+
+# Typed answers to questions with a share button still need checking
+INPUT_TYPE_VALIDATORS: Dict[str, str] = {
+    "contact": "phone",
+    "location": "location",
+}
+
+
+def validator_for(question: Question) -> Optional[Validator]:
+    """The question's own validator, else the one bound to its input type."""
+    name = question.validator or INPUT_TYPE_VALIDATORS.get(question.input_type)
+    return VALIDATORS.get(name) if name else None
+
+
+def validate_answer(question: Question, text: str) -> ValidationResult:
+    """Length-check and then run the question's validator, in one call."""
+    value = text.strip()
+    if len(value) > MAX_ANSWER_LENGTH:
+        return value, ERROR_TOO_LONG
+    validator = validator_for(question) if value else None
+    return validator(value) if validator else (value, None)
@@ -37,3 +37,18 @@ def mock_context():
     context.bot.send_voice = MagicMock()
     return context
 
+
+class FakeClock:
+    """A settable stand-in for ``time.time``/``time.monotonic``."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """A fake clock starting at 1000.0; advance it with ``clock.now += seconds``."""
+    return FakeClock()
@@ -0,0 +1,75 @@
+"""Tests for the pooled, gated OpenAI fallback."""
+import asyncio
+
+import httpx
+
+from codexs_bot.ai import OpenAIFallback
+from codexs_bot.circuit import STATE_OPEN, CircuitBreaker
+from codexs_bot.http_pool import SharedHttpClient
+from codexs_bot.localization import Language
+
+
+def _completion(text="Type /menu to apply.", prompt_tokens=40, completion_tokens=8):
+    return {
+        "choices": [{"message": {"content": text}}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens},
+    }
+
+
+def _responder(handler, **kwargs):
+    http = SharedHttpClient(http2=False, transport=httpx.MockTransport(handler))
+    return OpenAIFallback("sk-test", http=http, **kwargs)
+
+
+async def test_reply_records_latency_and_token_usage():
+    responder = _responder(lambda request: httpx.Response(200, json=_completion()))
+    reply = await responder.generate_reply(Language.EN, "User is at the main menu.", "how do I apply?")
+    assert reply == "Type /menu to apply."
+    assert responder.stats.succeeded == 1
+    assert responder.stats.prompt_tokens == 40
+    assert responder.stats.completion_tokens == 8
+    assert responder.stats.last_latency >= 0
+
+
+async def test_concurrency_is_capped_and_overflow_is_shed():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.1)
+        in_flight -= 1
+        return httpx.Response(200, json=_completion())
+
+    responder = _responder(handler, max_concurrency=2, queue_timeout=0.15)
+    replies = await asyncio.gather(
+        *(responder.generate_reply(Language.EN, "", f"question {n}") for n in range(6))
+    )
+    assert peak == 2
+    # Two rounds of two fit inside the queue timeout; the rest are shed
+    assert replies.count(None) == responder.stats.shed == 2
+
+
+async def test_open_circuit_short_circuits_without_calling_upstream():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    breaker = CircuitBreaker("openai", failure_threshold=2, reset_timeout=60)
+    responder = _responder(handler, breaker=breaker)
+    for _ in range(5):
+        assert await responder.generate_reply(Language.FA, "", "سلام") is None
+    assert len(calls) == 2
+    assert breaker.state == STATE_OPEN
+    assert responder.stats.short_circuited == 3
+    assert responder.stats.failed == 2
+
+
+async def test_disabled_without_api_key():
+    responder = OpenAIFallback(None)
+    assert not responder.enabled
+    assert await responder.generate_reply(Language.EN, "", "hi") is None
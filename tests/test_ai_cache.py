@@ -0,0 +1,102 @@
+"""Tests for the AI fallback reply cache."""
+import asyncio
+
+from codexs_bot import ai_cache as ai_cache_module
+from codexs_bot.ai_cache import AIResponseCache, cache_key
+from codexs_bot.localization import Language
+from codexs_bot.remote_config import RemoteConfig
+
+
+def test_cache_key_normalizes_question_and_hashes_context():
+    key = cache_key(Language.EN, "  How do I APPLY?? ", "User is at the main menu.")
+    assert key == cache_key(Language.EN, "how do i apply", "User is at the main menu.")
+    assert key != cache_key(Language.FA, "how do i apply", "User is at the main menu.")
+    assert key != cache_key(Language.EN, "how do i apply", "User is answering application questions.")
+
+
+async def test_hits_expire_after_ttl_and_lru_evicts(clock):
+    cache = AIResponseCache(max_entries=2, ttl=60, clock=clock)
+    calls = []
+
+    async def create():
+        calls.append(1)
+        return f"reply {len(calls)}"
+
+    key = cache_key(Language.EN, "what roles?", "")
+    assert await cache.get_or_create(key, create) == "reply 1"
+    assert await cache.get_or_create(key, create) == "reply 1"
+    assert cache.stats.hits == 1
+
+    clock.now += 61
+    assert await cache.get_or_create(key, create) == "reply 2"
+
+    cache.put(cache_key(Language.EN, "a", ""), "A")
+    cache.put(cache_key(Language.EN, "b", ""), "B")
+    assert cache.get(key) is None
+    assert cache.stats.evictions == 1
+
+
+async def test_concurrent_identical_questions_share_one_call():
+    cache = AIResponseCache()
+    calls = []
+
+    async def create():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "Tap Apply in the menu."
+
+    key = cache_key(Language.EN, "how do I apply?", "")
+    replies = await asyncio.gather(*(cache.get_or_create(key, create) for _ in range(5)))
+    assert replies == ["Tap Apply in the menu."] * 5
+    assert len(calls) == 1
+    assert cache.stats.coalesced == 4
+
+
+async def test_failed_replies_are_not_cached():
+    cache = AIResponseCache()
+
+    async def create():
+        return None
+
+    key = cache_key(Language.EN, "hello", "")
+    assert await cache.get_or_create(key, create) is None
+    assert len(cache) == 0
+
+
+async def test_remote_config_change_invalidates(monkeypatch):
+    config = RemoteConfig()
+    config.version = "v1"
+    monkeypatch.setattr(ai_cache_module, "remote_config", config)
+    cache = AIResponseCache()
+    key = cache_key(Language.EN, "what roles?", "")
+    cache.put(key, "Designers and engineers.")
+    assert cache.get(key) == "Designers and engineers."
+
+    config.version = "v2"
+    assert cache.get(key) is None
+    assert cache.stats.invalidations == 1
+
+
+def test_persists_across_restarts_for_the_same_config(tmp_path, monkeypatch, clock):
+    config = RemoteConfig()
+    config.version = "v1"
+    monkeypatch.setattr(ai_cache_module, "remote_config", config)
+    path = tmp_path / "ai_cache.json"
+    key = cache_key(Language.FA, "چطور درخواست بدم؟", "ctx")
+
+    cache = AIResponseCache(ttl=60, path=path, clock=clock)
+    cache.put(key, "از منو گزینه درخواست را بزنید.")
+    cache.put(cache_key(Language.EN, "old", ""), "stale")
+    clock.now += 30
+    cache.put(cache_key(Language.EN, "new", ""), "fresh")
+    cache.save()
+
+    clock.now += 40
+    restored = AIResponseCache(ttl=60, path=path, clock=clock)
+    assert restored.load() == 1
+    assert restored.get(cache_key(Language.EN, "new", "")) == "fresh"
+
+    config.version = "v2"
+    again = AIResponseCache(ttl=60, path=path, clock=clock)
+    again.load()
+    assert again.get(cache_key(Language.EN, "new", "")) is None
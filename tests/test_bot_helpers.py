@@ -1,11 +1,17 @@
 """Additional tests for bot helpers and storage utilities."""
-import asyncio
+import json
 from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
 
+import httpx
 import pytest
 
+from codexs_bot.ai import OpenAIFallback
+from codexs_bot.ai_cache import AIResponseCache
 from codexs_bot.bot import (
+    AI_MAX_RESPONSES,
     RATE_LIMIT_MAX_REQUESTS,
+    _maybe_ai_reply,
     _build_edit_summary,
     _check_rate_limit,
     _collapse_intent_token,
@@ -14,13 +20,15 @@ from codexs_bot.bot import (
     _is_back_command,
     _is_menu_command,
     _is_repeat_command,
+    _match_menu_button,
     _normalize_for_intent,
     _validate_and_fix_session_state,
     _validate_location,
     _validate_phone,
     _validate_url,
 )
-from codexs_bot.localization import HIRING_QUESTIONS, Language
+from codexs_bot.http_pool import SharedHttpClient
+from codexs_bot.localization import AI_RATE_LIMIT_MESSAGE, HIRING_QUESTIONS, MENU_LABELS, Language
 from codexs_bot.session import Flow, UserSession
 from codexs_bot.storage import DataStorage
 
@@ -72,12 +80,44 @@ def test_rate_limit_window_reset():
     """Rate limiter should allow up to the configured max, then block."""
     user_id = 999_123
     # Clear any prior state for this user
-    from codexs_bot.bot import _rate_limit_store
+    from codexs_bot.bot import _rate_limiter
 
-    _rate_limit_store.pop(user_id, None)
+    _rate_limiter.reset(user_id)
     for _ in range(RATE_LIMIT_MAX_REQUESTS):
         assert _check_rate_limit(user_id)
     assert not _check_rate_limit(user_id)
+    # Other handlers have their own buckets
+    assert _check_rate_limit(user_id, "command")
+
+
+async def test_cached_ai_replies_skip_the_ai_rate_limit(mock_update, mock_context):
+    """Only questions that reach OpenAI use up the per-user AI allowance."""
+    from codexs_bot.bot import _rate_limiter
+
+    calls = []
+
+    def respond(request):
+        calls.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"Answer {len(calls)}"}}]})
+
+    http = SharedHttpClient(http2=False, transport=httpx.MockTransport(respond))
+    mock_context.application.bot_data["ai_responder"] = OpenAIFallback("sk-test", http=http)
+    mock_context.application.bot_data["ai_cache"] = AIResponseCache()
+    mock_update.message.reply_text = AsyncMock()
+    session = UserSession(language=Language.EN)
+    _rate_limiter.reset(mock_update.effective_user.id)
+
+    for n in range(AI_MAX_RESPONSES):
+        assert await _maybe_ai_reply(mock_update, mock_context, session, f"question {n}?")
+    for _ in range(3):
+        assert await _maybe_ai_reply(mock_update, mock_context, session, "question 0?")
+    assert len(calls) == AI_MAX_RESPONSES
+    assert mock_update.message.reply_text.await_args.args[0] == "Answer 1"
+
+    assert await _maybe_ai_reply(mock_update, mock_context, session, "something new?")
+    assert mock_update.message.reply_text.await_args.args[0] == AI_RATE_LIMIT_MESSAGE[Language.EN]
+    assert len(calls) == AI_MAX_RESPONSES
+    await http.aclose()
 
 
 def test_validate_and_fix_session_state():
@@ -167,3 +207,34 @@ async def test_storage_sessions_roundtrip(tmp_path):
     # Ensure cleanup_old_sessions doesn't error when directory is empty
     deleted = await storage.cleanup_old_sessions(days_old=0)
     assert deleted >= 0
+
+
+@pytest.mark.asyncio
+async def test_storage_sessions_write_behind(tmp_path):
+    """Repeated saves are coalesced in memory and flushed on close."""
+    storage = DataStorage(
+        applications_file=tmp_path / "applications.jsonl",
+        contact_file=tmp_path / "contacts.jsonl",
+        sessions_dir=tmp_path / "sessions",
+        session_flush_delay=60,
+    )
+    session_file = tmp_path / "sessions" / "session_7.json"
+    for step in range(3):
+        await storage.save_session(7, {"step": step})
+    await storage.save_session(8, {"step": 0})
+    assert not session_file.exists()
+    assert storage.pending_sessions == 2
+    assert await storage.load_session(7) == {"step": 2}
+
+    await storage.delete_session(8)
+    await storage.close()
+    assert storage.pending_sessions == 0
+    assert json.loads(session_file.read_text(encoding="utf-8")) == {"step": 2}
+    assert not (tmp_path / "sessions" / "session_8.json").exists()
+
+
+def test_static_menu_labels_resolve_per_language():
+    for key, labels in MENU_LABELS.items():
+        assert _match_menu_button(labels[Language.EN], Language.EN) == key
+        assert _match_menu_button(labels[Language.FA], Language.FA) == key
+    assert _match_menu_button(MENU_LABELS["apply"][Language.FA], Language.EN) is None
@@ -0,0 +1,62 @@
+"""Tests for the compiled intent matcher."""
+from codexs_bot.intents import (
+    DEFAULT_INTENTS,
+    AhoCorasick,
+    IntentEngine,
+    intent_engine,
+    is_no,
+    is_skip,
+    is_yes,
+)
+from codexs_bot.localization import NO_LABEL, SKIP_LABEL, YES_LABEL, Language
+
+
+def test_automaton_finds_overlapping_patterns():
+    automaton = AhoCorasick([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+    assert sorted(automaton.iter_matches("ushers")) == [1, 2, 4]
+    assert list(automaton.iter_matches("xyz")) == []
+
+
+def test_one_analysis_answers_every_check():
+    result = intent_engine.analyze("What about a job? Apply as a career move", Language.EN)
+    assert result.best("menu_topic") == "apply"
+    assert result.has("question")
+    assert not result.has("menu")
+    assert intent_engine.analyze("Main Menu!", Language.EN).best() == "menu"
+
+
+def test_topics_are_ranked_by_keyword_hits():
+    # One "contact" keyword, two "updates" keywords
+    result = intent_engine.analyze("message me the latest news", Language.EN)
+    assert [match.intent for match in result.matches if match.group == "menu_topic"] == ["updates", "contact"]
+
+
+def test_answers_and_labels():
+    assert is_yes("Yeah!", Language.EN)
+    assert is_yes(YES_LABEL[Language.FA], Language.FA)
+    assert is_no(NO_LABEL[Language.EN], Language.EN)
+    assert is_no("نه", Language.FA)
+    assert is_skip("not now", Language.EN)
+    assert not is_yes("yes please tell me more", Language.EN)
+
+
+def test_rebuild_applies_remote_keywords():
+    engine = IntentEngine(DEFAULT_INTENTS)
+    assert engine.analyze("vacancies", Language.EN).best("menu_topic") is None
+    engine.rebuild({"apply": {"en": ["vacanc"]}, "unknown": {"en": ["x"]}})
+    assert engine.analyze("vacancies", Language.EN).best("menu_topic") == "apply"
+    # Languages without overrides keep their defaults
+    assert engine.analyze("استخدام", Language.FA).best("menu_topic") == "apply"
+
+
+def test_answer_buttons_survive_keyword_overrides():
+    engine = IntentEngine(DEFAULT_INTENTS)
+    engine.rebuild({"yes": {"en": ["yup"], "fa": ["حتما"]}, "no": {"en": ["nope"]}, "skip": {"en": ["pass"]}})
+    assert engine.analyze("yup", Language.EN).has("yes")
+    # The keyboard buttons still work after their keyword lists were replaced
+    assert engine.analyze(YES_LABEL[Language.EN], Language.EN).has("yes")
+    assert engine.analyze(YES_LABEL[Language.FA], Language.FA).has("yes")
+    assert engine.analyze(NO_LABEL[Language.EN], Language.EN).has("no")
+    assert engine.analyze(SKIP_LABEL[Language.EN], Language.EN).has("skip")
+    # Replaced keywords are gone
+    assert not engine.analyze("yeah", Language.EN).has("yes")
@@ -0,0 +1,32 @@
+"""Tests for the versioned keyboard cache."""
+from codexs_bot.keyboards import KeyboardCache, LAYOUTS, keyboards
+from codexs_bot.localization import BACK_TO_MENU, Language, main_menu_labels
+from codexs_bot.remote_config import remote_config
+
+
+def test_markup_is_built_once_and_shared():
+    cache = KeyboardCache(LAYOUTS)
+    first = cache.get("yes_no", Language.EN)
+    assert cache.get("yes_no", Language.EN) is first
+    assert cache.get("yes_no", Language.FA) is not first
+    assert cache.get("share_contact", Language.EN, one_time=True).one_time_keyboard
+
+
+def test_menu_rebuilds_when_config_version_changes(monkeypatch):
+    cache = KeyboardCache(LAYOUTS)
+    static_menu = cache.get("menu", Language.EN)
+    assert [[button.text for button in row] for row in static_menu.keyboard] == main_menu_labels(Language.EN)
+
+    monkeypatch.setattr(remote_config, "menu_buttons", [{"en_text": "Jobs", "emoji": "💼", "order_index": 1}])
+    monkeypatch.setattr(remote_config, "version", "v2")
+    remote_menu = cache.get("menu", Language.EN)
+    assert remote_menu is not static_menu
+    assert remote_menu.keyboard[0][0].text == "💼 Jobs"
+    assert cache.get("menu", Language.EN) is remote_menu
+
+
+def test_with_back_appends_back_row():
+    markup = keyboards.with_back([["A", "B"]], Language.EN)
+    assert [[button.text for button in row] for row in markup.keyboard] == [["A", "B"], [BACK_TO_MENU[Language.EN]]]
+    assert keyboards.with_back([["A", "B"]], Language.EN) is markup
+    assert keyboards.with_back(None, Language.EN) is keyboards.get("back", Language.EN)
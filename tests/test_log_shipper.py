@@ -0,0 +1,106 @@
+"""Tests for the batched conversation-log shipper."""
+import asyncio
+
+import pytest
+
+from codexs_bot.log_shipper import LogShipper
+
+
+@pytest.mark.asyncio
+async def test_flushes_full_batches_without_waiting_for_timer():
+    batches = []
+
+    async def send(batch):
+        batches.append([event["n"] for event in batch])
+
+    shipper = LogShipper(send, batch_size=3, flush_interval=60)
+    for n in range(3):
+        await shipper.put({"n": n})
+    await asyncio.sleep(0.01)
+
+    assert batches == [[0, 1, 2]]
+    assert shipper.stats.sent == 3
+    await shipper.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_ships_partial_batch():
+    batches = []
+
+    async def send(batch):
+        batches.append(len(batch))
+
+    shipper = LogShipper(send, batch_size=10, flush_interval=60)
+    await shipper.put({"n": 1})
+    await shipper.put({"n": 2})
+    await shipper.stop()
+
+    assert batches == [2]
+    assert shipper.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_when_queue_is_full():
+    batches = []
+
+    async def send(batch):
+        batches.append([event["n"] for event in batch])
+
+    shipper = LogShipper(send, max_queue=2, batch_size=10, flush_interval=60)
+    for n in range(4):
+        shipper.put_nowait({"n": n})
+
+    assert shipper.stats.dropped == 2
+    await shipper.stop()
+    assert batches == [[2, 3]]
+    assert shipper.stats.queued == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_counted():
+    async def send(batch):
+        raise RuntimeError("boom")
+
+    shipper = LogShipper(send, batch_size=2, flush_interval=60)
+    await shipper.put({"n": 1})
+    await shipper.stop()
+
+    assert shipper.stats.failed == 1
+    assert shipper.stats.sent == 0
+
+
+@pytest.mark.asyncio
+async def test_partially_accepted_batches_count_per_event():
+    async def send(batch):
+        return [event["n"] != 2 for event in batch]
+
+    shipper = LogShipper(send, batch_size=3, flush_interval=60)
+    for n in range(3):
+        shipper.put_nowait({"n": n})
+    await shipper.stop()
+
+    assert (shipper.stats.sent, shipper.stats.failed) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_room():
+    release = asyncio.Event()
+    shipped = []
+
+    async def send(batch):
+        await release.wait()
+        shipped.extend(batch)
+
+    shipper = LogShipper(send, max_queue=1, batch_size=1, flush_interval=60, overflow="block")
+    await shipper.put({"n": 1})
+    await asyncio.sleep(0.01)  # flusher picks up event 1 and blocks in send
+    await shipper.put({"n": 2})
+    producer = asyncio.create_task(shipper.put({"n": 3}))
+    await asyncio.sleep(0.01)
+    assert not producer.done()
+
+    release.set()
+    await asyncio.wait_for(producer, timeout=1)
+    await shipper.stop()
+    assert [event["n"] for event in shipped] == [1, 2, 3]
+    assert shipper.stats.dropped == 0
@@ -0,0 +1,137 @@
+"""Tests for the pooled, circuit-broken webhook notifier."""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from codexs_bot.circuit import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+from codexs_bot.http_pool import SharedHttpClient
+from codexs_bot.notifications import WebhookNotifier
+from codexs_bot.outbox import PermanentDeliveryError
+
+URL = "https://hooks.example.test/app"
+
+
+def _notifier(respond, **kwargs):
+    http = SharedHttpClient(http2=False, transport=httpx.MockTransport(respond))
+    return WebhookNotifier(URL, "secret", "application", http=http, **kwargs)
+
+
+def test_circuit_opens_probes_and_closes(clock):
+    breaker = CircuitBreaker("hook", failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow()
+
+    clock.now += 10
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow()
+    # Only one probe at a time
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.stats.opened == 2
+    assert breaker.stats.rejected == 2
+
+
+async def test_notifier_reports_outcome_and_sends_idempotency_key():
+    seen = []
+
+    def respond(request):
+        seen.append((request.headers.get("Idempotency-Key"), request.headers.get("Authorization")))
+        return httpx.Response(500 if len(seen) == 1 else 200)
+
+    notifier = _notifier(respond)
+    assert not await notifier.post({"a": 1}, idempotency_key="webhook:APP-4")
+    assert await notifier.post({"a": 1}, idempotency_key="webhook:APP-4")
+    assert seen == [("webhook:APP-4", "Bearer secret")] * 2
+    assert await WebhookNotifier(None, None, "application").post({})
+
+
+async def test_notifier_fails_fast_while_circuit_is_open(clock):
+    calls = []
+
+    def respond(request):
+        calls.append(request)
+        raise httpx.ConnectError("refused")
+
+    breaker = CircuitBreaker("hook", failure_threshold=3, reset_timeout=30, clock=clock)
+    notifier = _notifier(respond, breaker=breaker)
+    results = [await notifier.post({"n": n}) for n in range(10)]
+    assert results == [False] * 10
+    assert len(calls) == 3
+    assert breaker.stats.rejected == 7
+
+
+async def test_client_errors_do_not_trip_the_circuit():
+    notifier = _notifier(lambda request: httpx.Response(422), breaker=CircuitBreaker("hook", failure_threshold=1))
+    assert not await notifier.post({"bad": True})
+    assert notifier.breaker.state == STATE_CLOSED
+
+
+async def test_permanent_rejections_raise_when_asked():
+    statuses = [422, 429]
+    notifier = _notifier(lambda request: httpx.Response(statuses.pop(0)))
+    with pytest.raises(PermanentDeliveryError, match="HTTP 422"):
+        await notifier.post({"bad": True}, raise_on_reject=True)
+    # Rate limiting is worth retrying
+    assert not await notifier.post({"bad": True}, raise_on_reject=True)
+
+
+async def test_batched_mode_posts_arrays():
+    bodies = []
+
+    def respond(request):
+        bodies.append((json.loads(request.content), request.headers.get("Idempotency-Key")))
+        return httpx.Response(200)
+
+    notifier = _notifier(respond, batch_size=3, batch_interval=0.05)
+    full = await asyncio.gather(*(notifier.post({"n": n}, idempotency_key=f"k{n}") for n in range(3)))
+    assert full == [True, True, True]
+    assert bodies == [([{"n": 0}, {"n": 1}, {"n": 2}], "k0,k1,k2")]
+
+    # A partial batch goes out after the interval
+    assert await notifier.post({"n": 3})
+    assert bodies[-1] == ([{"n": 3}], None)
+
+
+async def test_rejected_batch_is_narrowed_to_the_bad_payload():
+    bodies = []
+
+    def respond(request):
+        body = json.loads(request.content)
+        bodies.append(body)
+        bad = body == {"n": 1} or (isinstance(body, list) and {"n": 1} in body)
+        return httpx.Response(422 if bad else 200)
+
+    notifier = _notifier(respond, batch_size=3, batch_interval=60)
+    results = await asyncio.gather(
+        *(notifier.post({"n": n}, idempotency_key=f"k{n}", raise_on_reject=True) for n in range(3)),
+        return_exceptions=True,
+    )
+    assert results[0] is True and results[2] is True
+    assert isinstance(results[1], PermanentDeliveryError)
+    assert len(bodies) == 4
+
+
+async def test_aclose_flushes_buffered_payloads():
+    bodies = []
+
+    def respond(request):
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200)
+
+    notifier = _notifier(respond, batch_size=10, batch_interval=60)
+    pending = asyncio.ensure_future(notifier.post({"n": 1}))
+    await asyncio.sleep(0)
+    await notifier.aclose()
+    assert await pending
+    assert bodies == [[{"n": 1}]]
@@ -0,0 +1,184 @@
+"""Tests for concurrent outbound delivery with batched acks."""
+import asyncio
+import json
+
+import httpx
+
+from codexs_bot.http_pool import SharedHttpClient
+from codexs_bot.outbound import AdaptivePollSchedule, OutboundDelivery
+
+ENDPOINT = "https://example.test/functions/v1/bot-outbound"
+
+
+class FakeBot:
+    def __init__(self, fail_chat_ids=(), delay=0.0):
+        self.sent = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._fail_chat_ids = set(fail_chat_ids)
+        self._delay = delay
+
+    async def send_message(self, chat_id, text, rate_limit_args=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay)
+            if chat_id in self._fail_chat_ids:
+                raise RuntimeError("blocked by user")
+            self.sent.append((chat_id, text))
+        finally:
+            self.in_flight -= 1
+
+
+def _messages(ids):
+    return [{"id": f"m{i}", "telegram_user_id": str(i), "message_text": f"hello {i}"} for i in ids]
+
+
+def _server(pages, ack_status=200, acks=None):
+    """Serve ``pages`` linked by ``next_cursor`` and record posted ack bodies."""
+    acks = [] if acks is None else acks
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/ack"):
+            acks.append(json.loads(request.content))
+            return httpx.Response(ack_status)
+        index = int(request.url.params.get("cursor", 0))
+        body = {"messages": pages[index]}
+        if index + 1 < len(pages):
+            body["next_cursor"] = str(index + 1)
+        return httpx.Response(200, json=body)
+
+    return SharedHttpClient(transport=httpx.MockTransport(handler)), acks
+
+
+async def test_sends_concurrently_and_acks_once_per_cycle():
+    pool, acks = _server([_messages(range(1, 11)), _messages(range(11, 21))])
+    bot = FakeBot(fail_chat_ids={5}, delay=0.01)
+    delivery = OutboundDelivery(bot, pool, ENDPOINT, {}, concurrency=4)
+
+    cycle = await delivery.run_once()
+
+    assert cycle.fetched == 20
+    assert cycle.sent == 19 and cycle.failed == 1
+    assert 1 < bot.max_in_flight <= 4
+    assert len(acks) == 1
+    statuses = {ack["message_id"]: ack["status"] for ack in acks[0]["acks"]}
+    assert len(statuses) == 20
+    assert statuses["m5"] == "failed"
+    await pool.aclose()
+
+
+async def test_messages_to_one_chat_keep_their_order():
+    class SlowFirstBot(FakeBot):
+        async def send_message(self, chat_id, text, rate_limit_args=None):
+            if text == "first":
+                await asyncio.sleep(0.05)
+            await super().send_message(chat_id, text, rate_limit_args)
+
+    page = [
+        {"id": "m1", "telegram_user_id": "7", "message_text": "first"},
+        {"id": "m2", "telegram_user_id": "7", "message_text": "second"},
+        {"id": "m3", "telegram_user_id": "8", "message_text": "other chat"},
+    ]
+    pool, _ = _server([page])
+    bot = SlowFirstBot()
+    delivery = OutboundDelivery(bot, pool, ENDPOINT, {}, concurrency=4)
+
+    cycle = await delivery.run_once()
+
+    assert cycle.sent == 3
+    # The other chat is not held up by chat 7's slow first message
+    assert bot.sent == [(8, "other chat"), (7, "first"), (7, "second")]
+    await pool.aclose()
+
+
+async def test_duplicate_ids_across_pages_are_sent_once():
+    pool, acks = _server([_messages([1, 2]), _messages([2, 3])])
+    bot = FakeBot()
+    delivery = OutboundDelivery(bot, pool, ENDPOINT, {})
+
+    cycle = await delivery.run_once()
+
+    assert sorted(chat_id for chat_id, _ in bot.sent) == [1, 2, 3]
+    assert cycle.skipped == 1
+    await pool.aclose()
+
+
+async def test_failed_acks_are_retried_without_resending():
+    acks = []
+    pool, _ = _server([_messages([1])], ack_status=500, acks=acks)
+    bot = FakeBot()
+    delivery = OutboundDelivery(bot, pool, ENDPOINT, {})
+
+    await delivery.run_once()
+    assert delivery.unacked == 1
+
+    # The server still lists the message because it was never acknowledged
+    await delivery.run_once()
+    assert len(bot.sent) == 1
+    assert len(acks) == 2
+    await pool.aclose()
+
+
+async def test_falls_back_to_single_acks_when_batches_are_rejected():
+    acks = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/ack"):
+            body = json.loads(request.content)
+            acks.append(body)
+            return httpx.Response(400 if "acks" in body else 200)
+        return httpx.Response(200, json={"messages": _messages([1, 2])})
+
+    pool = SharedHttpClient(transport=httpx.MockTransport(handler))
+    delivery = OutboundDelivery(FakeBot(), pool, ENDPOINT, {})
+
+    cycle = await delivery.run_once()
+
+    assert cycle.acked == 2
+    assert sorted(ack["message_id"] for ack in acks[1:]) == ["m1", "m2"]
+    await pool.aclose()
+
+
+def test_poll_schedule_backs_off_and_resets():
+    schedule = AdaptivePollSchedule(min_interval=2, max_interval=10)
+    assert [schedule.record(False) for _ in range(4)] == [4, 8, 10, 10]
+    assert schedule.record(True) == 2
+
+
+async def test_empty_polls_back_off():
+    pool, _ = _server([[]])
+    delivery = OutboundDelivery(FakeBot(), pool, ENDPOINT, {}, schedule=AdaptivePollSchedule(1, 30))
+
+    await delivery.run_once()
+    first = delivery.next_delay
+    await delivery.run_once()
+    assert delivery.next_delay > first
+    await pool.aclose()
+
+
+async def test_long_poll_is_held_open_and_repolled_immediately():
+    waits = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        waits.append(request.url.params.get("wait"))
+        # Stand-in for an endpoint that holds the request until the wait expires
+        await asyncio.sleep(float(request.url.params["wait"]))
+        return httpx.Response(200, json={"messages": []})
+
+    pool = SharedHttpClient(transport=httpx.MockTransport(handler))
+    delivery = OutboundDelivery(FakeBot(), pool, ENDPOINT, {}, long_poll=0.05)
+
+    await delivery.run_once()
+    assert waits == ["0.05"]
+    assert delivery.next_delay == 0
+    await pool.aclose()
+
+
+async def test_long_poll_falls_back_to_backoff_when_not_held():
+    pool, _ = _server([[]])
+    delivery = OutboundDelivery(FakeBot(), pool, ENDPOINT, {}, long_poll=5)
+
+    await delivery.run_once()
+    assert delivery.next_delay > 0
+    await pool.aclose()
@@ -0,0 +1,140 @@
+"""Tests for the durable delivery outbox and its retry worker."""
+import sqlite3
+
+from codexs_bot.outbox import Outbox, OutboxWorker, PermanentDeliveryError
+
+
+def test_outbox_dedups_keys_and_tracks_pending(tmp_path, clock):
+    outbox = Outbox(tmp_path / "outbox.db", clock=clock)
+    assert outbox.add("supabase:APP-1", "supabase", {"application_id": "APP-1"})
+    assert not outbox.add("supabase:APP-1", "supabase", {"application_id": "APP-1"})
+    clock.now += 5
+    outbox.add("webhook:APP-1", "webhook", {"x": 1}, lease=30)
+
+    assert [entry.key for entry in outbox.due()] == ["supabase:APP-1"]
+    summary = outbox.summary()
+    assert summary.depth == 2
+    assert summary.oldest_created_at == 1000.0
+    assert summary.by_kind == {"supabase": 1, "webhook": 1}
+
+    outbox.complete("supabase:APP-1")
+    # Delivered keys are remembered, so they are not queued again
+    assert not outbox.add("supabase:APP-1", "supabase", {})
+    assert outbox.summary().depth == 1
+    clock.now += 8 * 24 * 3600
+    assert outbox.prune(7 * 24 * 3600) == 1
+    outbox.close()
+
+
+def test_outbox_survives_reopen(tmp_path):
+    outbox = Outbox(tmp_path / "outbox.db")
+    outbox.add("webhook:APP-2", "webhook", {"full_name": "Sara"})
+    outbox.close()
+
+    reopened = Outbox(tmp_path / "outbox.db")
+    entry = reopened.get("webhook:APP-2")
+    assert entry.payload == {"full_name": "Sara"}
+    assert [item.key for item in reopened.due()] == ["webhook:APP-2"]
+    reopened.close()
+
+
+def test_backoff_is_exponential_capped_and_jittered(tmp_path):
+    outbox = Outbox(tmp_path / "outbox.db")
+    worker = OutboxWorker(outbox, {}, base_delay=10, max_delay=100, rng=lambda: 1.0)
+    assert [worker.backoff(n) for n in (1, 2, 3, 4, 5)] == [10, 20, 40, 80, 100]
+    low = OutboxWorker(outbox, {}, base_delay=10, max_delay=100, rng=lambda: 0.0)
+    assert low.backoff(2) == 10
+    outbox.close()
+
+
+async def test_worker_defers_failures_and_retries_until_delivered(tmp_path):
+    outbox = Outbox(tmp_path / "outbox.db")
+    calls = []
+    outcomes = [False, RuntimeError("503"), True]
+
+    async def handler(payload, key):
+        calls.append((key, payload))
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    worker = OutboxWorker(outbox, {"supabase": handler}, base_delay=0, rng=lambda: 0.0)
+    assert not await worker.submit("supabase:APP-3", "supabase", {"id": 3})
+    assert outbox.get("supabase:APP-3").attempts == 1
+
+    assert await worker.run_once() == 0
+    entry = outbox.get("supabase:APP-3")
+    assert entry.attempts == 2
+    assert entry.last_error == "503"
+
+    assert await worker.run_once() == 1
+    assert outbox.summary().depth == 0
+    assert calls == [("supabase:APP-3", {"id": 3})] * 3
+    assert worker.stats.delivered == 1
+    assert worker.stats.deferred == 2
+
+    # Submitting the same application again is a no-op
+    assert not await worker.submit("supabase:APP-3", "supabase", {"id": 3})
+    assert worker.stats.duplicates == 1
+    assert len(calls) == 3
+    outbox.close()
+
+
+async def test_rejected_and_exhausted_entries_become_dead_letters(tmp_path):
+    outbox = Outbox(tmp_path / "outbox.db")
+    calls = []
+
+    async def reject(payload, key):
+        calls.append(key)
+        raise PermanentDeliveryError("webhook rejected payload: HTTP 422")
+
+    async def unavailable(payload, key):
+        calls.append(key)
+        return False
+
+    worker = OutboxWorker(
+        outbox,
+        {"webhook": reject, "supabase": unavailable},
+        base_delay=0,
+        max_attempts=2,
+        rng=lambda: 0.0,
+    )
+    assert not await worker.submit("webhook:APP-5", "webhook", {"id": 5})
+    assert not await worker.submit("supabase:APP-5", "supabase", {"id": 5})
+    assert outbox.summary().depth == 1
+
+    # The second failure uses up max_attempts; neither entry is retried again
+    await worker.run_once()
+    await worker.run_once()
+    assert calls == ["webhook:APP-5", "supabase:APP-5", "supabase:APP-5"]
+
+    summary = outbox.summary()
+    assert summary.depth == 0
+    assert summary.dead == 2
+    assert worker.stats.dead == 2
+    dead = {entry.key: entry for entry in outbox.dead_letters()}
+    assert dead["webhook:APP-5"].last_error == "webhook rejected payload: HTTP 422"
+    assert dead["supabase:APP-5"].attempts == 2
+    # Dead keys still block a duplicate submission
+    assert not await worker.submit("webhook:APP-5", "webhook", {"id": 5})
+    outbox.close()
+
+
+def test_outbox_adds_dead_letter_column_to_old_files(tmp_path):
+    path = tmp_path / "outbox.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE outbox (key TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, "
+        "attempts INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, next_attempt_at REAL NOT NULL, "
+        "delivered_at REAL, last_error TEXT)"
+    )
+    conn.execute("INSERT INTO outbox (key, kind, payload, created_at, next_attempt_at) VALUES ('k', 'webhook', '{}', 0, 0)")
+    conn.commit()
+    conn.close()
+
+    outbox = Outbox(path)
+    assert [entry.key for entry in outbox.due()] == ["k"]
+    outbox.kill("k", "rejected")
+    assert outbox.summary().dead == 1
+    outbox.close()
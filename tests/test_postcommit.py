@@ -0,0 +1,66 @@
+"""Tests for the post-commit background pipeline."""
+import asyncio
+import time
+
+from codexs_bot.postcommit import PostCommitPipeline
+
+
+async def test_stages_run_concurrently_and_are_timed():
+    pipeline = PostCommitPipeline()
+    order = []
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        order.append("slow")
+
+    async def fast():
+        order.append("fast")
+
+    started = time.monotonic()
+    timings = await pipeline.submit("APP-1", {"a": slow, "b": slow, "c": fast})
+    assert time.monotonic() - started < 0.09
+    assert order[0] == "fast"
+    assert set(timings) == {"a", "b", "c"}
+    assert timings["a"] >= 0.04
+    assert pipeline.stats["a"].runs == 1
+    assert pipeline.pending == 0
+
+
+async def test_failing_stage_does_not_affect_others():
+    pipeline = PostCommitPipeline(stage_timeout=0.05)
+    done = []
+
+    async def boom():
+        raise RuntimeError("webhook down")
+
+    async def hang():
+        await asyncio.sleep(1)
+
+    async def ok():
+        done.append("ok")
+
+    await pipeline.submit("APP-2", {"webhook": boom, "supabase": hang, "group": ok})
+    assert done == ["ok"]
+    assert pipeline.stats["webhook"].failures == 1
+    assert pipeline.stats["supabase"].timeouts == 1
+    assert pipeline.stats["group"].failures == 0
+
+
+async def test_drain_waits_then_cancels_stragglers():
+    pipeline = PostCommitPipeline()
+    finished = []
+
+    async def quick():
+        await asyncio.sleep(0.01)
+        finished.append("quick")
+
+    async def stuck():
+        await asyncio.sleep(10)
+
+    pipeline.submit("APP-3", {"quick": quick})
+    pipeline.submit("APP-4", {"stuck": stuck})
+    assert pipeline.pending == 2
+    cancelled = await pipeline.drain(timeout=0.1)
+    assert finished == ["quick"]
+    assert cancelled == 1
+    assert pipeline.pending == 0
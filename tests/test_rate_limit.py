@@ -0,0 +1,42 @@
+"""Tests for the token-bucket rate limiter."""
+from codexs_bot.rate_limit import RateLimiter, RateLimitPolicy
+
+
+def test_bucket_refills_over_time(clock):
+    limiter = RateLimiter({"text": RateLimitPolicy.per_window(2, 60)}, clock=clock)
+    assert limiter.allow("text", 1)
+    assert limiter.allow("text", 1)
+    assert not limiter.allow("text", 1)
+    assert limiter.retry_after("text", 1) == 30.0
+
+    clock.now += 30
+    assert limiter.allow("text", 1)
+    assert not limiter.allow("text", 1)
+
+
+def test_policies_are_independent_and_refund_restores_tokens(clock):
+    limiter = RateLimiter(
+        {"text": RateLimitPolicy.per_window(1, 60), "ai": RateLimitPolicy.per_window(1, 600)},
+        clock=clock,
+    )
+    assert limiter.allow("text", 1)
+    assert limiter.allow("ai", 1)
+    assert not limiter.allow("ai", 1)
+    limiter.refund("ai", 1)
+    assert limiter.allow("ai", 1)
+    assert not limiter.allow("text", 1)
+
+
+def test_idle_buckets_are_evicted(clock):
+    limiter = RateLimiter({"text": RateLimitPolicy.per_window(5, 60)}, sweep_interval=10, clock=clock)
+    for user_id in range(100):
+        limiter.allow("text", user_id)
+    assert len(limiter) == 100
+
+    # After a full refill period every bucket equals a fresh one and is dropped
+    clock.now += 60
+    assert limiter.allow("text", 1)
+    assert len(limiter) == 1
+
+    limiter.reset()
+    assert len(limiter) == 0
@@ -1,5 +1,5 @@
 from codexs_bot.localization import Language, main_menu_labels
-from codexs_bot.remote_config import RemoteConfig, default_menu_rows
+from codexs_bot.remote_config import RemoteConfig, config_fingerprint, default_menu_rows
 
 
 def _sample_payload():
@@ -79,3 +79,49 @@ def test_default_menu_rows_falls_back_to_static_labels():
     fallback = main_menu_labels(Language.EN)
     assert default_menu_rows(Language.EN) == fallback
 
+
+
+def test_update_reports_only_changed_entries():
+    rc = RemoteConfig()
+    first = rc.update_from_payload(_sample_payload())
+    assert first.questions == {"full_name"}
+    assert first.content == {"about", "welcome"}
+
+    # Same config with a new fetch stamp is not a change
+    same = _sample_payload()
+    same["fetched_at"] = "2025-01-02T00:00:00Z"
+    assert rc.update_from_payload(same).empty
+    assert rc.last_refresh == "2025-01-02T00:00:00Z"
+
+    edited = _sample_payload()
+    edited["content"]["about"]["en_body"] = "New about"
+    edited["settings"] = {"bot_name": "Codexs AI"}
+    version = rc.version
+    diff = rc.update_from_payload(edited)
+    assert diff.content == {"about"}
+    assert diff.questions == set() and diff.flows == set()
+    assert diff.sections == {"settings"}
+    assert rc.version != version
+    assert rc.get_content_text("about", Language.EN) == "New about"
+
+
+def test_fingerprint_ignores_key_order_and_fetch_stamp():
+    payload = _sample_payload()
+    reordered = dict(reversed(list(payload.items())))
+    reordered["fetched_at"] = "later"
+    assert config_fingerprint(payload) == config_fingerprint(reordered)
+
+
+def test_menu_lookup_uses_label_index():
+    rc = RemoteConfig()
+    rc.update_from_payload(_sample_payload())
+    assert rc.find_menu_button("  💼 Apply Now ", Language.EN)["button_key"] == "apply"
+    # Plain text without the emoji, in either language, resolves too
+    assert rc.find_menu_button("ارسال درخواست", Language.EN)["button_key"] == "apply"
+    assert rc.find_menu_button("About Codexs", Language.FA)["button_key"] == "about"
+    assert rc.find_menu_button("Something else", Language.EN) is None
+
+    payload = _sample_payload()
+    payload["menu_buttons"] = payload["menu_buttons"][1:]
+    rc.update_from_payload(payload)
+    assert rc.find_menu_button("💼 Apply Now", Language.EN) is None
@@ -0,0 +1,79 @@
+"""Tests for the outbound Telegram send scheduler."""
+import asyncio
+
+import pytest
+from telegram.error import RetryAfter
+
+from codexs_bot.send_scheduler import PRIORITY_BROADCAST, PRIORITY_REPLY, SendScheduler
+
+
+def _send(scheduler, chat_id, log, label, priority=None):
+    async def callback():
+        log.append(label)
+        return True
+
+    return scheduler.process_request(callback, (), {}, "sendMessage", {"chat_id": chat_id}, priority)
+
+
+async def test_replies_jump_ahead_of_broadcasts_when_throttled():
+    scheduler = SendScheduler(global_per_second=20)
+    log = []
+    # Drain the global burst allowance
+    await asyncio.gather(*(_send(scheduler, chat_id, log, "warmup") for chat_id in range(1, 21)))
+
+    broadcast = asyncio.ensure_future(_send(scheduler, 100, log, "broadcast", PRIORITY_BROADCAST))
+    await asyncio.sleep(0)
+    reply = asyncio.ensure_future(_send(scheduler, 101, log, "reply", PRIORITY_REPLY))
+    await asyncio.gather(broadcast, reply)
+
+    assert log[20:] == ["reply", "broadcast"]
+    assert scheduler.stats.sent == 22
+    assert scheduler.stats.delayed >= 1
+    await scheduler.shutdown()
+
+
+async def test_group_chats_are_paced_per_chat():
+    scheduler = SendScheduler(group_per_minute=2)
+    log = []
+    await _send(scheduler, -100, log, "first")
+    await _send(scheduler, -100, log, "second")
+    third = asyncio.ensure_future(_send(scheduler, -100, log, "third"))
+    await _send(scheduler, -200, log, "other-group")
+    await asyncio.sleep(0.05)
+    assert log == ["first", "second", "other-group"]
+    third.cancel()
+    await scheduler.shutdown()
+
+
+async def test_retry_after_pauses_and_retries():
+    scheduler = SendScheduler()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RetryAfter(0)
+        return True
+
+    assert await scheduler.process_request(flaky, (), {}, "sendMessage", {"chat_id": 1}, None)
+    assert len(attempts) == 2
+    assert scheduler.stats.retried == 1
+
+    async def always_limited():
+        raise RetryAfter(0)
+
+    with pytest.raises(RetryAfter):
+        await scheduler.process_request(always_limited, (), {}, "sendMessage", {"chat_id": 2}, None)
+    assert scheduler.stats.failed == 1
+    await scheduler.shutdown()
+
+
+async def test_requests_without_chat_are_not_paced():
+    scheduler = SendScheduler(global_per_second=1)
+
+    async def get_me():
+        return {"id": 1}
+
+    for _ in range(5):
+        assert await scheduler.process_request(get_me, (), {}, "getMe", {}, None) == {"id": 1}
+    assert scheduler.stats.sent == 0
@@ -1,6 +1,6 @@
 """Tests for session management."""
 import pytest
-from codexs_bot.session import UserSession, Flow
+from codexs_bot.session import SESSION_SCHEMA_VERSION, UserSession, Flow
 from codexs_bot.localization import Language
 
 
@@ -71,3 +71,54 @@ class TestUserSession:
         assert session.exit_confirmation_pending is False
         assert session.exit_confirmation_flow is None
 
+
+    def test_compact_serialization_roundtrip(self):
+        """Only non-default fields are persisted, tagged with the schema version."""
+        assert UserSession().to_dict() == {"v": SESSION_SCHEMA_VERSION}
+
+        session = UserSession()
+        session.language = Language.FA
+        session.flow = Flow.APPLY
+        session.question_index = 2
+        session.answers = {"full_name": "Test"}
+        session.request_exit_confirmation(Flow.APPLY)
+
+        data = session.to_dict()
+        assert set(data) == {
+            "v", "language", "flow", "question_index", "answers",
+            "exit_confirmation_pending", "exit_confirmation_flow",
+        }
+        assert UserSession.from_dict(data) == session
+
+    def test_legacy_full_dump_migrates(self):
+        """Version 1 files (every field, no version key) still load."""
+        legacy = {
+            "language": "en",
+            "flow": "CONFIRM",
+            "question_index": 3,
+            "answers": {"email": "a@example.com"},
+            "waiting_voice": False,
+            "voice_file_path": None,
+            "ai_reply_count": 0,
+            "ai_window_start": "2025-01-01T00:00:00+00:00",
+            "remote_flow_answers": {},
+        }
+        session = UserSession.from_dict(legacy)
+        assert session.flow == Flow.CONFIRM
+        assert session.answers == {"email": "a@example.com"}
+        compact = session.to_dict()
+        assert compact["v"] == SESSION_SCHEMA_VERSION
+        assert "waiting_voice" not in compact
+        # Retired AI-window fields are dropped on migration
+        assert "ai_window_start" not in compact
+
+    def test_malformed_schema_version(self):
+        """A non-integer schema version never crashes loading."""
+        assert UserSession.from_dict({"v": "1", "flow": "APPLY"}).flow == Flow.APPLY
+        assert UserSession.from_dict({"v": None, "flow": "APPLY"}).flow == Flow.APPLY
+        assert UserSession.from_dict({"v": "two", "flow": "APPLY"}) == UserSession()
+
+    def test_slots(self):
+        """Sessions use __slots__ and reject unknown attributes."""
+        with pytest.raises(AttributeError):
+            UserSession().not_a_field = True
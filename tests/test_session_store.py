@@ -0,0 +1,175 @@
+"""Tests for the pluggable session backends and the session cache."""
+import asyncio
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from codexs_bot.session import UserSession
+from codexs_bot.session_store import FileSessionStore, SessionCache, SQLiteSessionStore
+from codexs_bot.storage import DataStorage
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        backend = FileSessionStore(tmp_path / "sessions")
+    else:
+        backend = SQLiteSessionStore(tmp_path / "codexs.db")
+    yield backend
+    backend.close()
+
+
+def test_store_roundtrip_listing_and_cleanup(store):
+    assert store.save_many({1: {"step": 1}, 2: {"step": 2}}) == {}
+    assert store.load(1) == {"step": 1}
+    assert store.load(3) is None
+    assert store.count() == 2
+    assert sorted(store.list_user_ids()) == [1, 2]
+    assert len(store.list_user_ids(limit=1)) == 1
+
+    store.delete(2)
+    store.delete(2)
+    assert store.count() == 1
+
+    assert store.cleanup(older_than=time.time() - 3600) == 0
+    assert store.cleanup(older_than=time.time() + 3600) == 1
+    assert store.count() == 0
+
+
+def test_sqlite_imports_session_files_once(tmp_path):
+    sessions_dir = tmp_path / "sessions"
+    sessions_dir.mkdir()
+    (sessions_dir / "session_5.json").write_text(json.dumps({"flow": "apply"}), encoding="utf-8")
+    (sessions_dir / "session_6.json").write_text("{broken", encoding="utf-8")
+    old = time.time() - 86400 * 40
+    os.utime(sessions_dir / "session_5.json", (old, old))
+
+    store = SQLiteSessionStore(tmp_path / "codexs.db")
+    assert store.import_files(sessions_dir) == 1
+    assert store.import_files(sessions_dir) == 0
+    assert store.load(5) == {"flow": "apply"}
+    # The file's modification time carries over, so cleanup still applies
+    assert store.cleanup(older_than=time.time() - 86400 * 30) == 1
+    store.close()
+
+
+async def test_data_storage_uses_sqlite_sessions(tmp_path):
+    storage = DataStorage(
+        applications_file=tmp_path / "applications.jsonl",
+        contact_file=tmp_path / "contacts.jsonl",
+        sessions_dir=tmp_path / "sessions",
+        session_flush_delay=60,
+        session_store=SQLiteSessionStore(tmp_path / "codexs.db"),
+    )
+    await storage.save_session(1, {"step": 1})
+    await storage.save_session(2, {"step": 2})
+    assert await storage.count_sessions() == 2
+    assert sorted(await storage.list_session_user_ids()) == [1, 2]
+    await storage.delete_session(1)
+    assert await storage.load_session(1) is None
+    assert await storage.cleanup_old_sessions(days_old=30) == 0
+    await storage.close()
+    assert not list((tmp_path / "sessions").glob("session_*.json"))
+
+
+async def test_session_cache_serves_warm_users_without_store_reads(tmp_path):
+    reads = []
+
+    class CountingStore(FileSessionStore):
+        def load(self, user_id):
+            reads.append(user_id)
+            return super().load(user_id)
+
+    storage = DataStorage(
+        applications_file=tmp_path / "applications.jsonl",
+        contact_file=tmp_path / "contacts.jsonl",
+        sessions_dir=tmp_path / "sessions",
+        session_store=CountingStore(tmp_path / "sessions"),
+    )
+    CountingStore(tmp_path / "sessions").save_many({1: {"language": "en", "question_index": 2}})
+
+    first = await storage.load_user_session(1)
+    assert first.question_index == 2
+    second = await storage.load_user_session(1)
+    assert second is not first and second.question_index == 2
+    assert await storage.load_user_session(2) is None
+    assert await storage.load_user_session(2) is None
+    assert reads == [1, 2]
+
+    # Saves and deletes keep the cache coherent without re-reading the store
+    await storage.save_session(1, {"language": "en", "question_index": 3})
+    assert (await storage.load_user_session(1)).question_index == 3
+    await storage.delete_session(1)
+    assert await storage.load_user_session(1) is None
+    assert reads == [1, 2]
+    assert storage.session_cache_stats.hits == 4
+    assert storage.session_cache_stats.misses == 2
+
+
+def test_session_cache_evicts_least_recently_used_and_expires():
+    cache = SessionCache(max_entries=2, ttl=600)
+    cache.put(1, {})
+    cache.put(2, {})
+    cache.get(1)
+    cache.put(3, {})
+    assert cache.get(2) == (False, None)
+    assert cache.get(1)[0] and cache.get(3)[0]
+    assert cache.stats.evictions == 1
+
+    expiring = SessionCache(max_entries=2, ttl=-1)
+    expiring.put(1, {})
+    assert expiring.get(1) == (False, None)
+    assert len(expiring) == 0
+
+
+def test_session_cache_is_isolated_from_callers():
+    """In-place changes to saved or loaded sessions never rewrite the cached snapshot."""
+    cache = SessionCache(max_entries=2, ttl=600)
+    live = UserSession(question_index=4)
+    live.answers["full_name"] = "Sara"
+    data = live.to_dict()
+    cache.put(1, data)
+    live.reset_hiring()
+    data["answers"]["email"] = "x@example.com"
+
+    _, loaded = cache.get(1)
+    assert loaded.answers == {"full_name": "Sara"}
+    loaded.answers.clear()
+    assert cache.get(1)[1].answers == {"full_name": "Sara"}
+
+
+
+async def test_loads_during_a_flush_see_the_batch_being_written(tmp_path):
+    class SlowStore(FileSessionStore):
+        def __init__(self, directory):
+            super().__init__(directory)
+            self.writing = threading.Event()
+            self.release = threading.Event()
+
+        def save_many(self, batch):
+            self.writing.set()
+            self.release.wait(5)
+            return super().save_many(batch)
+
+    FileSessionStore(tmp_path / "sessions").save_many({7: {"step": 1}})
+    backend = SlowStore(tmp_path / "sessions")
+    storage = DataStorage(
+        tmp_path / "apps.jsonl",
+        tmp_path / "contacts.jsonl",
+        tmp_path / "sessions",
+        session_flush_delay=60,
+        session_store=backend,
+        session_cache_size=0,
+    )
+    await storage.save_session(7, {"step": 2})
+    flush = asyncio.create_task(storage.flush_sessions())
+    await asyncio.to_thread(backend.writing.wait, 5)
+
+    assert await storage.load_session(7) == {"step": 2}
+    backend.release.set()
+    assert await flush == 1
+    assert await storage.load_session(7) == {"step": 2}
+    await storage.close()
@@ -0,0 +1,144 @@
+"""Tests for the SQLite-backed application store."""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from codexs_bot.localization import Language
+from codexs_bot.sqlite_store import SQLiteApplicationStore
+from codexs_bot.storage import DataStorage
+
+
+def _app(app_id, telegram_id, submitted_at):
+    return {
+        "application_id": app_id,
+        "submitted_at": submitted_at,
+        "language": "en",
+        "applicant": {"telegram_id": telegram_id},
+        "answers": {"email": f"{app_id.lower()}@example.com"},
+    }
+
+
+def test_indexed_queries(tmp_path):
+    store = SQLiteApplicationStore(tmp_path / "codexs.db")
+    store.append(_app("APP-1", 1, "2025-01-01T10:00:00+00:00"))
+    store.append(_app("APP-2", 2, "2025-01-02T10:00:00Z"))
+    store.append(_app("APP-3", 1, "2025-01-03T10:00:00.500000+00:00"))
+
+    assert store.count() == 3
+    assert store.get_by_id("APP-2")["applicant"]["telegram_id"] == 2
+    assert store.get_by_id("missing") is None
+    assert [app["application_id"] for app in store.get_by_user(1)] == ["APP-3", "APP-1"]
+    assert [app["application_id"] for app in store.get_recent(2)] == ["APP-3", "APP-2"]
+
+    in_range = store.get_range(
+        datetime(2025, 1, 2, tzinfo=timezone.utc),
+        datetime(2025, 1, 3, 23, 59, tzinfo=timezone.utc),
+    )
+    assert [app["application_id"] for app in in_range] == ["APP-3", "APP-2"]
+    since = store.iter_since(datetime(2025, 1, 2, tzinfo=timezone.utc))
+    assert [app["application_id"] for app in since] == ["APP-2", "APP-3"]
+    store.close()
+
+
+
+def test_iter_since_releases_the_lock_between_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr("codexs_bot.sqlite_store.ITER_CHUNK_SIZE", 2)
+    store = SQLiteApplicationStore(tmp_path / "codexs.db")
+    for index in range(5):
+        store.append(_app(f"APP-{index}", index, f"2025-01-0{index + 1}T10:00:00+00:00"))
+
+    rows = store.iter_since(datetime(2025, 1, 1, tzinfo=timezone.utc))
+    seen = [next(rows)["application_id"]]
+    # A paused consumer must not hold the lock writers need
+    assert store._lock.acquire(blocking=False)
+    store._lock.release()
+    store.append(_app("APP-5", 5, "2025-01-06T10:00:00+00:00"))
+    seen.extend(app["application_id"] for app in rows)
+
+    assert seen == [f"APP-{index}" for index in range(6)]
+    store.close()
+
+def test_saving_an_application_again_replaces_it(tmp_path):
+    store = SQLiteApplicationStore(tmp_path / "codexs.db")
+    assert store.append(_app("APP-1", 1, "2025-01-01T10:00:00+00:00"))
+    assert store.append(_app("APP-2", 2, "2025-01-02T10:00:00+00:00"))
+    retry = _app("APP-1", 1, "2025-01-03T10:00:00+00:00")
+    retry["answers"]["email"] = "fixed@example.com"
+    assert not store.append(retry)
+
+    assert store.count() == 2
+    assert store.get_by_id("APP-1")["answers"]["email"] == "fixed@example.com"
+    assert [app["application_id"] for app in store.get_recent(2)] == ["APP-1", "APP-2"]
+    store.close()
+
+
+def test_jsonl_import_runs_once(tmp_path):
+    jsonl = tmp_path / "applications.jsonl"
+    with jsonl.open("w", encoding="utf-8") as handle:
+        for idx in range(3):
+            handle.write(json.dumps(_app(f"APP-{idx}", idx, f"2025-01-0{idx + 1}T00:00:00+00:00")) + "\n")
+        handle.write("not json\n\n")
+
+    store = SQLiteApplicationStore(tmp_path / "codexs.db")
+    assert store.import_jsonl(jsonl) == 3
+    assert store.import_jsonl(jsonl) == 0
+    assert store.count() == 3
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_data_storage_uses_sqlite_backend(tmp_path):
+    store = SQLiteApplicationStore(tmp_path / "codexs.db")
+    storage = DataStorage(
+        applications_file=tmp_path / "applications.jsonl",
+        contact_file=tmp_path / "contacts.jsonl",
+        sessions_dir=tmp_path / "sessions",
+        application_store=store,
+    )
+    await storage.save_application(
+        applicant={"telegram_id": 42},
+        answers={"full_name": "Test"},
+        language=Language.FA,
+        voice_file_path=None,
+        voice_file_id=None,
+        application_id="APP-42",
+    )
+
+    # Nothing is written to the JSONL file when SQLite is the backend
+    assert not (tmp_path / "applications.jsonl").exists()
+    assert await storage.count_applications() == 1
+    assert (await storage.get_application_by_id("APP-42"))["language"] == "fa"
+    assert len(await storage.get_user_applications(42)) == 1
+
+    now = datetime.now(timezone.utc)
+    in_range = await storage.get_applications_by_date_range(now - timedelta(minutes=1), now + timedelta(minutes=1))
+    assert len(in_range) == 1
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_resaved_applications_are_counted_once(tmp_path):
+    store = SQLiteApplicationStore(tmp_path / "codexs.db")
+    storage = DataStorage(
+        applications_file=tmp_path / "applications.jsonl",
+        contact_file=tmp_path / "contacts.jsonl",
+        sessions_dir=tmp_path / "sessions",
+        application_store=store,
+    )
+    await storage.get_stats()
+    for _ in range(2):
+        await storage.save_application(
+            applicant={"telegram_id": 42},
+            answers={"full_name": "Test"},
+            language=Language.EN,
+            voice_file_path=None,
+            voice_file_id=None,
+            application_id="APP-42",
+        )
+    stats = await storage.get_stats()
+    assert stats.total_applications == 1
+    assert stats.languages == {"en": 1}
+    assert sum(bucket.get("applications", 0) for bucket in stats.daily.values()) == 1
+    await storage.close()
+    store.close()
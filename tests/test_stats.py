@@ -0,0 +1,93 @@
+"""Tests for the materialized stats snapshot."""
+import json
+from datetime import date
+
+from codexs_bot.localization import Language
+from codexs_bot.stats import StatsSnapshot
+from codexs_bot.storage import DataStorage
+
+
+def _storage(tmp_path):
+    return DataStorage(tmp_path / "apps.jsonl", tmp_path / "contacts.jsonl", tmp_path / "sessions")
+
+
+async def test_stats_are_updated_on_write_and_persisted(tmp_path):
+    storage = _storage(tmp_path)
+    await storage.save_application({"telegram_id": 1}, {}, Language.EN, None, "voice", application_id="A1")
+    stats = await storage.get_stats()
+    assert stats.total_applications == 1
+
+    await storage.save_application({"telegram_id": 1}, {}, Language.FA, None, None, voice_skipped=True)
+    await storage.save_contact_message({"telegram_id": 2}, Language.EN, "hi")
+
+    stats = await storage.get_stats()
+    assert (stats.completed_applications, stats.incomplete_applications) == (1, 1)
+    assert stats.languages == {"en": 1, "fa": 1}
+    assert stats.unique_users == {1}
+    assert (stats.voice_samples, stats.voice_skipped, stats.contact_messages) == (1, 1, 1)
+
+    persisted = json.loads((tmp_path / "stats.json").read_text(encoding="utf-8"))
+    assert persisted["total_applications"] == 2
+    assert persisted["contact_messages"] == 1
+
+    # A fresh process trusts the snapshot because the counts still match
+    reloaded = await _storage(tmp_path).get_stats()
+    assert reloaded.total_applications == 2
+    assert reloaded.unique_users == {1}
+
+
+async def test_stale_snapshot_is_rebuilt(tmp_path):
+    storage = _storage(tmp_path)
+    await storage.save_application({"telegram_id": 5}, {}, Language.EN, None, None, application_id="A1")
+    (tmp_path / "stats.json").write_text(
+        json.dumps({"v": 1, "total_applications": 7, "unique_users": [99]}), encoding="utf-8"
+    )
+
+    stats = await _storage(tmp_path).get_stats()
+    assert stats.total_applications == 1
+    assert stats.unique_users == {5}
+
+
+async def test_stats_writes_are_debounced_and_reads_are_copies(tmp_path):
+    storage = DataStorage(
+        tmp_path / "apps.jsonl", tmp_path / "contacts.jsonl", tmp_path / "sessions", stats_flush_delay=60
+    )
+    stats = await storage.get_stats()
+    written = (tmp_path / "stats.json").stat().st_mtime_ns
+    for user_id in range(3):
+        await storage.save_application(
+            {"telegram_id": user_id}, {}, Language.EN, None, None, application_id=f"A{user_id}"
+        )
+
+    # Nothing is rewritten until the flush delay passes or the storage closes
+    assert (tmp_path / "stats.json").stat().st_mtime_ns == written
+    assert stats.total_applications == 0
+    assert (await storage.get_stats()).unique_users == {0, 1, 2}
+
+    await storage.close()
+    persisted = json.loads((tmp_path / "stats.json").read_text(encoding="utf-8"))
+    assert persisted["total_applications"] == 3
+
+
+async def test_stats_failures_do_not_fail_the_save(tmp_path, monkeypatch):
+    storage = _storage(tmp_path)
+    await storage.get_stats()
+
+    def broken(payload, today):
+        raise ValueError("bad payload")
+
+    monkeypatch.setattr(storage._stats, "record_application", broken)
+    await storage.save_application({"telegram_id": 1}, {}, Language.EN, None, None, application_id="A1")
+    assert await storage.count_applications() == 1
+
+
+def test_window_sums_daily_buckets():
+    snapshot = StatsSnapshot()
+    for submitted_at in ("2025-03-10T08:00:00+00:00", "2025-03-05T08:00:00+00:00", "2025-02-01T08:00:00Z"):
+        snapshot.add_application({"submitted_at": submitted_at})
+    today = date(2025, 3, 10)
+    assert snapshot.window("applications", today, 1) == 1
+    assert snapshot.window("applications", today, 7) == 2
+    assert snapshot.window("applications", today, 30) == 2
+    snapshot.prune(date(2025, 6, 1))
+    assert "2025-02-01" not in snapshot.daily
@@ -0,0 +1,128 @@
+"""Tests for the applications.jsonl offset index and activity reporting."""
+import json
+from datetime import datetime, timedelta, timezone
+
+from codexs_bot.localization import Language
+from codexs_bot.stats import StatsSnapshot
+from codexs_bot.storage import DataStorage, JsonlApplicationStore, build_activity_report
+
+
+def _app(app_id, user_id, submitted_at):
+    return {
+        "application_id": app_id,
+        "submitted_at": submitted_at.isoformat(),
+        "applicant": {"telegram_id": user_id},
+    }
+
+
+def test_index_lookups_match_file_contents(tmp_path):
+    path = tmp_path / "applications.jsonl"
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    store = JsonlApplicationStore(path)
+    store.append(_app("A1", 1, base))
+    store.append(_app("A2", 2, base + timedelta(days=1)))
+    store.append(_app("A3", 1, base + timedelta(days=2)))
+
+    assert store.count() == 3
+    assert store.get_by_id("A2")["applicant"]["telegram_id"] == 2
+    assert store.get_by_id("missing") is None
+    assert [app["application_id"] for app in store.get_by_user(1)] == ["A3", "A1"]
+    assert [app["application_id"] for app in store.get_recent(2)] == ["A3", "A2"]
+    in_range = store.get_range(base + timedelta(hours=12), base + timedelta(days=1, hours=12))
+    assert [app["application_id"] for app in in_range] == ["A2"]
+
+
+
+def test_iter_since_releases_the_lock_between_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr("codexs_bot.storage.ITER_CHUNK_SIZE", 2)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    store = JsonlApplicationStore(tmp_path / "applications.jsonl")
+    for index in range(5):
+        store.append(_app(f"A{index}", index, base + timedelta(days=index)))
+
+    rows = store.iter_since(base)
+    seen = [next(rows)["application_id"]]
+    # A paused consumer must not hold the lock writers need
+    assert store._lock.acquire(blocking=False)
+    store._lock.release()
+    store.append(_app("A5", 5, base + timedelta(days=5)))
+    seen.extend(app["application_id"] for app in rows)
+
+    assert seen == [f"A{index}" for index in range(5)]
+
+def test_index_tails_external_appends_and_rebuilds_on_shrink(tmp_path):
+    path = tmp_path / "applications.jsonl"
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    store = JsonlApplicationStore(path)
+    store.append(_app("A1", 1, base))
+    assert store.count() == 1
+
+    # Another process appends a full line plus a half-written one
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(_app("A2", 1, base + timedelta(days=1))) + "\n")
+        handle.write('{"application_id": "A3"')
+    assert store.count() == 2
+    assert store.get_by_id("A2") is not None
+
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(', "submitted_at": "2025-01-05T00:00:00+00:00"}\n')
+    assert store.get_recent(1)[0]["application_id"] == "A3"
+
+    path.write_text(json.dumps(_app("B1", 9, base)) + "\n", encoding="utf-8")
+    assert store.count() == 1
+    assert store.get_by_id("A1") is None
+    assert store.get_by_user(9)[0]["application_id"] == "B1"
+
+
+def test_activity_report_aggregates_windows_in_one_pass():
+    now = datetime(2025, 3, 10, 12, 0, tzinfo=timezone.utc)
+    apps = [
+        {"application_id": "old", "submitted_at": (now - timedelta(days=40)).isoformat(), "language": "en"},
+        {"application_id": "month", "submitted_at": (now - timedelta(days=20)).isoformat(), "language": "en"},
+        {"application_id": "week", "submitted_at": (now - timedelta(days=3)).isoformat(), "language": "fa"},
+        {"application_id": "t1", "submitted_at": (now - timedelta(hours=2)).isoformat(),
+         "language": "fa", "voice_file_id": "v"},
+        {"application_id": "t2", "submitted_at": (now - timedelta(hours=1)).isoformat(),
+         "language": "en", "voice_skipped": True},
+        {"application_id": "bad", "submitted_at": "not-a-date"},
+    ]
+    contacts = [{"submitted_at": (now - timedelta(days=2)).isoformat()}]
+
+    report = build_activity_report(apps, contacts, now, recent_limit=1)
+
+    assert (report.applications.today, report.applications.week, report.applications.month) == (2, 3, 4)
+    assert (report.contacts.today, report.contacts.week, report.contacts.month) == (0, 1, 1)
+    assert report.today_voices == 1 and report.today_skipped == 1
+    assert report.today_languages == {"fa": 1, "en": 1}
+    assert [app["application_id"] for app in report.recent_today] == ["t2"]
+
+
+def test_activity_report_and_stats_snapshot_share_window_edges():
+    now = datetime(2025, 3, 10, 12, 0, tzinfo=timezone.utc)
+    apps = [
+        # Inside a rolling 7/30-day window, but on a calendar day before it
+        {"submitted_at": "2025-03-03T20:00:00+00:00"},
+        {"submitted_at": "2025-02-08T20:00:00+00:00"},
+        # First calendar day of each window
+        {"submitted_at": "2025-03-04T00:00:00+00:00"},
+        {"submitted_at": "2025-02-09T00:00:00+00:00"},
+    ]
+    report = build_activity_report(apps, [], now)
+    snapshot = StatsSnapshot()
+    for app in apps:
+        snapshot.add_application(app)
+
+    today = now.date()
+    assert report.applications.week == snapshot.window("applications", today, 7) == 1
+    assert report.applications.month == snapshot.window("applications", today, 30) == 3
+
+
+async def test_storage_activity_report_reads_recent_window(tmp_path):
+    storage = DataStorage(tmp_path / "apps.jsonl", tmp_path / "contacts.jsonl", tmp_path / "sessions")
+    await storage.save_application({"telegram_id": 1}, {}, Language.EN, None, None, application_id="A1")
+    await storage.save_contact_message({"telegram_id": 1}, Language.FA, "hello")
+
+    report = await storage.get_activity_report()
+    assert report.applications.today == 1
+    assert report.contacts.month == 1
+    assert report.recent_today[0]["application_id"] == "A1"
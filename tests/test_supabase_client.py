@@ -0,0 +1,257 @@
+"""Tests for the Supabase client and its shared HTTP pool."""
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import httpx
+import pytest
+
+from codexs_bot.config import Settings
+from codexs_bot.http_pool import SharedHttpClient
+from codexs_bot.outbox import PermanentDeliveryError
+from codexs_bot import supabase_client as supabase_module
+from codexs_bot.remote_config import RemoteConfig
+from codexs_bot.supabase_client import SupabaseBotClient
+
+
+def _settings(tmp_path: Path) -> Settings:
+    return Settings(
+        bot_token="test-token",
+        data_dir=tmp_path,
+        applications_file=tmp_path / "applications.jsonl",
+        contact_file=tmp_path / "contacts.jsonl",
+        voice_dir=tmp_path / "voice",
+        sessions_dir=tmp_path / "sessions",
+        application_webhook_url=None,
+        application_webhook_token=None,
+        contact_webhook_url=None,
+        enable_media=False,
+        group_chat_id=None,
+        media_dir=tmp_path / "media",
+        openai_api_key=None,
+        openai_model="gpt-4o-mini",
+        admin_user_ids=[],
+        bot_config_url="https://example.test/functions/v1/bot-config",
+        bot_status_url="https://example.test/functions/v1/bot-status",
+        bot_log_url="https://example.test/functions/v1/bot-log",
+        bot_api_key="secret",
+        supabase_bot_key="secret",
+        supabase_url="https://example.test",
+        supabase_anon_key=None,
+        bot_webhook_secret=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_calls_share_one_pooled_client(tmp_path):
+    """Every Edge Function call should reuse the same pooled AsyncClient."""
+    seen_paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_paths.append(request.url.path)
+        assert request.headers["x-bot-key"] == "secret"
+        return httpx.Response(200, json={"status": "healthy"})
+
+    pool = SharedHttpClient(transport=httpx.MockTransport(handler))
+    client = SupabaseBotClient(_settings(tmp_path), http=pool)
+
+    first = pool.client
+    assert await client.fetch_bot_config() == {"status": "healthy"}
+    assert await client.fetch_applicant_status(42) == {"status": "healthy"}
+    assert await client.get_bot_status() == {"status": "healthy"}
+    assert pool.client is first
+    assert len(seen_paths) == 3
+
+    await client.aclose()
+    assert not pool.is_open
+    # A closed pool reopens lazily instead of failing
+    assert pool.client is not first
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_status_lookup_treats_404_as_missing(tmp_path):
+    pool = SharedHttpClient(transport=httpx.MockTransport(lambda request: httpx.Response(404)))
+    client = SupabaseBotClient(_settings(tmp_path), http=pool)
+    assert await client.fetch_applicant_status(7) is None
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_log_messages_are_shipped_as_one_batch(tmp_path):
+    """Chat log events are buffered and posted together instead of one request each."""
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, json={})
+
+    pool = SharedHttpClient(transport=httpx.MockTransport(handler))
+    client = SupabaseBotClient(_settings(tmp_path), http=pool)
+    for direction in ("incoming", "outgoing"):
+        await client.log_message(
+            telegram_user_id=1,
+            username="user",
+            direction=direction,
+            message_type="text",
+            text="hi",
+        )
+    await client.aclose()
+
+    assert len(bodies) == 1
+    assert [event["direction"] for event in bodies[0]["events"]] == ["incoming", "outgoing"]
+    assert client.log_stats.sent == 2
+
+
+@pytest.mark.asyncio
+async def test_log_batches_fall_back_to_single_events(tmp_path):
+    """A bot-log function that rejects batch envelopes gets one event per request."""
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        bodies.append(body)
+        return httpx.Response(404 if "events" in body else 200, json={})
+
+    pool = SharedHttpClient(transport=httpx.MockTransport(handler))
+    client = SupabaseBotClient(_settings(tmp_path), http=pool)
+    for text in ("one", "two"):
+        await client.log_message(telegram_user_id=1, username="user", direction="incoming", message_type="text", text=text)
+    await client.aclose()
+
+    assert [body.get("text") for body in bodies] == [None, "one", "two"]
+    assert client.log_stats.sent == 2
+    assert not client._log_batch_requests
+
+
+@pytest.mark.asyncio
+async def test_one_bad_log_event_only_loses_itself(tmp_path):
+    """A 400 on a batch is retried per event for that batch; batching stays on."""
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        bodies.append(body)
+        events = body.get("events", [body])
+        return httpx.Response(400 if any(event["text"] == "bad" for event in events) else 200, json={})
+
+    pool = SharedHttpClient(transport=httpx.MockTransport(handler))
+    client = SupabaseBotClient(_settings(tmp_path), http=pool)
+    for text in ("one", "bad", "two"):
+        await client.log_message(telegram_user_id=1, username="user", direction="incoming", message_type="text", text=text)
+    await client.aclose()
+
+    assert len(bodies) == 4
+    assert (client.log_stats.sent, client.log_stats.failed) == (2, 1)
+    assert client._log_batch_requests
+
+
+@pytest.mark.asyncio
+async def test_queued_log_messages_never_wait_for_space(tmp_path):
+    """Outgoing logging drops the oldest event instead of blocking, even with overflow=block."""
+    pool = SharedHttpClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+    settings = replace(_settings(tmp_path), log_overflow="block", log_queue_size=1, log_flush_interval=60)
+    client = SupabaseBotClient(settings, http=pool)
+    for text in ("one", "two", "three"):
+        client.queue_log_message(telegram_user_id=1, username=None, direction="outgoing", message_type="text", text=text)
+    assert client.log_pending == 1
+    assert client.log_stats.dropped == 2
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rejected_applications_are_not_retried(tmp_path):
+    """A 4xx from telegram-applications is final; only the outbox caller gets an error."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.headers.get("Idempotency-Key"))
+        return httpx.Response(422, json={"error": "missing full_name"})
+
+    pool = SharedHttpClient(transport=httpx.MockTransport(handler))
+    client = SupabaseBotClient(_settings(tmp_path), http=pool)
+    assert await client.submit_application({"application_id": "APP-1"}) is None
+    with pytest.raises(PermanentDeliveryError, match="HTTP 422"):
+        await client.submit_application({"application_id": "APP-1"}, idempotency_key="k", raise_on_reject=True)
+    assert calls == [None, "k"]
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_config_refresh_is_conditional_and_applies_only_changes(tmp_path, monkeypatch):
+    config = {
+        "questions": [{"question_key": "full_name", "en_text": "Name?"}],
+        "content": {"about": {"en_body": "About"}, "help": {"en_body": "Help"}},
+    }
+    seen_etags = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_etags.append(request.headers.get("if-none-match"))
+        etag = f'"{len(config["content"]["about"]["en_body"])}"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json=config, headers={"ETag": etag})
+
+    applied_questions, applied_content = [], []
+    monkeypatch.setattr(supabase_module, "remote_config", RemoteConfig())
+    monkeypatch.setattr(supabase_module, "apply_remote_questions", applied_questions.append)
+    monkeypatch.setattr(supabase_module, "apply_remote_content_blocks", applied_content.append)
+    pool = SharedHttpClient(transport=httpx.MockTransport(handler))
+    client = SupabaseBotClient(_settings(tmp_path), http=pool)
+
+    assert await client.refresh_remote_content()
+    assert len(applied_questions) == 1
+    assert set(applied_content[0]) == {"about", "help"}
+
+    # 304: nothing is downloaded or re-applied
+    assert await client.refresh_remote_content()
+    assert seen_etags[1] == '"5"'
+    assert len(applied_questions) == 1 and len(applied_content) == 1
+
+    config["content"]["about"]["en_body"] = "About us"
+    assert await client.refresh_remote_content()
+    assert len(applied_questions) == 1
+    assert set(applied_content[1]) == {"about"}
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_config_snapshot_is_loaded_at_startup(tmp_path, monkeypatch):
+    config = {"content": {"about": {"en_body": "Saved about"}}, "settings": {"bot_name": "Codexs"}}
+    etags = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        etags.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=config, headers={"ETag": '"v1"'})
+
+    monkeypatch.setattr(supabase_module, "apply_remote_questions", lambda questions: None)
+    monkeypatch.setattr(supabase_module, "apply_remote_content_blocks", lambda blocks: None)
+    monkeypatch.setattr(supabase_module, "remote_config", RemoteConfig())
+    pool = SharedHttpClient(transport=httpx.MockTransport(handler))
+    first = SupabaseBotClient(_settings(tmp_path), http=pool)
+    assert await first.refresh_remote_content()
+    assert (tmp_path / "remote_config.json").exists()
+
+    # A restart applies the snapshot synchronously, without any request
+    restarted_config = RemoteConfig()
+    monkeypatch.setattr(supabase_module, "remote_config", restarted_config)
+    restarted = SupabaseBotClient(_settings(tmp_path), http=pool)
+    assert restarted.load_config_snapshot()
+    assert restarted_config.get_setting("bot_name") == "Codexs"
+    assert len(etags) == 1
+
+    # The background refresh revalidates the snapshot instead of downloading it
+    version = restarted_config.version
+    assert await restarted.refresh_remote_content()
+    assert etags[-1] == '"v1"'
+    assert restarted_config.version == version
+    await pool.aclose()
+
+
+def test_missing_or_corrupt_snapshot_is_ignored(tmp_path):
+    client = SupabaseBotClient(_settings(tmp_path))
+    assert not client.load_config_snapshot()
+    (tmp_path / "remote_config.json").write_text("{not json", encoding="utf-8")
+    assert not client.load_config_snapshot()
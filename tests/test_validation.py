@@ -5,8 +5,16 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-import pytest
 from codexs_bot.bot import _validate_email, _validate_text_length, _sanitize_html
+from codexs_bot.localization import HIRING_QUESTIONS, Question, apply_remote_questions
+from codexs_bot.validation import (
+    ERROR_EMAIL,
+    ERROR_LOCATION,
+    ERROR_PHONE,
+    ERROR_TOO_LONG,
+    ERROR_URL,
+    validate_answer,
+)
 
 
 class TestEmailValidation:
@@ -113,3 +121,37 @@ class TestHTMLSanitization:
         assert _sanitize_html("") == ""
         assert _sanitize_html("   ") == "   "
 
+
+
+
+def _question(key):
+    return next(question for question in HIRING_QUESTIONS if question.key == key)
+
+
+class TestAnswerPipeline:
+    """Test the question-bound validation pipeline."""
+
+    def test_validators_follow_question_metadata(self):
+        assert validate_answer(_question("email"), "  Jane@Example.COM ") == ("Jane@example.com", None)
+        assert validate_answer(_question("email"), "jane@") == ("jane@", ERROR_EMAIL)
+        assert validate_answer(_question("contact"), "+1  415 555 0100") == ("+1 415 555 0100", None)
+        assert validate_answer(_question("contact"), "12345")[1] == ERROR_PHONE
+        assert validate_answer(_question("location"), "Berlin, Germany")[1] is None
+        assert validate_answer(_question("location"), "Berlin")[1] == ERROR_LOCATION
+        assert validate_answer(_question("portfolio"), "github: janedoe")[1] is None
+        assert validate_answer(_question("portfolio"), "ask me")[1] == ERROR_URL
+
+    def test_length_applies_to_every_question(self):
+        assert validate_answer(_question("full_name"), "a" * 1001)[1] == ERROR_TOO_LONG
+        assert validate_answer(_question("full_name"), "Jane Doe") == ("Jane Doe", None)
+
+    def test_remote_questions_can_name_a_validator(self):
+        question = Question(key="work_email", prompts={}, summary_labels={}, validator="email")
+        assert validate_answer(question, "not-an-email")[1] == ERROR_EMAIL
+
+        original = list(HIRING_QUESTIONS)
+        try:
+            apply_remote_questions([{"question_key": "backup_email", "en_text": "Backup?", "validator": "email"}])
+            assert validate_answer(_question("backup_email"), "nope")[1] == ERROR_EMAIL
+        finally:
+            HIRING_QUESTIONS[:] = original